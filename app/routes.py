@@ -4,11 +4,11 @@ import os
 import pandas as pd
 from datetime import datetime
 import logging
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
 
 
 from lifesearch.data import fetch_exoplanet_data_api, load_hwc_catalog, load_hzgallery_catalog, merge_data_sources, normalize_name
-from lifesearch.reports import plot_habitable_zone, plot_scores_comparison, generate_planet_report_html, generate_summary_report_html, generate_combined_report_html
+from lifesearch.reports import render_planet_plots, generate_planet_report_html, generate_aggregated_reports
 from lifesearch.lifesearch_main import process_planet_data
 from .forms import PlanetSearchForm, HabitabilityWeightsForm, PHIWeightsForm # Ajuste conforme necessário
 #from .utils import normalize_name, DEFAULT_HABITABILITY_WEIGHTS, DEFAULT_PHI_WEIGHTS # Ajuste
@@ -16,6 +16,7 @@ from lifesearch.data import load_hwc_catalog, load_hzgallery_catalog # Ajuste
 import requests
 import math
 import json
+from functools import lru_cache
 
 
 from lifesearch.data import (
@@ -26,13 +27,11 @@ from lifesearch.data import (
     normalize_name,
 )
 from lifesearch.reports import (
-    plot_habitable_zone,
-    plot_scores_comparison,
+    render_planet_plots,
     generate_planet_report_html,
-    generate_summary_report_html,
-    generate_combined_report_html,
+    generate_aggregated_reports,
 )
-from lifesearch.lifesearch_main import process_planet_data
+from lifesearch.lifesearch_main import process_planet_data, _GK_SPECTYPES, _isna
 from .forms import PlanetSearchForm, HabitabilityWeightsForm, PHIWeightsForm
 
 logger = logging.getLogger(__name__)
@@ -63,17 +62,30 @@ import math # Garanta que math seja importado no topo de routes.py
 
 
 def get_template_env():
-    """Initializes and returns a Jinja2 template environment.
+    """Returns the Jinja2 template environment.
     
     Configures the template loader to look for templates in the 'templates'
     directory relative to the application's root path. Enables autoescaping
-    for security.
+    for security. The environment is built once per directory and reused.
+    Templates are only checked for changes on disk when Flask would reload its
+    own templates (TEMPLATES_AUTO_RELOAD, or debug mode when unset).
     
     Returns:
         jinja2.Environment: The configured Jinja2 environment.
     """
-    template_loader = FileSystemLoader(searchpath=os.path.join(current_app.root_path, "templates"))
-    return Environment(loader=template_loader, autoescape=True) # Added autoescape for security
+    auto_reload = current_app.config.get("TEMPLATES_AUTO_RELOAD")
+    if auto_reload is None: auto_reload = current_app.debug
+    return _template_env_for(os.path.join(current_app.root_path, "templates"), auto_reload)
+
+@lru_cache(maxsize=None)
+def _template_env_for(templates_path, auto_reload=True):
+    """Builds the Jinja2 environment for a templates directory once, so compiled templates are reused across requests.
+
+    Compiled templates are also kept on disk (in the system temp directory), so a
+    restarted server or a new worker process skips parsing the templates again.
+    """
+    template_loader = FileSystemLoader(searchpath=templates_path)
+    return Environment(loader=template_loader, autoescape=True, auto_reload=auto_reload, bytecode_cache=FileSystemBytecodeCache()) # Added autoescape for security
 
 DEFAULT_HABITABILITY_WEIGHTS = {
     "Habitable Zone": 1.0, "Size": 1.0, "Density": 1.0, "Atmosphere": 1.0,
@@ -300,10 +312,8 @@ def configure():
                 }
                 if "Terran" in planet_data.get("classification", "") or "Superterran" in planet_data.get("classification", ""):
                     phi_factors["Solid Surface"] = 0.8
-                if isinstance(planet_data.get("st_spectype", ""), str) and (
-                    planet_data.get("st_spectype", "").startswith("G") or 
-                    planet_data.get("st_spectype", "").startswith("K")
-                ) and pd.notna(planet_data.get("st_age")):
+                st_spectype = planet_data.get("st_spectype", "")
+                if isinstance(st_spectype, str) and st_spectype[:1] in _GK_SPECTYPES and not _isna(planet_data.get("st_age")):
                     try:
                         st_age_float = float(planet_data.get("st_age"))
                         if 1.0 < st_age_float < 8.0:
@@ -543,6 +553,7 @@ def results():
     hz_gallery_df = load_hzgallery_catalog(os.path.join(current_app.config["DATA_DIR"], "table-hzgallery.csv"))
 
     all_planets_processed_data_for_summary = [] 
+    planets_to_report = []  # (planet_name, normalized_planet_name, processed_result) of planets that get an individual report
     report_links = []
     user_overrides = {}
 
@@ -622,23 +633,29 @@ def results():
             flash(f"Error processing data for {planet_name}. Check logs for details.", "warning")
             continue
 
+        planets_to_report.append((planet_name, normalized_planet_name, processed_result))
+        all_planets_processed_data_for_summary.append(processed_result)
+
+    # Plots of all planets are drawn in one batch so that large requests can use several processes
+    try:
+        plot_filenames = render_planet_plots([
+            (processed_result.get("planet_data_dict", {}), processed_result.get("star_info", {}),
+             processed_result.get("hz_data_tuple"), processed_result.get("scores_for_report", {}),
+             absolute_charts_output_dir, normalized_planet_name)
+            for planet_name, normalized_planet_name, processed_result in planets_to_report
+        ])
+    except Exception as e:
+        logger.exception(f"Error rendering plots: {e}. Individual reports will be generated without plots.")
+        plot_filenames = [(None, None)] * len(planets_to_report)
+
+    for (planet_name, normalized_planet_name, processed_result), (hz_plot_filename, scores_plot_filename) in zip(planets_to_report, plot_filenames):
         planet_data_dict = processed_result.get("planet_data_dict", {})
         scores_for_report = processed_result.get("scores_for_report", {})
         sephi_scores_for_report = processed_result.get("sephi_scores_for_report", {})
-        hz_data_tuple = processed_result.get("hz_data_tuple")
-        star_info = processed_result.get("star_info", {})
         
         plots = {}
-        hz_plot_filename = plot_habitable_zone(
-            planet_data_dict, star_info, hz_data_tuple, 
-            absolute_charts_output_dir, normalized_planet_name
-        )
         if hz_plot_filename:
             plots["hz_plot"] = f"charts/{hz_plot_filename}"
-        
-        scores_plot_filename = plot_scores_comparison(
-            scores_for_report, absolute_charts_output_dir, normalized_planet_name
-        )
         if scores_plot_filename:
             plots["scores_plot"] = f"charts/{scores_plot_filename}"
         
@@ -665,18 +682,20 @@ def results():
         except Exception as e:
             logger.error(f"Error generating individual report for {planet_name}: {e}", exc_info=True)
             flash(f"Error generating individual report for {planet_name}: {e}", "warning")
-        
-        all_planets_processed_data_for_summary.append(processed_result)
 
     if all_planets_processed_data_for_summary:
         logger.info(f"Attempting to generate summary and combined reports for {len(all_planets_processed_data_for_summary)} processed planet entries.")
         
         try:
-            summary_report_path = generate_summary_report_html(
+            summary_report_path, combined_report_path = generate_aggregated_reports(
                 all_planets_processed_data_for_summary, 
                 template_env, 
                 absolute_session_results_dir
             )
+        except Exception as e:
+            logger.error(f"Error generating summary and combined reports: {e}", exc_info=True)
+            flash(f"Error generating summary and combined reports: {e}", "warning")
+        else:
             if summary_report_path:
                 summary_filename = os.path.basename(summary_report_path)
                 report_links.append({
@@ -688,16 +707,7 @@ def results():
             else:
                 logger.warning("Failed to generate summary report.")
                 flash("Failed to generate the summary report.", "warning")
-        except Exception as e:
-            logger.error(f"Error generating summary report: {e}", exc_info=True)
-            flash(f"Error generating summary report: {e}", "warning")
 
-        try:
-            combined_report_path = generate_combined_report_html(
-                all_planets_processed_data_for_summary,
-                template_env,
-                absolute_session_results_dir
-            )
             if combined_report_path:
                 combined_filename = os.path.basename(combined_report_path)
                 report_links.append({
@@ -709,9 +719,6 @@ def results():
             else:
                 logger.warning("Failed to generate combined report.")
                 flash("Failed to generate the combined report.", "warning")
-        except Exception as e:
-            logger.error(f"Error generating combined report: {e}", exc_info=True)
-            flash(f"Error generating combined report: {e}", "warning")
     else:
         logger.warning("No planet data was processed or all processing attempts failed. Skipping summary and combined reports.")
         flash("No data was processed for any of the planets, or all processing failed. Summary and combined reports could not be generated.", "warning")
@@ -2,10 +2,39 @@ import pandas as pd
 import numpy as np
 import logging
 import math
+import bisect
+import functools
+import time
+from concurrent.futures import ProcessPoolExecutor
 
 logger = logging.getLogger(__name__)
 
 # --- Helper Functions ---
+def _isna(value):
+    """pd.isna for a single value, answering the common None/float/str/int cases directly.
+    
+    Same check as reports._isna: anything other than those plain types (numpy
+    scalars, pd.NA, pd.NaT, ...) still goes to pd.isna.
+    
+    Args:
+        value (any): The value to check.
+    
+    Returns:
+        bool: True if value is None or NaN (or another pandas missing value).
+    """
+    if value is None: return True
+    if isinstance(value, float): return value != value
+    if isinstance(value, (str, int)): return False
+    return pd.isna(value)
+
+# Red, Orange, Amber, Light Green, Green. High-is-good bins are [x, next) from the
+# left; low-is-good bins are (prev, x] and map to the scale in reverse.
+_COLOR_SCALE = ("#F44336", "#FF9800", "#FFC107", "#8BC34A", "#4CAF50")
+_COLOR_SCALE_ARRAY = np.array(_COLOR_SCALE)
+_COLOR_THRESHOLDS_HIGH = (20, 40, 60, 80)
+_COLOR_THRESHOLDS_LOW = (10, 25, 50, 75)
+
+@functools.lru_cache(maxsize=1024)
 def get_color_for_percentage(value, high_is_good=True):
     """Determines a hex color code based on a percentage value.
     
@@ -16,46 +45,72 @@ def get_color_for_percentage(value, high_is_good=True):
     Returns:
         str: Hex color code string. Grey for N/A or invalid values.
     """
-    if pd.isna(value) or value is None:
+    if _isna(value):
         return "#757575"  # Grey for N/A
     try:
         value = float(value)
     except (ValueError, TypeError): # pragma: no cover
         return "#757575" # pragma: no cover
+    if value != value:  # e.g. "nan": NaN compares false against every threshold
+        return "#757575"
         
     if high_is_good:
-        if value >= 80:
-            return "#4CAF50"  # Green
-        elif value >= 60:
-            return "#8BC34A"  # Light Green
-        elif value >= 40:
-            return "#FFC107"  # Amber
-        elif value >= 20:
-            return "#FF9800"  # Orange
-        else:
-            return "#F44336"  # Red
+        return _COLOR_SCALE[bisect.bisect_right(_COLOR_THRESHOLDS_HIGH, value)]
     else: # Low is good
-        if value <= 10:
-            return "#4CAF50"
-        elif value <= 25:
-            return "#8BC34A"
-        elif value <= 50:
-            return "#FFC107"
-        elif value <= 75:
-            return "#FF9800"
-        else:
-            return "#F44336"
+        return _COLOR_SCALE[-1 - bisect.bisect_left(_COLOR_THRESHOLDS_LOW, value)]
+
+def get_colors_for_percentages(values, high_is_good=True):
+    """Vectorized get_color_for_percentage for an array of percentages.
+    
+    Args:
+        values (array-like): Percentage values (0-100); NaN/None marks N/A.
+        high_is_good (bool): True if higher values are better, False if lower values are better.
+    
+    Returns:
+        np.ndarray: Array of hex color code strings, grey where the value is N/A.
+    """
+    values = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=np.float64)
+    if high_is_good:
+        colors = _COLOR_SCALE_ARRAY[np.searchsorted(_COLOR_THRESHOLDS_HIGH, values, side="right")]
+    else:
+        colors = _COLOR_SCALE_ARRAY[::-1][np.searchsorted(_COLOR_THRESHOLDS_LOW, values, side="left")]
+    return np.where(np.isnan(values), "#757575", colors)
 
 def format_value(value, precision=2, default_na="N/A"):
     """Helper to format numerical values or return N/A."""
-    if pd.isna(value) or value is None:
+    if _isna(value):
         return default_na
     try:
         return f"{float(value):.{precision}f}"
     except (ValueError, TypeError):
-        logger.debug(f"format_value: Could not convert {value} to float.")
+        # Hit for every text field (e.g. discoverymethod), so keep it cheap when DEBUG is off
+        if logger.isEnabledFor(logging.DEBUG): logger.debug(f"format_value: Could not convert {value} to float.")
         return default_na
 
+# Travel scenarios: labels and cruise speeds as fractions of the speed of light.
+_TRAVEL_LABELS = ("Current tech (~0.0057% c)", "20% speed of light", "Near light speed (0.9999c)")
+_TRAVEL_SPEEDS_C = (0.000057, 0.20, 0.9999)
+_TRAVEL_NA = {
+    "scenario_1_label": _TRAVEL_LABELS[0], "scenario_1_time": "N/A",
+    "scenario_2_label": _TRAVEL_LABELS[1], "scenario_2_time": "N/A",
+    "scenario_3_label": _TRAVEL_LABELS[2], "scenario_3_time": "N/A"
+}
+
+@functools.lru_cache(maxsize=4096)
+def _travel_time_strings(distance_ly):
+    """Formatted travel times for a valid distance; memoized since planets of one system share it."""
+    speed_1, speed_2, speed_3 = _TRAVEL_SPEEDS_C
+    return f"{distance_ly / speed_1:.1f} years", f"{distance_ly / speed_2:.1f} years", f"{distance_ly / speed_3:.1f} years"
+
+def _travel_info(distance_ly):
+    """Builds a fresh calculate_travel_times dict for a valid distance."""
+    time_1, time_2, time_3 = _travel_time_strings(distance_ly)
+    return {
+        "scenario_1_label": _TRAVEL_LABELS[0], "scenario_1_time": time_1,
+        "scenario_2_label": _TRAVEL_LABELS[1], "scenario_2_time": time_2,
+        "scenario_3_label": _TRAVEL_LABELS[2], "scenario_3_time": time_3
+    }
+
 def calculate_travel_times(distance_ly):
     """Calculates estimated travel times to a celestial body at various speeds.
     
@@ -66,30 +121,45 @@ def calculate_travel_times(distance_ly):
         dict: A dictionary containing travel time scenarios and their estimated durations.
               Returns "N/A" for times if distance is invalid.
     """
-    logger.debug(f"Calculating travel times for distance: {distance_ly} ly")
-    travel_info = {
-        "scenario_1_label": "Current tech (~0.0057% c)", "scenario_1_time": "N/A",
-        "scenario_2_label": "20% speed of light", "scenario_2_time": "N/A",
-        "scenario_3_label": "Near light speed (0.9999c)", "scenario_3_time": "N/A"
-    }
-    if pd.isna(distance_ly) or not isinstance(distance_ly, (int, float)) or distance_ly <= 0:
-        logger.debug("Travel times: Distance is N/A or invalid.")
-        return travel_info
-    
-    speeds = {
-        "Current tech (~0.0057% c)": 0.000057,
-        "20% speed of light": 0.20,
-        "Near light speed (0.9999c)": 0.9999
-    }
-    i = 1
-    for label, v_c in speeds.items():
-        if v_c > 0:
-            time_years = distance_ly / v_c
-            travel_info[f"scenario_{i}_time"] = f"{time_years:.1f} years"
-            logger.debug(f"Travel time for {label}: {travel_info[f'scenario_{i}_time']}")
-        i += 1
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    if debug_enabled: logger.debug(f"Calculating travel times for distance: {distance_ly} ly")
+    if _isna(distance_ly) or not isinstance(distance_ly, (int, float)) or distance_ly <= 0:
+        if debug_enabled: logger.debug("Travel times: Distance is N/A or invalid.")
+        return dict(_TRAVEL_NA)
+
+    travel_info = _travel_info(distance_ly)
+    if debug_enabled: logger.debug(f"Travel times: {travel_info}")
     return travel_info
 
+def calculate_travel_times_batch(distances_ly):
+    """Batch calculate_travel_times for an array of distances.
+    
+    Args:
+        distances_ly (array-like): Distances in light-years; NaN or non-positive
+                                   values count as invalid.
+    
+    Returns:
+        list: One calculate_travel_times dict per distance.
+    """
+    return [
+        _travel_info(distance) if distance > 0 else dict(_TRAVEL_NA)
+        for distance in np.asarray(distances_ly, dtype=np.float64).tolist()
+    ]
+
+# Upper bounds (exclusive) of each mass and temperature class, in order.
+_MASS_EDGES = (0.00001, 0.1, 0.5, 2, 10, 50, 5000)
+_MASS_CLASSES = ("Asteroidan", "Mercurian", "Subterran", "Terran", "Superterran",
+                 "Neptunian", "Jovian", "Unknown Mass Class")
+_TEMP_EDGES = (170, 220, 273, 323, 373)
+_TEMP_CLASSES = ("Hypopsychroplanet (Very Cold)", "Psychroplanet (Cold)", "Mesoplanet (Temperate 1)",
+                 "Mesoplanet (Temperate 2 - Optimal for Earth Life)", "Thermoplanet (Warm)",
+                 "Hyperthermoplanet (Hot)", "Unknown Temperature Class")
+# "<mass class> | <temperature class>" label for every (mass bin, temperature bin) pair.
+_CLASSIFICATION_LABELS = np.array(
+    [[f"{mass_class} | {temp_class}" for temp_class in _TEMP_CLASSES] for mass_class in _MASS_CLASSES],
+    dtype=object,
+)
+
 def classify_planet(mass_earth, radius_earth, temp_k):
     """Classifies a planet based on its mass, radius, and temperature.
     
@@ -105,43 +175,210 @@ def classify_planet(mass_earth, radius_earth, temp_k):
     Returns:
         str: A string combining the mass class and temperature class.
     """
-    logger.debug(f"Classifying planet with Mass: {mass_earth}, Radius: {radius_earth}, Temp: {temp_k}")
+    if logger.isEnabledFor(logging.DEBUG): logger.debug(f"Classifying planet with Mass: {mass_earth}, Radius: {radius_earth}, Temp: {temp_k}")
+    # NaN never compares equal to itself, so map missing values to None before the cache lookup
+    return _classify_planet_cached(
+        None if _isna(mass_earth) else mass_earth,
+        None if _isna(radius_earth) else radius_earth,
+        None if _isna(temp_k) else temp_k,
+    )
+
+@functools.lru_cache(maxsize=8192)
+def _classify_planet_cached(mass_earth, radius_earth, temp_k):
+    """Cached body of classify_planet; inputs are exact values with NaN mapped to None."""
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
     # Estimate mass from radius if mass is missing (simplified)
-    if pd.isna(mass_earth) and pd.notna(radius_earth) and radius_earth > 0:
+    if _isna(mass_earth) and not _isna(radius_earth) and radius_earth > 0:
         if radius_earth < 1.5: # Rocky
             mass_earth = (radius_earth / 1.0)**(1/0.3) # Simplified from R ~ M^0.3
-            logger.debug(f"Estimated mass for rocky planet: {mass_earth}")
+            if debug_enabled: logger.debug(f"Estimated mass for rocky planet: {mass_earth}")
         else: # Gaseous
             mass_earth = (radius_earth / 1.0)**(1/0.5) # Simplified from R ~ M^0.5
-            logger.debug(f"Estimated mass for gaseous planet: {mass_earth}")
-    
-    if pd.isna(mass_earth) or mass_earth <= 0:
-        mass_class = "Unknown Mass Class"
-    elif mass_earth < 0.00001: mass_class = "Asteroidan"
-    elif mass_earth < 0.1: mass_class = "Mercurian"
-    elif mass_earth < 0.5: mass_class = "Subterran"
-    elif mass_earth < 2: mass_class = "Terran"
-    elif mass_earth < 10: mass_class = "Superterran"
-    elif mass_earth < 50: mass_class = "Neptunian"
-    elif mass_earth < 5000: mass_class = "Jovian"
-    else: mass_class = "Unknown Mass Class" # pragma: no cover
-    logger.debug(f"Mass class: {mass_class}")
-
-    if pd.isna(temp_k) or temp_k < 0:
-        temp_class = "Unknown Temperature Class"
-    elif temp_k < 170: temp_class = "Hypopsychroplanet (Very Cold)" 
-    elif temp_k < 220: temp_class = "Psychroplanet (Cold)"
-    elif temp_k < 273: temp_class = "Mesoplanet (Temperate 1)"
-    elif temp_k < 323: temp_class = "Mesoplanet (Temperate 2 - Optimal for Earth Life)"
-    elif temp_k < 373: temp_class = "Thermoplanet (Warm)" # pragma: no cover
-    else: temp_class = "Hyperthermoplanet (Hot)" # pragma: no cover
-    logger.debug(f"Temperature class: {temp_class}")
-    
-    final_classification = f"{mass_class} | {temp_class}"
-    logger.debug(f"Final classification: {final_classification}")
+            if debug_enabled: logger.debug(f"Estimated mass for gaseous planet: {mass_earth}")
+    
+    if _isna(mass_earth) or mass_earth <= 0:
+        mass_idx = len(_MASS_CLASSES) - 1 # Unknown Mass Class
+    else:
+        mass_idx = bisect.bisect_right(_MASS_EDGES, mass_earth)
+    if _isna(temp_k) or temp_k < 0:
+        temp_idx = len(_TEMP_CLASSES) - 1 # Unknown Temperature Class
+    else:
+        temp_idx = bisect.bisect_right(_TEMP_EDGES, temp_k)
+    if debug_enabled: logger.debug(f"Mass class: {_MASS_CLASSES[mass_idx]}")
+    if debug_enabled: logger.debug(f"Temperature class: {_TEMP_CLASSES[temp_idx]}")
+
+    final_classification = _CLASSIFICATION_LABELS[mass_idx, temp_idx]
+    if debug_enabled: logger.debug(f"Final classification: {final_classification}")
     return final_classification
 
+def classify_planet_array(mass_earth, radius_earth, temp_k):
+    """Vectorized classify_planet for whole catalogs.
+    
+    Args:
+        mass_earth (array-like): Planet masses in Earth masses (NaN when missing).
+        radius_earth (array-like): Planet radii in Earth radii (NaN when missing).
+        temp_k (array-like): Equilibrium temperatures in Kelvin (NaN when missing).
+    
+    Returns:
+        np.ndarray: Object array with one classify_planet label per planet.
+    """
+    mass = np.asarray(mass_earth, dtype=np.float64)
+    radius = np.asarray(radius_earth, dtype=np.float64)
+    temp = np.asarray(temp_k, dtype=np.float64)
+
+    # Same mass-from-radius estimate as classify_planet
+    estimate = np.isnan(mass) & (radius > 0)
+    with np.errstate(invalid="ignore"):
+        estimated_mass = np.where(radius < 1.5, radius ** (1 / 0.3), radius ** (1 / 0.5))
+    mass = np.where(estimate, estimated_mass, mass)
+
+    mass_idx = np.where(np.isnan(mass) | (mass <= 0), len(_MASS_CLASSES) - 1,
+                        np.searchsorted(_MASS_EDGES, mass, side="right"))
+    temp_idx = np.where(np.isnan(temp) | (temp < 0), len(_TEMP_CLASSES) - 1,
+                        np.searchsorted(_TEMP_EDGES, temp, side="right"))
+    return _CLASSIFICATION_LABELS[mass_idx, temp_idx]
+
 # --- SEPHI Calculation  ---
+# Effective-flux polynomial coefficients (S_eff_sun, a, b, c, d) for the four
+# habitable zone limits: recent Venus, runaway greenhouse, maximum greenhouse
+# and early Mars. Each limit is scaled by the matching _HZ_MULT factor.
+_HZ_COEFFS = np.array([
+    [1.766, 1.335e-4, 3.151e-9, -3.348e-12, 5.733e-16],
+    [1.038, 1.246e-4, 2.874e-9, -3.06e-12, 5.279e-16],
+    [0.3438, 5.894e-5, 1.628e-9, -1.698e-12, 2.92e-16],
+    [0.3179, 5.451e-5, 1.526e-9, -1.598e-12, 2.747e-16],
+], dtype=np.float64)
+_HZ_MULT = np.array([0.68, 1.0, 1.0, 1.35], dtype=np.float64)
+# Plain-float copies for the per-planet path, where NumPy scalar math is slower.
+_HZ_COEFF_ROWS = tuple(tuple(row) for row in _HZ_COEFFS.tolist())
+_HZ_MULT_ROWS = tuple(_HZ_MULT.tolist())
+
+def _quartic(s, a, b, c, d, x):
+    """Evaluates s + a*x + b*x^2 + c*x^3 + d*x^4 in Horner form (floats or arrays)."""
+    return s + x * (a + x * (b + x * (c + x * d)))
+
+def _hz_distances(stellar_luminosity, t_eff_diff):
+    """Computes the four SEPHI habitable zone boundaries in AU.
+    
+    Accepts scalars or equally shaped arrays, so the same coefficient table
+    serves a single planet or a whole catalog.
+    
+    Args:
+        stellar_luminosity (float or np.ndarray): Luminosity in L_sun.
+        t_eff_diff (float or np.ndarray): Stellar Teff minus 5780 K.
+    
+    Returns:
+        np.ndarray: Array of shape (4,) or (4, N) with the distances; 0 where
+                    the effective flux is not positive.
+    """
+    t = np.asarray(t_eff_diff, dtype=np.float64)
+    coeffs = _HZ_COEFFS.reshape((4, 5) + (1,) * t.ndim)
+    s_eff = _quartic(*(coeffs[:, k] for k in range(5)), t)
+    mult = _HZ_MULT.reshape((4,) + (1,) * t.ndim)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        distances = np.sqrt(stellar_luminosity / s_eff) * mult
+    return np.where(s_eff > 0, distances, 0.0)
+
+@functools.lru_cache(maxsize=4096)
+def _stellar_hz_distances(sr, st):
+    """Per-star part of SEPHI: the four HZ boundaries (AU) for a stellar radius and Teff.
+    
+    Cached so planets of the same host star reuse the luminosity and the four
+    effective-flux polynomials instead of recomputing them.
+    """
+    solar_teff_ref = 5778 # K
+    stellar_luminosity = (sr ** 2) * ((st / solar_teff_ref) ** 4) # L_star / L_sun
+    t_eff_diff = st - 5780
+    hz_distances = []
+    for coeffs, mult in zip(_HZ_COEFF_ROWS, _HZ_MULT_ROWS):
+        s_eff = _quartic(*coeffs, t_eff_diff)
+        hz_distances.append(math.sqrt(stellar_luminosity / s_eff) * mult if s_eff > 0 else 0)
+    return tuple(hz_distances)
+
+# L4 (magnetic moment) model parameters per regime: (sqrt(rho_0n), r_0n / R_p, F_n / R_p)
+# for a surface-like planet and for gaseous planets with R_p <= 5, <= 15 and > 15 Earth radii.
+_L4_PARAMS = ((1.0, 1.0, 1.0), (0.45 ** 0.5, 1.8, 4.0), (0.18 ** 0.5, 4.8, 20.0), (0.16 ** 0.5, 16.0, 100.0))
+_L4_RADIUS_EDGES = (5.0, 15.0)
+_L4_PARAMS_ARRAY = np.array(_L4_PARAMS)
+
+def _sephi_l4(L1, pr, is_tidally_locked):
+    """SEPHI L4 likelihood from the planet's normalised magnetic moment.
+    
+    Args:
+        L1 (float): SEPHI L1 likelihood; above 0.5 the planet is treated as surface-like.
+        pr (float): Planet radius in Earth radii.
+        is_tidally_locked (bool): Whether the planet is within the tidal locking distance.
+    
+    Returns:
+        float: L4 in [0, 1].
+    """
+    if L1 > 0.5:
+        rho_sqrt, r_factor, f_factor = _L4_PARAMS[0]
+        alpha_val = 0.05 if is_tidally_locked else 1.0
+    else:
+        rho_sqrt, r_factor, f_factor = _L4_PARAMS[1 + bisect.bisect_left(_L4_RADIUS_EDGES, pr)]
+        alpha_val = 1.0
+    M_n_val = alpha_val * rho_sqrt * ((r_factor * pr) ** (10/3)) * ((f_factor * pr) ** (1/3))
+    return 1.0 if M_n_val >= 1.0 else math.exp(-0.5 * ((M_n_val - 1.0) / (1.0 / 3)) ** 2)
+
+@functools.lru_cache(maxsize=8192)
+def _sephi_core(pm, pr, po, sm, sr, st, sa, pdens):
+    """Pure numeric SEPHI kernel on already validated, positive float inputs.
+    
+    Memoized on the exact inputs, so regenerating reports for the same planets
+    skips the math entirely.
+    
+    Args:
+        pm, pr, po, sm, sr, st, sa (float): Planet mass, radius, orbital period,
+            stellar mass, radius, Teff and system age (see calculate_sephi).
+        pdens (float or None): Planet density in g/cm^3; estimated from mass and
+            radius when None.
+    
+    Returns:
+        tuple: (SEPHI, L1, L2, L3, L4) as fractions in [0, 1].
+    """
+    mu_1_mp = pm ** 0.27
+    mu_2_mp = pm ** 0.5
+    sigma_1_mp = (mu_2_mp - mu_1_mp) / 3 if (mu_2_mp - mu_1_mp) != 0 else 0.1
+    if sigma_1_mp == 0: sigma_1_mp = 0.1 # Avoid division by zero
+    if pr <= mu_1_mp: L1 = 1.0
+    elif mu_1_mp < pr < mu_2_mp: L1 = math.exp(-0.5 * ((pr - mu_1_mp) / sigma_1_mp) ** 2)
+    else: L1 = 0.0 # pragma: no cover
+
+    # Escape velocity relative to Earth: v_e = sqrt(g * R) = sqrt(M / R) in Earth units
+    v_e_relative = math.sqrt(pm / pr)
+    sigma_21, sigma_22 = (1.0 - 0.0) / 3, (8.66 - 1.0) / 3 # Assuming sigma can"t be zero
+    if sigma_21 == 0: sigma_21 = 0.1
+    if sigma_22 == 0: sigma_22 = 0.1
+    if v_e_relative < 1.0: L2 = math.exp(-0.5 * ((v_e_relative - 1.0) / sigma_21) ** 2)
+    else: L2 = math.exp(-0.5 * ((v_e_relative - 1.0) / sigma_22) ** 2)
+    
+    G_const, solar_mass_kg_ref = 6.67430e-11, 1.989e30
+    stellar_mass_kg = sm * solar_mass_kg_ref
+    orbital_period_seconds = po * 86400
+    a_meters = ((G_const * stellar_mass_kg * (orbital_period_seconds ** 2)) / (4 * math.pi ** 2)) ** (1/3)
+    au_per_meter_val = 6.68459e-12
+    semi_major_axis = a_meters * au_per_meter_val # in AU
+    d1, d2_hz, d3_hz, d4 = _stellar_hz_distances(sr, st)
+    mu_31, sigma_31 = d2_hz, (d2_hz - d1) / 3 if (d2_hz - d1) != 0 else 0.1
+    mu_32, sigma_32 = d3_hz, (d4 - d3_hz) / 3 if (d4 - d3_hz) != 0 else 0.1
+    if sigma_31 == 0: sigma_31 = 0.1
+    if sigma_32 == 0: sigma_32 = 0.1
+    if d2_hz <= semi_major_axis <= d3_hz: L3 = 1.0
+    elif semi_major_axis < d2_hz: L3 = 0.0 if semi_major_axis < d1 else math.exp(-0.5 * ((semi_major_axis - mu_31) / sigma_31) ** 2)
+    else: L3 = 0.0 if semi_major_axis > d4 else math.exp(-0.5 * ((semi_major_axis - mu_32) / sigma_32) ** 2)
+
+    earth_density_ref = 5.51 # g/cm^3
+    planet_density_actual = pdens if pdens is not None else (earth_density_ref * (pm / (pr ** 3)) if pr > 0 and pm is not None else earth_density_ref)
+    t_gyr_norm = sa / 10.0 if sa is not None else 0.5 # Assuming 0.5 if age is unknown
+    a_lock = (sm ** (1/3)) * ((planet_density_actual / earth_density_ref) ** (-1/3)) * (t_gyr_norm ** (1/6)) * 0.06 if earth_density_ref > 0 else 0
+    is_tidally_locked = semi_major_axis <= a_lock
+    L4 = _sephi_l4(L1, pr, is_tidally_locked)
+
+    product = L1 * L2 * L3 * L4
+    sephi_val = product ** (1/4) if product > 0 else 0.0
+    return sephi_val, L1, L2, L3, L4
+
 def calculate_sephi(planet_mass, planet_radius, orbital_period, stellar_mass, stellar_radius, stellar_teff, system_age, planet_density_val, planet_name_for_log):
     """Calculates the Standard Exoplanet Habitability Index (SEPHI) and its components.
     
@@ -164,20 +401,21 @@ def calculate_sephi(planet_mass, planet_radius, orbital_period, stellar_mass, st
         tuple: (SEPHI_score, L1, L2, L3, L4) all as percentages, or
                (None, None, None, None, None) if core parameters are missing/invalid.
     """
-    logger.debug(f"Calculating SEPHI for {planet_name_for_log} with inputs: pm={planet_mass}, pr={planet_radius}, po={orbital_period}, sm={stellar_mass}, sr={stellar_radius}, st={stellar_teff}, sa={system_age}, pdens={planet_density_val}")
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    if debug_enabled: logger.debug(f"Calculating SEPHI for {planet_name_for_log} with inputs: pm={planet_mass}, pr={planet_radius}, po={orbital_period}, sm={stellar_mass}, sr={stellar_radius}, st={stellar_teff}, sa={system_age}, pdens={planet_density_val}")
     params_to_check = [planet_mass, planet_radius, orbital_period, stellar_mass, stellar_radius, stellar_teff, system_age]
     param_names = ["pl_masse", "pl_rade", "pl_orbper", "st_mass", "st_rad", "st_teff", "st_age"]
     converted_params = {}
     for name, p_val in zip(param_names, params_to_check):
         if isinstance(p_val, str) and p_val.strip() == "": converted_params[name] = None
         else:
-            try: converted_params[name] = float(p_val) if p_val is not None and not pd.isna(p_val) else None
+            try: converted_params[name] = None if _isna(p_val) else float(p_val)
             except ValueError: converted_params[name] = None # pragma: no cover
     
     pm, pr, po, sm, sr, st, sa = (converted_params["pl_masse"], converted_params["pl_rade"], converted_params["pl_orbper"], 
                                    converted_params["st_mass"], converted_params["st_rad"], converted_params["st_teff"], converted_params["st_age"])
-    pdens = float(planet_density_val) if planet_density_val is not None and not pd.isna(planet_density_val) else None
-    logger.debug(f"SEPHI Converted Params: pm={pm}, pr={pr}, po={po}, sm={sm}, sr={sr}, st={st}, sa={sa}, pdens={pdens}")
+    pdens = None if _isna(planet_density_val) else float(planet_density_val)
+    if debug_enabled: logger.debug(f"SEPHI Converted Params: pm={pm}, pr={pr}, po={po}, sm={sm}, sr={sr}, st={st}, sa={sa}, pdens={pdens}")
 
     if any(p is None for p in [pm, pr, po, sm, sr, st, sa]):
         logger.warning(f"SEPHI calculation skipped for {planet_name_for_log} due to missing core parameters after conversion.")
@@ -188,79 +426,155 @@ def calculate_sephi(planet_mass, planet_radius, orbital_period, stellar_mass, st
         logger.warning(f"SEPHI calculation skipped for {planet_name_for_log} due to non-positive core parameters: {non_positive_check}")
         return None, None, None, None, None
 
-    mu_1_mp = pm ** 0.27
-    mu_2_mp = pm ** 0.5
-    sigma_1_mp = (mu_2_mp - mu_1_mp) / 3 if (mu_2_mp - mu_1_mp) != 0 else 0.1
-    if sigma_1_mp == 0: sigma_1_mp = 0.1 # Avoid division by zero
-    if pr <= mu_1_mp: L1 = 1.0
-    elif mu_1_mp < pr < mu_2_mp: L1 = math.exp(-0.5 * ((pr - mu_1_mp) / sigma_1_mp) ** 2)
-    else: L1 = 0.0 # pragma: no cover
+    sephi_val, L1, L2, L3, L4 = _sephi_core(pm, pr, po, sm, sr, st, sa, pdens)
+    if debug_enabled: logger.debug(f"SEPHI for {planet_name_for_log}: {sephi_val*100:.2f} (L1:{L1*100:.1f}, L2:{L2*100:.1f}, L3:{L3*100:.1f}, L4:{L4*100:.1f})")
+    return sephi_val * 100, L1 * 100, L2 * 100, L3 * 100, L4 * 100
 
-    earth_mass_ref, earth_radius_ref = 1.0, 1.0 # Earth units
-    earth_g = earth_mass_ref / (earth_radius_ref ** 2)
-    earth_v_e = math.sqrt(earth_g * earth_radius_ref)
-    planet_g = pm / (pr ** 2)
-    v_e = math.sqrt(planet_g * pr)
-    v_e_relative = v_e / earth_v_e if earth_v_e > 0 else 0
-    sigma_21, sigma_22 = (1.0 - 0.0) / 3, (8.66 - 1.0) / 3 # Assuming sigma can"t be zero
-    if sigma_21 == 0: sigma_21 = 0.1
-    if sigma_22 == 0: sigma_22 = 0.1
-    if v_e_relative < 1.0: L2 = math.exp(-0.5 * ((v_e_relative - 1.0) / sigma_21) ** 2)
-    else: L2 = math.exp(-0.5 * ((v_e_relative - 1.0) / sigma_22) ** 2)
+def calculate_sephi_batch(planet_mass, planet_radius, orbital_period, stellar_mass, stellar_radius, stellar_teff, system_age, planet_density_val):
+    """Vectorized calculate_sephi over whole catalog columns.
     
-    solar_teff_ref = 5778 # K
-    stellar_luminosity = (sr ** 2) * ((st / solar_teff_ref) ** 4) # L_star / L_sun
-    G_const, solar_mass_kg_ref = 6.67430e-11, 1.989e30
-    stellar_mass_kg = sm * solar_mass_kg_ref
-    orbital_period_seconds = po * 86400
-    a_meters = ((G_const * stellar_mass_kg * (orbital_period_seconds ** 2)) / (4 * math.pi ** 2)) ** (1/3)
-    au_per_meter_val = 6.68459e-12
-    semi_major_axis = a_meters * au_per_meter_val # in AU
-    t_eff_diff = st - 5780
-    s_eff_sun_rv, a_rv, b_rv, c_rv, d_rv = 1.766, 1.335e-4, 3.151e-9, -3.348e-12, 5.733e-16
-    s_eff_rv = s_eff_sun_rv + a_rv*t_eff_diff + b_rv*(t_eff_diff**2) + c_rv*(t_eff_diff**3) + d_rv*(t_eff_diff**4)
-    d1 = math.sqrt(stellar_luminosity / s_eff_rv) * 0.68 if s_eff_rv > 0 else 0
-    s_eff_sun_rg, a_rg, b_rg, c_rg, d_rg = 1.038, 1.246e-4, 2.874e-9, -3.06e-12, 5.279e-16
-    s_eff_rg = s_eff_sun_rg + a_rg*t_eff_diff + b_rg*(t_eff_diff**2) + c_rg*(t_eff_diff**3) + d_rg*(t_eff_diff**4)
-    d2_hz = math.sqrt(stellar_luminosity / s_eff_rg) if s_eff_rg > 0 else 0
-    s_eff_sun_mg, a_mg, b_mg, c_mg, d_mg = 0.3438, 5.894e-5, 1.628e-9, -1.698e-12, 2.92e-16
-    s_eff_mg = s_eff_sun_mg + a_mg*t_eff_diff + b_mg*(t_eff_diff**2) + c_mg*(t_eff_diff**3) + d_mg*(t_eff_diff**4)
-    d3_hz = math.sqrt(stellar_luminosity / s_eff_mg) if s_eff_mg > 0 else 0
-    s_eff_sun_em, a_em, b_em, c_em, d_em = 0.3179, 5.451e-5, 1.526e-9, -1.598e-12, 2.747e-16
-    s_eff_em = s_eff_sun_em + a_em*t_eff_diff + b_em*(t_eff_diff**2) + c_em*(t_eff_diff**3) + d_em*(t_eff_diff**4)
-    d4 = math.sqrt(stellar_luminosity / s_eff_em) * 1.35 if s_eff_em > 0 else 0
-    mu_31, sigma_31 = d2_hz, (d2_hz - d1) / 3 if (d2_hz - d1) != 0 else 0.1
-    mu_32, sigma_32 = d3_hz, (d4 - d3_hz) / 3 if (d4 - d3_hz) != 0 else 0.1
-    if sigma_31 == 0: sigma_31 = 0.1
-    if sigma_32 == 0: sigma_32 = 0.1
-    if d2_hz <= semi_major_axis <= d3_hz: L3 = 1.0
-    elif semi_major_axis < d2_hz: L3 = 0.0 if semi_major_axis < d1 else math.exp(-0.5 * ((semi_major_axis - mu_31) / sigma_31) ** 2)
-    else: L3 = 0.0 if semi_major_axis > d4 else math.exp(-0.5 * ((semi_major_axis - mu_32) / sigma_32) ** 2)
+    Applies the same L1-L4 model as calculate_sephi to every planet at once
+    with NumPy array operations instead of one Python call per planet.
+    
+    Args:
+        planet_mass, planet_radius, orbital_period, stellar_mass, stellar_radius,
+        stellar_teff, system_age, planet_density_val (array-like): Equally sized
+            numeric columns, same units as calculate_sephi. NaN marks a missing value.
+    
+    Returns:
+        tuple: (SEPHI, L1, L2, L3, L4) float arrays as percentages. Rows with a
+               missing or non-positive core parameter are NaN in every array.
+    """
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    pm, pr, po, sm, sr, st, sa = (np.asarray(v, dtype=np.float64) for v in
+                                  (planet_mass, planet_radius, orbital_period, stellar_mass, stellar_radius, stellar_teff, system_age))
+    pdens = np.asarray(planet_density_val, dtype=np.float64)
+    core = np.stack([pm, pr, po, sm, sr, st, sa])
+    valid = np.all(np.isfinite(core) & (core > 0), axis=0)
 
-    earth_density_ref = 5.51 # g/cm^3
-    planet_density_actual = pdens if pdens is not None else (earth_density_ref * (pm / (pr ** 3)) if pr > 0 and pm is not None else earth_density_ref)
-    t_gyr_norm = sa / 10.0 if sa is not None else 0.5 # Assuming 0.5 if age is unknown
-    a_lock = (sm ** (1/3)) * ((planet_density_actual / earth_density_ref) ** (-1/3)) * (t_gyr_norm ** (1/6)) * 0.06 if earth_density_ref > 0 else 0
-    is_tidally_locked = semi_major_axis <= a_lock
-    beta_1_val = pr
-    if L1 > 0.5:
-        rho_0n, r_0n, F_n = 1.0, beta_1_val, beta_1_val
-        alpha_val = 0.05 if is_tidally_locked else 1.0
-    else:
-        if pr <= 5.0: rho_0n, r_0n, F_n = 0.45, 1.8 * beta_1_val, 4 * beta_1_val
-        elif pr <= 15.0: rho_0n, r_0n, F_n = 0.18, 4.8 * beta_1_val, 20 * beta_1_val
-        else: rho_0n, r_0n, F_n = 0.16, 16 * beta_1_val, 100 * beta_1_val # pragma: no cover
-        alpha_val = 1.0
-    M_n_val = alpha_val * (rho_0n ** 0.5) * (r_0n ** (10/3)) * (F_n ** (1/3))
-    mu_4, sigma_4 = 1.0, (1.0 - 0.0) / 3
-    if sigma_4 == 0: sigma_4 = 0.1
-    L4 = 1.0 if M_n_val >= 1.0 else math.exp(-0.5 * ((M_n_val - mu_4) / sigma_4) ** 2)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        mu_1_mp = pm ** 0.27
+        mu_2_mp = pm ** 0.5
+        sigma_1_mp = np.where(mu_2_mp != mu_1_mp, (mu_2_mp - mu_1_mp) / 3, 0.1)
+        L1 = np.where(pr <= mu_1_mp, 1.0,
+                      np.where(pr < mu_2_mp, np.exp(-0.5 * ((pr - mu_1_mp) / sigma_1_mp) ** 2), 0.0))
 
-    sephi_val = (L1 * L2 * L3 * L4) ** (1/4) if L1*L2*L3*L4 > 0 else 0.0
-    logger.info(f"SEPHI for {planet_name_for_log}: {sephi_val*100:.2f} (L1:{L1*100:.1f}, L2:{L2*100:.1f}, L3:{L3*100:.1f}, L4:{L4*100:.1f})")
-    return sephi_val * 100, L1 * 100, L2 * 100, L3 * 100, L4 * 100
+        v_e_relative = np.sqrt(pm / pr)
+        sigma_2 = np.where(v_e_relative < 1.0, 1.0 / 3, 7.66 / 3)
+        L2 = np.exp(-0.5 * ((v_e_relative - 1.0) / sigma_2) ** 2)
+
+        stellar_luminosity = (sr ** 2) * ((st / 5778) ** 4)
+        orbital_period_seconds = po * 86400
+        a_meters = ((6.67430e-11 * sm * 1.989e30 * (orbital_period_seconds ** 2)) / (4 * math.pi ** 2)) ** (1/3)
+        semi_major_axis = a_meters * 6.68459e-12
+        d1, d2_hz, d3_hz, d4 = _hz_distances(stellar_luminosity, st - 5780)
+        sigma_31 = np.where(d2_hz != d1, (d2_hz - d1) / 3, 0.1)
+        sigma_32 = np.where(d4 != d3_hz, (d4 - d3_hz) / 3, 0.1)
+        inner = np.where(semi_major_axis < d1, 0.0, np.exp(-0.5 * ((semi_major_axis - d2_hz) / sigma_31) ** 2))
+        outer = np.where(semi_major_axis > d4, 0.0, np.exp(-0.5 * ((semi_major_axis - d3_hz) / sigma_32) ** 2))
+        L3 = np.where((d2_hz <= semi_major_axis) & (semi_major_axis <= d3_hz), 1.0,
+                      np.where(semi_major_axis < d2_hz, inner, outer))
+
+        earth_density_ref = 5.51
+        planet_density_actual = np.where(np.isnan(pdens), earth_density_ref * (pm / (pr ** 3)), pdens)
+        a_lock = (sm ** (1/3)) * ((planet_density_actual / earth_density_ref) ** (-1/3)) * ((sa / 10.0) ** (1/6)) * 0.06
+        is_tidally_locked = semi_major_axis <= a_lock
+        surface_like = L1 > 0.5
+        regime = np.where(surface_like, 0, 1 + np.searchsorted(_L4_RADIUS_EDGES, pr, side="left"))
+        rho_sqrt, r_factor, f_factor = _L4_PARAMS_ARRAY[regime].T
+        alpha_val = np.where(surface_like & is_tidally_locked, 0.05, 1.0)
+        M_n_val = alpha_val * rho_sqrt * ((r_factor * pr) ** (10/3)) * ((f_factor * pr) ** (1/3))
+        L4 = np.where(M_n_val >= 1.0, 1.0, np.exp(-0.5 * ((M_n_val - 1.0) / (1.0 / 3)) ** 2))
+
+        product = L1 * L2 * L3 * L4
+        sephi_val = np.where(product > 0, product ** 0.25, 0.0)
+
+    if debug_enabled: logger.debug(f"SEPHI batch: {int(valid.sum())} of {valid.size} planets have complete core parameters.")
+    return tuple(np.where(valid, component * 100, np.nan) for component in (sephi_val, L1, L2, L3, L4))
+
+_SEPHI_INPUT_COLUMNS = ["pl_masse", "pl_rade", "pl_orbper", "st_mass", "st_rad", "st_teff", "st_age", "pl_dens"]
+
+def calculate_sephi_catalog(catalog_df):
+    """Calculates SEPHI and L1-L4 for every planet of a catalog DataFrame.
+    
+    The eight input columns are pulled out as one float64 block and passed to
+    calculate_sephi_batch in a single call. Missing columns count as N/A.
+    
+    Args:
+        catalog_df (pd.DataFrame): One row per planet with NASA archive column names.
+    
+    Returns:
+        pd.DataFrame: Columns "SEPHI", "L1", "L2", "L3", "L4" (percentages, NaN when
+                      SEPHI could not be computed), indexed like catalog_df.
+    """
+    inputs = catalog_df.reindex(columns=_SEPHI_INPUT_COLUMNS).apply(pd.to_numeric, errors="coerce")
+    results = calculate_sephi_batch(*inputs.to_numpy(dtype=np.float64).T)
+    return pd.DataFrame(dict(zip(["SEPHI", "L1", "L2", "L3", "L4"], results)), index=catalog_df.index)
+
+# Report labels of the SEPHI components L1-L4, and the (score, color) shown when SEPHI is N/A
+_SEPHI_LABELS = ("L1 (Surface)", "L2 (Escape Velocity)", "L3 (Habitable Zone)", "L4 (Magnetic Field)")
+_SEPHI_NA = ("N/A", get_color_for_percentage(None))
+_SEPHI_NA_DICT = {"SEPHI": _SEPHI_NA, **{f"L{i}": _SEPHI_NA for i in range(1, 5)}}
+
+def calculate_sephi_scores_for_report_batch(sephi_df):
+    """Builds the per-planet SEPHI report dicts for a whole catalog at once.
+    
+    Rounding (SEPHI to 2 decimals, L1-L4 to 1) and color lookup are done once per
+    column instead of five round()/get_color_for_percentage calls per planet.
+    
+    Args:
+        sephi_df (pd.DataFrame): Output of calculate_sephi_catalog.
+    
+    Returns:
+        list: One dict per row, shaped like process_planet_data's "sephi_scores_for_report".
+    """
+    values = sephi_df.to_numpy(dtype=np.float64)
+    rounded = np.empty_like(values)
+    np.round(values[:, :1], 2, out=rounded[:, :1])
+    np.round(values[:, 1:], 1, out=rounded[:, 1:])
+    labels = ("SEPHI",) + _SEPHI_LABELS
+    columns = [zip(rounded[:, i].tolist(), get_colors_for_percentages(values[:, i]).tolist()) for i in range(5)]
+    return [
+        dict(_SEPHI_NA_DICT) if is_na else dict(zip(labels, row))
+        for is_na, row in zip(np.isnan(values[:, 0]).tolist(), zip(*columns))
+    ]
 
 # --- Core Calculation Functions ---
+def _esi_scaled_components(planet_vals, earth_vals, weight_vals, max_weight=1.0):
+    """Computes the weight-scaled ESI similarity components element-wise.
+    
+    Args:
+        planet_vals (np.ndarray): Planet parameter values.
+        earth_vals (np.ndarray): Earth reference values, same shape.
+        weight_vals (np.ndarray): Weights, same shape (or broadcastable).
+        max_weight (float): Weight that maps a component to 1.0.
+    
+    Returns:
+        np.ndarray: Scaled components in [0, 1]. A zero weight keeps the raw similarity.
+    """
+    totals = planet_vals + earth_vals
+    with np.errstate(divide="ignore", invalid="ignore"):
+        similarity = np.where(totals == 0, 0.0, 1.0 - np.abs((planet_vals - earth_vals) / totals))
+    similarity = np.maximum(similarity, 0.0)
+    # Quando weight_val = 0.0, usar a similaridade real
+    return np.where(weight_vals == 0.0, similarity, similarity + (1.0 - similarity) * (weight_vals / max_weight))
+
+@functools.lru_cache(maxsize=8192)
+def _esi_from_params(valid_params, max_weight):
+    """ESI percentage from (planet, earth, weight) float triples; memoized on the exact values.
+    
+    Scalar twin of _esi_scaled_components in plain float math, which is much
+    cheaper than building NumPy arrays for three values.
+    """
+    total = 0.0
+    for planet_val, earth_val, weight_val in valid_params:
+        denominator = planet_val + earth_val
+        similarity = 0.0 if denominator == 0 else 1.0 - abs((planet_val - earth_val) / denominator)
+        if similarity < 0.0: similarity = 0.0
+        # Quando weight_val = 0.0, usar a similaridade real
+        total += similarity if weight_val == 0.0 else similarity + (1.0 - similarity) * (weight_val / max_weight)
+    return total / len(valid_params) * 100
+
 def calculate_esi_score(planet_data, weights):
     """Calculates the Earth Similarity Index (ESI) for a planet.
     
@@ -277,49 +591,35 @@ def calculate_esi_score(planet_data, weights):
         tuple: (float ESI_score (0-100), str color_code_for_ESI).
                Returns 0.0 if no valid components are found.
     """
-    logger.debug(f"Calculating ESI for planet: {planet_data.get('pl_name', 'Unknown')}")
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    if debug_enabled: logger.debug(f"Calculating ESI for planet: {planet_data.get('pl_name', 'Unknown')}")
     earth_params = {"pl_rade": 1.0, "pl_dens": 5.51, "pl_eqt": 255.0}
     esi_factors_map = {
         "pl_rade": weights.get("Size", 1.0),
         "pl_dens": weights.get("Density", 1.0),
         "pl_eqt": weights.get("Habitable Zone", 1.0)
     }
-    esi_components = []
-    num_params = 0
     max_weight = 1.0
 
+    valid_params = []
     for param_key, weight_val in esi_factors_map.items():
         planet_val = planet_data.get(param_key)
-        earth_val = earth_params.get(param_key)
-        logger.debug(f"ESI param: {param_key}, Planet val: {planet_val}, Earth val: {earth_val}, Weight: {weight_val}")
-        if pd.notna(planet_val) and pd.notna(earth_val) and earth_val != 0:
+        earth_val = earth_params[param_key]
+        if debug_enabled: logger.debug(f"ESI param: {param_key}, Planet val: {planet_val}, Earth val: {earth_val}, Weight: {weight_val}")
+        if not _isna(planet_val):
             try:
-                planet_val_fl = float(planet_val)
-                earth_val_fl = float(earth_val)
-                if (planet_val_fl + earth_val_fl) == 0:
-                    similarity_component = 0.0 # pragma: no cover
-                else:
-                    similarity_component = 1.0 - abs((planet_val_fl - earth_val_fl) / (planet_val_fl + earth_val_fl))
-                if similarity_component < 0:
-                    similarity_component = 0.0 # pragma: no cover
-                # Quando weight_val = 0.0, usar a similaridade real
-                scaled_component = similarity_component if weight_val == 0.0 else (
-                    similarity_component + (1.0 - similarity_component) * (weight_val / max_weight)
-                )
-                esi_components.append(scaled_component)
-                num_params += 1
-                logger.debug(f"ESI scaled component for {param_key}: {scaled_component}, Similarity: {similarity_component}")
+                valid_params.append((float(planet_val), earth_val, float(weight_val)))
             except (ValueError, TypeError) as e: # pragma: no cover
                 logger.warning(f"Could not convert ESI param {param_key} values to float: {planet_val}, {earth_val}. Error: {e}") # pragma: no cover
         else:
-            logger.debug(f"Skipping ESI param {param_key} due to missing or invalid data: planet_val={planet_val}, earth_val={earth_val}")
+            if debug_enabled: logger.debug(f"Skipping ESI param {param_key} due to missing or invalid data: planet_val={planet_val}, earth_val={earth_val}")
 
-    if not esi_components or num_params == 0:
+    if not valid_params:
         logger.warning("No valid ESI components found.")
         return 0.0, get_color_for_percentage(0.0)
 
-    final_esi = (sum(esi_components) / num_params) * 100 if num_params > 0 else 0.0
-    logger.info(f"Final ESI for {planet_data.get('pl_name', 'Unknown')}: {final_esi}")
+    final_esi = _esi_from_params(tuple(valid_params), max_weight)
+    if debug_enabled: logger.debug(f"Final ESI for {planet_data.get('pl_name', 'Unknown')}: {final_esi}")
     return round(final_esi, 2), get_color_for_percentage(final_esi)
 
 def calculate_sph_score(planet_data, weights):
@@ -339,13 +639,14 @@ def calculate_sph_score(planet_data, weights):
         tuple: (float SPH_score (0-100), str color_code_for_SPH).
                Returns 0.0 if temperature is N/A.
     """
-    logger.debug(f"Calculating SPH for planet: {planet_data.get('pl_name', 'Unknown')}")
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    if debug_enabled: logger.debug(f"Calculating SPH for planet: {planet_data.get('pl_name', 'Unknown')}")
     temp_k = planet_data.get("pl_eqt")
     score = 0.0
-    if pd.notna(temp_k):
+    if not _isna(temp_k):
         try:
             temp_k_fl = float(temp_k)
-            logger.debug(f"SPH temp_k_fl: {temp_k_fl}")
+            if debug_enabled: logger.debug(f"SPH temp_k_fl: {temp_k_fl}")
             if 273.15 <= temp_k_fl <= 323.15:
                 mid_optimal = (273.15 + 323.15) / 2
                 score = 70 + (1 - abs(temp_k_fl - mid_optimal) / (mid_optimal - 273.15)) * 30
@@ -356,12 +657,42 @@ def calculate_sph_score(planet_data, weights):
             logger.warning(f"Could not convert SPH temp_k to float: {temp_k}. Error: {e}")
             return 0.0, get_color_for_percentage(0.0)
     else:
-        logger.debug("SPH temp_k is N/A.")
+        if debug_enabled: logger.debug("SPH temp_k is N/A.")
         return 0.0, get_color_for_percentage(0.0)
-    final_sph = max(0, min(score, 100))
-    logger.info(f"Final SPH for {planet_data.get('pl_name', 'Unknown')}: {final_sph}")
+    final_sph = score if 0 <= score <= 100 else (100 if score > 100 else 0) # NaN clips to 0 as well
+    if debug_enabled: logger.debug(f"Final SPH for {planet_data.get('pl_name', 'Unknown')}: {final_sph}")
     return round(final_sph, 2), get_color_for_percentage(final_sph)
 
+# SPH score per temperature band: N/A, optimal (interpolated, see below), near-optimal, other
+_SPH_BAND_SCORES = (0.0, None, 40, 10)
+
+def calculate_sph_score_batch(catalog_df):
+    """Vectorized calculate_sph_score over a catalog.
+    
+    Args:
+        catalog_df (pd.DataFrame): One row per planet with 'pl_eqt'.
+    
+    Returns:
+        tuple: (scores, colors) lists with one calculate_sph_score result per row.
+    """
+    temp_k = _catalog_column(catalog_df, "pl_eqt")
+    mid_optimal = (273.15 + 323.15) / 2
+    band = np.select(
+        [np.isnan(temp_k),
+         (273.15 <= temp_k) & (temp_k <= 323.15),
+         ((250 <= temp_k) & (temp_k < 273.15)) | ((323.15 < temp_k) & (temp_k <= 373.15))],
+        [0, 1, 2], default=3)
+    optimal_score = 70 + (1 - np.abs(temp_k - mid_optimal) / (mid_optimal - 273.15)) * 30
+    score = np.where(band == 1, optimal_score, np.array([0.0, 0.0, 40.0, 10.0])[band])
+    values = [round(value, 2) if band_idx == 1 else _SPH_BAND_SCORES[band_idx]
+              for value, band_idx in zip(score.tolist(), band.tolist())]
+    return values, get_colors_for_percentages(score).tolist()
+
+# PHI factors in their canonical order, and the spectral classes whose stars
+# count as a stable energy source
+_PHI_FACTORS = ("Solid Surface", "Stable Energy", "Life Compounds", "Stable Orbit")
+_GK_SPECTYPES = frozenset("GK")
+
 def calculate_phi_score(planet_data, phi_weights):
     """Calculates a Planetary Habitability Index (PHI) score.
     
@@ -378,72 +709,156 @@ def calculate_phi_score(planet_data, phi_weights):
         tuple: (float PHI_score (0-100), str color_code_for_PHI).
                Returns 0.0 if total weight is zero.
     """
-    logger.debug(f"Calculating PHI for planet: {planet_data.get('pl_name', 'Unknown')}")
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    if debug_enabled: logger.debug(f"Calculating PHI for planet: {planet_data.get('pl_name', 'Unknown')}")
     
-    factors_present_scores = {
-        "Solid Surface": 0.0,
-        "Stable Energy": 0.0,
-        "Life Compounds": 0.0,
-        "Stable Orbit": 0.0
-    }
+    factors_present_scores = dict.fromkeys(_PHI_FACTORS, 0.0)
 
     # Avaliação automática de "Solid Surface"
     if "Terran" in planet_data.get("classification", "") or "Superterran" in planet_data.get("classification", ""):
         factors_present_scores["Solid Surface"] = 0.8
-        logger.debug("Solid Surface detected: score 0.8")
+        if debug_enabled: logger.debug("Solid Surface detected: score 0.8")
 
     # Avaliação automática de "Stable Energy"
     st_spectype = planet_data.get("st_spectype", "")
     st_age = planet_data.get("st_age")
-    if isinstance(st_spectype, str) and (st_spectype.startswith("G") or st_spectype.startswith("K")) and pd.notna(st_age):
+    if isinstance(st_spectype, str) and st_spectype[:1] in _GK_SPECTYPES and not _isna(st_age):
         try:
             st_age_float = float(st_age.strip()) if isinstance(st_age, str) else float(st_age)
             if 1.0 < st_age_float < 8.0:
                 factors_present_scores["Stable Energy"] = 0.7
-                logger.debug("Stable Energy conditions met: score 0.7")
+                if debug_enabled: logger.debug("Stable Energy conditions met: score 0.7")
         except (ValueError, TypeError, AttributeError) as e: # pragma: no cover
             logger.warning(f"st_age could not be converted to float for Stable Energy: {st_age}. Error: {e}") # pragma: no cover
 
     # Avaliação automática de "Stable Orbit"
     pl_orbeccen = planet_data.get("pl_orbeccen")
-    if pd.notna(pl_orbeccen):
+    if not _isna(pl_orbeccen):
         try:
             pl_orbeccen_float = float(pl_orbeccen.strip()) if isinstance(pl_orbeccen, str) else float(pl_orbeccen)
             if pl_orbeccen_float < 0.2:
                 factors_present_scores["Stable Orbit"] = 0.9
-                logger.debug("Stable Orbit detected: score 0.9")
+                if debug_enabled: logger.debug("Stable Orbit detected: score 0.9")
         except (ValueError, TypeError, AttributeError) as e: # pragma: no cover
             logger.warning(f"pl_orbeccen could not be converted to float for Stable Orbit: {pl_orbeccen}. Error: {e}") # pragma: no cover
 
-    logger.debug(f"PHI factors_present_scores: {factors_present_scores}")
+    if debug_enabled: logger.debug(f"PHI factors_present_scores: {factors_present_scores}")
 
-    phi_components = []
+    phi_total = 0.0
     num_params = 0
     max_weight = 0.25
 
     for factor_name, weight_val in phi_weights.items():
         factor_score = factors_present_scores.get(factor_name, 0.0)
-        logger.debug(f"Processing PHI factor: {factor_name}, score: {factor_score}, weight: {weight_val}")
+        if debug_enabled: logger.debug(f"Processing PHI factor: {factor_name}, score: {factor_score}, weight: {weight_val}")
         # Quando weight_val = 0.0, usar o score real; quando weight_val = 0.25, interpolar para 1.0
         scaled_component = factor_score if weight_val == 0.0 else (
             factor_score + (1.0 - factor_score) * (weight_val / max_weight)
         )
-        phi_components.append(scaled_component)
+        phi_total += scaled_component
         num_params += 1
-        logger.debug(f"PHI scaled component for {factor_name}: {scaled_component}, Original score: {factor_score}")
+        if debug_enabled: logger.debug(f"PHI scaled component for {factor_name}: {scaled_component}, Original score: {factor_score}")
 
-    if not phi_components or num_params == 0:
+    if num_params == 0:
         logger.warning("No valid PHI components found.")
         return 0.0, get_color_for_percentage(0.0)
 
-    final_phi = (sum(phi_components) / num_params) * 100 if num_params > 0 else 0.0
-    final_phi = max(0.0, min(final_phi, 100.0))
+    final_phi = (phi_total / num_params) * 100
+    final_phi = final_phi if 0.0 <= final_phi <= 100.0 else (100.0 if final_phi > 100.0 else 0.0)
 
-    logger.info(f"Final PHI for {planet_data.get('pl_name', 'Unknown')}: {final_phi}")
+    if debug_enabled: logger.debug(f"Final PHI for {planet_data.get('pl_name', 'Unknown')}: {final_phi}")
 
     return round(final_phi, 2), get_color_for_percentage(final_phi)
 
+def calculate_phi_factors_batch(catalog_df):
+    """Computes the automatic PHI factor scores used by calculate_phi_score for a catalog.
+    
+    Args:
+        catalog_df (pd.DataFrame): One row per planet with 'classification',
+                                   'st_spectype', 'st_age' and 'pl_orbeccen'.
+    
+    Returns:
+        pd.DataFrame: Columns "Solid Surface", "Stable Energy", "Life Compounds"
+                      and "Stable Orbit" (0.8 / 0.7 / 0.0 / 0.9 when present,
+                      else 0.0), aligned to the catalog index.
+    """
+    empty = pd.Series(pd.NA, index=catalog_df.index, dtype="string")
+    classification = catalog_df["classification"].astype("string") if "classification" in catalog_df.columns else empty
+    spectype = catalog_df["st_spectype"].astype("string") if "st_spectype" in catalog_df.columns else empty
+    solid_surface = classification.str.contains("Terran|Superterran").fillna(False).to_numpy(dtype=bool)
+    is_gk = spectype.str[:1].isin(list(_GK_SPECTYPES)).to_numpy(dtype=bool)
+    st_age = _catalog_column(catalog_df, "st_age")
+    pl_orbeccen = _catalog_column(catalog_df, "pl_orbeccen")
+    return pd.DataFrame({
+        # Keys follow _PHI_FACTORS order
+        "Solid Surface": np.where(solid_surface, 0.8, 0.0),
+        "Stable Energy": np.where(is_gk & (st_age > 1.0) & (st_age < 8.0), 0.7, 0.0),
+        "Life Compounds": 0.0,
+        "Stable Orbit": np.where(pl_orbeccen < 0.2, 0.9, 0.0),
+    }, index=catalog_df.index)
+
+def calculate_esi_phi_batch(catalog_df, weights, phi_weights):
+    """Vectorized calculate_esi_score and calculate_phi_score over a catalog.
+    
+    Args:
+        catalog_df (pd.DataFrame): One row per planet; PHI also reads 'classification'.
+        weights (dict): ESI weights, as for calculate_esi_score.
+        phi_weights (dict): PHI weights, as for calculate_phi_score.
+    
+    Returns:
+        dict: {"ESI": (scores, colors), "PHI": (scores, colors)} where scores is a
+              list of floats rounded to 2 decimals and colors a list of hex codes.
+    """
+    n_rows = len(catalog_df)
+
+    planet_vals = np.column_stack([_catalog_column(catalog_df, column) for column in ("pl_rade", "pl_dens", "pl_eqt")])
+    earth_vals = np.array([1.0, 5.51, 255.0])
+    weight_vals = np.array([float(weights.get(key, 1.0)) for key in ("Size", "Density", "Habitable Zone")])
+    has_value = ~np.isnan(planet_vals)
+    components = np.where(has_value, _esi_scaled_components(planet_vals, earth_vals, weight_vals), 0.0)
+    num_params = has_value.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        final_esi = np.where(num_params > 0, components.sum(axis=1) / num_params * 100, 0.0)
+
+    if phi_weights:
+        # (N, k) factor scores in phi_weights order; unknown factors score 0
+        factor_scores = calculate_phi_factors_batch(catalog_df).reindex(columns=list(phi_weights), fill_value=0.0).to_numpy()
+        weight_vals = np.fromiter(phi_weights.values(), dtype=np.float64, count=len(phi_weights))
+        max_weight = 0.25
+        phi_components = np.where(weight_vals == 0.0, factor_scores, factor_scores + (1.0 - factor_scores) * (weight_vals / max_weight))
+        final_phi = phi_components.mean(axis=1) * 100
+        np.clip(final_phi, 0.0, 100.0, out=final_phi)
+    else:
+        final_phi = np.zeros(n_rows)
+
+    return {
+        "ESI": ([round(value, 2) for value in final_esi.tolist()], get_colors_for_percentages(final_esi).tolist()),
+        "PHI": ([round(value, 2) for value in final_phi.tolist()], get_colors_for_percentages(final_phi).tolist()),
+    }
+
 # --- Habiitability Score Calculation Function - Lifersearch Project ---
+# Lookup tables for the stellar components of the detailed scores.
+# Spectral type is scored by its leading letter; anything else scores 30.
+_SPECTYPE_SCORES = {"G": 95, "K": 85, "F": 70, "M": 60}
+# Age (Gyr) and metallicity (dex) bins for bisect_right. The optimal ranges are
+# closed on both ends, so their upper edges are nudged up by one ulp.
+_AGE_EDGES = (0.5, 1.0, math.nextafter(8.0, math.inf), math.nextafter(10.0, math.inf))
+_AGE_SCORES = (30, 60, 90, 60, 30)
+_MET_EDGES = (-1.0, -0.5, math.nextafter(0.5, math.inf), math.nextafter(1.0, math.inf))
+_MET_SCORES = (30, 60, 90, 60, 30)
+# Eccentricity bins are closed on the right (e <= edge), hence bisect_left.
+_ECC_EDGES = (0.1, 0.3, 0.5)
+_ECC_SCORES = (95, 70, 40, 10)
+
+def _float_or_none(val):
+    """Converts a value to float, returning None for None, NaN or unparseable input."""
+    if val is None: return None
+    try: result = float(val)
+    except (ValueError, TypeError):
+        if logger.isEnabledFor(logging.DEBUG): logger.debug(f"Detailed scores: Could not convert {val} to float.")
+        return None
+    return None if result != result else result # NaN
+
 def calculate_detailed_habitability_scores(planet_data_dict, hz_data_tuple, weights_config):
     """Calculates a dictionary of detailed habitability scores for a planet.
     
@@ -463,72 +878,77 @@ def calculate_detailed_habitability_scores(planet_data_dict, hz_data_tuple, weig
         dict: A dictionary where keys are score names (e.g., "Size") and
               values are tuples of (score_value, color_code).
     """
-    logger.debug(f"Calculating detailed scores for: {planet_data_dict.get('pl_name', 'Unknown')}")
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    if debug_enabled: logger.debug(f"Calculating detailed scores for: {planet_data_dict.get('pl_name', 'Unknown')}")
     scores = {}
-    def to_float_or_none(val):
-        if pd.isna(val) or val is None: return None
-        try: return float(val)
-        except (ValueError, TypeError): # pragma: no cover
-            logger.debug(f"Detailed scores: Could not convert {val} to float.") # pragma: no cover
-            return None # pragma: no cover
-
-    radius = to_float_or_none(planet_data_dict.get("pl_rade"))
-    mass = to_float_or_none(planet_data_dict.get("pl_masse"))
-    density = to_float_or_none(planet_data_dict.get("pl_dens"))
-    temp_eq = to_float_or_none(planet_data_dict.get("pl_eqt"))
-    classification = planet_data_dict.get("classification", "Unknown")
-    orbit_dist_au = to_float_or_none(planet_data_dict.get("pl_orbsmax"))
-    st_lum_log = to_float_or_none(planet_data_dict.get("st_lum"))
-    st_spectype = planet_data_dict.get("st_spectype", "")
-    st_age_gyr = to_float_or_none(planet_data_dict.get("st_age"))
-    st_met_dex = to_float_or_none(planet_data_dict.get("st_met"))
-    pl_orbeccen_val = to_float_or_none(planet_data_dict.get("pl_orbeccen"))
-    logger.debug(f"Detailed scores inputs: r={radius}, m={mass}, d={density}, T={temp_eq}, class={classification}, orb_dist={orbit_dist_au}, lum={st_lum_log}, spec={st_spectype}, age={st_age_gyr}, met={st_met_dex}, ecc={pl_orbeccen_val}")
+    get = planet_data_dict.get
+    radius = _float_or_none(get("pl_rade"))
+    mass = _float_or_none(get("pl_masse"))
+    density = _float_or_none(get("pl_dens"))
+    temp_eq = _float_or_none(get("pl_eqt"))
+    classification = get("classification", "Unknown")
+    orbit_dist_au = _float_or_none(get("pl_orbsmax"))
+    st_lum_log = _float_or_none(get("st_lum"))
+    st_spectype = get("st_spectype", "")
+    st_age_gyr = _float_or_none(get("st_age"))
+    st_met_dex = _float_or_none(get("st_met"))
+    pl_orbeccen_val = _float_or_none(get("pl_orbeccen"))
+    # Classification substrings tested by several scores below
+    classification_text = classification if isinstance(classification, str) else ""
+    is_terran = "Terran" in classification_text
+    is_superterran = "Superterran" in classification_text
+    is_subterran = "Mini-Terran" in classification_text or "Subterran" in classification_text
+    is_neptunian = "Neptunian" in classification_text
+    if debug_enabled: logger.debug(f"Detailed scores inputs: r={radius}, m={mass}, d={density}, T={temp_eq}, class={classification}, orb_dist={orbit_dist_au}, lum={st_lum_log}, spec={st_spectype}, age={st_age_gyr}, met={st_met_dex}, ecc={pl_orbeccen_val}")
 
     score_val = 0
     if radius is not None:
-        if "Terran" in classification and 0.8 <= radius <= 1.5: score_val = 100
-        elif (("Mini-Terran" in classification or "Subterran" in classification) and 0.5 <= radius < 0.8) or \
-             ("Terran" in classification and 1.5 < radius <= 2.0) or \
-             ("Superterran" in classification and radius <= 2.5): score_val = 90
-        elif ("Superterran" in classification and 2.5 < radius <= 4.5) or \
-             ("Neptunian" in classification and radius <= 5.0): score_val = 70
+        if is_terran and 0.8 <= radius <= 1.5: score_val = 100
+        elif (is_subterran and 0.5 <= radius < 0.8) or \
+             (is_terran and 1.5 < radius <= 2.0) or \
+             (is_superterran and radius <= 2.5): score_val = 90
+        elif (is_superterran and 2.5 < radius <= 4.5) or \
+             (is_neptunian and radius <= 5.0): score_val = 70
         else: score_val = 30
-    scores["Size"] = (score_val, get_color_for_percentage(score_val)); logger.debug(f"Size score: {scores['Size']}")
+    scores["Size"] = (score_val, get_color_for_percentage(score_val))
+    if debug_enabled: logger.debug(f"Size score: {scores['Size']}")
 
     score_val = 0
     if density is not None:
-        if "Terran" in classification and 4.5 <= density <= 6.5: score_val = 100
+        if is_terran and 4.5 <= density <= 6.5: score_val = 100
         elif (
-            (("Terran" in classification or "Superterran" in classification) and (3.0 <= density < 4.5)) or
-            (("Terran" in classification or "Superterran" in classification) and (6.5 < density <= 8.0))
+            ((is_terran or is_superterran) and (3.0 <= density < 4.5)) or
+            ((is_terran or is_superterran) and (6.5 < density <= 8.0))
         ): score_val = 90
-        elif (("Mini-Terran" in classification or "Subterran" in classification or "Superterran" in classification) and (density < 3.0 or density > 8.0)): score_val = 70
+        elif ((is_subterran or is_superterran) and (density < 3.0 or density > 8.0)): score_val = 70
         else: score_val = 50
-    scores["Density"] = (score_val, get_color_for_percentage(score_val)); logger.debug(f"Density score: {scores['Density']}")
+    scores["Density"] = (score_val, get_color_for_percentage(score_val))
+    if debug_enabled: logger.debug(f"Density score: {scores['Density']}")
 
     score_val = 0
     if mass is not None:
-        if "Terran" in classification and 0.8 <= mass <= 1.5: score_val = 100
-        elif (("Mini-Terran" in classification or "Subterran" in classification) and 0.1 <= mass < 0.8) or \
-             ("Terran" in classification and 1.5 < mass <= 2.0) or \
-             ("Superterran" in classification and mass <= 5.0): score_val = 90
-        elif ("Superterran" in classification and 5.0 < mass <= 10.0) or \
-             ("Neptunian" in classification and mass <= 20.0): score_val = 70
+        if is_terran and 0.8 <= mass <= 1.5: score_val = 100
+        elif (is_subterran and 0.1 <= mass < 0.8) or \
+             (is_terran and 1.5 < mass <= 2.0) or \
+             (is_superterran and mass <= 5.0): score_val = 90
+        elif (is_superterran and 5.0 < mass <= 10.0) or \
+             (is_neptunian and mass <= 20.0): score_val = 70
         else: score_val = 30
-    scores["Mass"] = (score_val, get_color_for_percentage(score_val)); logger.debug(f"Mass score: {scores['Mass']}")
+    scores["Mass"] = (score_val, get_color_for_percentage(score_val))
+    if debug_enabled: logger.debug(f"Mass score: {scores['Mass']}")
 
-    atm_score, water_score = 0, 0
+    # Atmosphere and liquid water potential share the same temperature bands
+    atm_water_score = 0
     if temp_eq is not None:
-        if 273.15 < temp_eq <= 373.15: atm_score, water_score = 90, 90
-        elif (200 <= temp_eq <= 273.15) or (373.15 < temp_eq <= 450): atm_score, water_score = 50, 50
-        else: atm_score, water_score = 20, 20
-    scores["Atmosphere Potential"] = (atm_score, get_color_for_percentage(atm_score)); logger.debug(f"Atmosphere score: {scores['Atmosphere Potential']}")
-    scores["Liquid Water Potential"] = (water_score, get_color_for_percentage(water_score)); logger.debug(f"Water score: {scores['Liquid Water Potential']}")
+        if 273.15 < temp_eq <= 373.15: atm_water_score = 90
+        elif (200 <= temp_eq <= 273.15) or (373.15 < temp_eq <= 450): atm_water_score = 50
+        else: atm_water_score = 20
+    scores["Atmosphere Potential"] = scores["Liquid Water Potential"] = (atm_water_score, get_color_for_percentage(atm_water_score))
+    if debug_enabled: logger.debug(f"Atmosphere / Water score: {scores['Atmosphere Potential']}")
 
     hz_score = 0
     if hz_data_tuple and len(hz_data_tuple) == 5 and orbit_dist_au is not None:
-        ohz_in, chz_in, chz_out, ohz_out, _ = map(to_float_or_none, hz_data_tuple)
+        ohz_in, chz_in, chz_out, ohz_out, _ = map(_float_or_none, hz_data_tuple)
         if all(v is not None for v in [ohz_in, chz_in, chz_out, ohz_out]):
             if chz_in <= orbit_dist_au <= chz_out: hz_score = 95
             elif ohz_in <= orbit_dist_au < chz_in or chz_out < orbit_dist_au <= ohz_out: hz_score = 65 # pragma: no cover
@@ -541,41 +961,151 @@ def calculate_detailed_habitability_scores(planet_data_dict, hz_data_tuple, weig
         if hz_in_calc <= orbit_dist_au <= hz_out_calc: hz_score = 80
         else: hz_score = 25
     else: hz_score = 10
-    scores["Habitable Zone Position"] = (hz_score, get_color_for_percentage(hz_score)); logger.debug(f"HZ Position score: {scores['Habitable Zone Position']}")
+    scores["Habitable Zone Position"] = (hz_score, get_color_for_percentage(hz_score))
+    if debug_enabled: logger.debug(f"HZ Position score: {scores['Habitable Zone Position']}")
 
     star_score = 0
     if isinstance(st_spectype, str) and st_spectype:
-        if st_spectype.startswith("G"): star_score = 95
-        elif st_spectype.startswith("K"): star_score = 85
-        elif st_spectype.startswith("F"): star_score = 70
-        elif st_spectype.startswith("M"): star_score = 60
-        else: star_score = 30
-    scores["Host Star Type"] = (star_score, get_color_for_percentage(star_score)); logger.debug(f"Star Type score: {scores['Host Star Type']}")
+        star_score = _SPECTYPE_SCORES.get(st_spectype[0], 30)
+    scores["Host Star Type"] = (star_score, get_color_for_percentage(star_score))
+    if debug_enabled: logger.debug(f"Star Type score: {scores['Host Star Type']}")
 
     age_score = 0
     if st_age_gyr is not None:
-        if 1.0 <= st_age_gyr <= 8.0: age_score = 90
-        elif 0.5 <= st_age_gyr < 1.0 or 8.0 < st_age_gyr <= 10.0: age_score = 60
-        else: age_score = 30
-    scores["System Age"] = (age_score, get_color_for_percentage(age_score)); logger.debug(f"System Age score: {scores['System Age']}")
+        age_score = _AGE_SCORES[bisect.bisect_right(_AGE_EDGES, st_age_gyr)]
+    scores["System Age"] = (age_score, get_color_for_percentage(age_score))
+    if debug_enabled: logger.debug(f"System Age score: {scores['System Age']}")
     
     met_score = 0
     if st_met_dex is not None:
-        if -0.5 <= st_met_dex <= 0.5 : met_score = 90
-        elif -1.0 <= st_met_dex < -0.5 or 0.5 < st_met_dex <= 1.0: met_score = 60
-        else: met_score = 30
-    scores["Star Metallicity"] = (met_score, get_color_for_percentage(met_score)); logger.debug(f"Metallicity score: {scores['Star Metallicity']}")
+        met_score = _MET_SCORES[bisect.bisect_right(_MET_EDGES, st_met_dex)]
+    scores["Star Metallicity"] = (met_score, get_color_for_percentage(met_score))
+    if debug_enabled: logger.debug(f"Metallicity score: {scores['Star Metallicity']}")
 
     ecc_score = 0
     if pl_orbeccen_val is not None:
-        if pl_orbeccen_val <= 0.1: ecc_score = 95
-        elif pl_orbeccen_val <= 0.3: ecc_score = 70
-        elif pl_orbeccen_val <= 0.5: ecc_score = 40
-        else: ecc_score = 10
-    scores["Orbital Eccentricity"] = (ecc_score, get_color_for_percentage(ecc_score, high_is_good=False)); logger.debug(f"Eccentricity score: {scores['Orbital Eccentricity']}")
-    logger.debug(f"All detailed scores calculated: {scores}")
+        ecc_score = _ECC_SCORES[bisect.bisect_left(_ECC_EDGES, pl_orbeccen_val)]
+    scores["Orbital Eccentricity"] = (ecc_score, get_color_for_percentage(ecc_score, high_is_good=False))
+    if debug_enabled: logger.debug(f"Eccentricity score: {scores['Orbital Eccentricity']}")
+    if debug_enabled: logger.debug(f"All detailed scores calculated: {scores}")
     return scores
 
+def _catalog_column(catalog_df, column):
+    """Returns a catalog column as a float64 array, or all-NaN when it is absent."""
+    if column not in catalog_df.columns:
+        return np.full(len(catalog_df), np.nan)
+    values = catalog_df[column]
+    if not pd.api.types.is_numeric_dtype(values):
+        values = pd.to_numeric(values, errors="coerce")
+    return values.to_numpy(dtype=np.float64, na_value=np.nan)
+
+def calculate_detailed_habitability_scores_batch(catalog_df, hz_limits=None):
+    """Vectorized calculate_detailed_habitability_scores over a catalog DataFrame.
+    
+    Every score is computed column-wise with np.select/np.where, following the
+    same rules and thresholds as the per-planet function.
+    
+    Args:
+        catalog_df (pd.DataFrame): One row per planet with the same columns the
+                                   per-planet function reads, including 'classification'.
+        hz_limits (sequence or None): Four arrays (ohz_in, chz_in, chz_out, ohz_out),
+                                      the batch equivalent of hz_data_tuple. When None
+                                      the HZ position falls back to 'st_lum'.
+    
+    Returns:
+        dict: Score name -> (np.ndarray of scores, list of color codes), in the
+              same key order as calculate_detailed_habitability_scores.
+    """
+    radius = _catalog_column(catalog_df, "pl_rade")
+    mass = _catalog_column(catalog_df, "pl_masse")
+    density = _catalog_column(catalog_df, "pl_dens")
+    temp_eq = _catalog_column(catalog_df, "pl_eqt")
+    orbit_dist_au = _catalog_column(catalog_df, "pl_orbsmax")
+    st_lum_log = _catalog_column(catalog_df, "st_lum")
+    st_age_gyr = _catalog_column(catalog_df, "st_age")
+    st_met_dex = _catalog_column(catalog_df, "st_met")
+    pl_orbeccen_val = _catalog_column(catalog_df, "pl_orbeccen")
+
+    if "classification" in catalog_df.columns:
+        classification = catalog_df["classification"].fillna("Unknown").astype(str)
+    else:
+        classification = pd.Series("Unknown", index=catalog_df.index)
+    is_terran = classification.str.contains("Terran", regex=False).to_numpy()
+    is_small = (classification.str.contains("Mini-Terran", regex=False) | classification.str.contains("Subterran", regex=False)).to_numpy()
+    is_super = classification.str.contains("Superterran", regex=False).to_numpy()
+    is_neptunian = classification.str.contains("Neptunian", regex=False).to_numpy()
+
+    scores = {}
+    with np.errstate(invalid="ignore"):
+        size = np.select(
+            [np.isnan(radius),
+             is_terran & (0.8 <= radius) & (radius <= 1.5),
+             (is_small & (0.5 <= radius) & (radius < 0.8)) | (is_terran & (1.5 < radius) & (radius <= 2.0)) | (is_super & (radius <= 2.5)),
+             (is_super & (2.5 < radius) & (radius <= 4.5)) | (is_neptunian & (radius <= 5.0))],
+            [0, 100, 90, 70], default=30)
+        scores["Size"] = size
+
+        rocky = is_terran | is_super
+        dens = np.select(
+            [np.isnan(density),
+             is_terran & (4.5 <= density) & (density <= 6.5),
+             rocky & (((3.0 <= density) & (density < 4.5)) | ((6.5 < density) & (density <= 8.0))),
+             (is_small | is_super) & ((density < 3.0) | (density > 8.0))],
+            [0, 100, 90, 70], default=50)
+        scores["Density"] = dens
+
+        mass_score = np.select(
+            [np.isnan(mass),
+             is_terran & (0.8 <= mass) & (mass <= 1.5),
+             (is_small & (0.1 <= mass) & (mass < 0.8)) | (is_terran & (1.5 < mass) & (mass <= 2.0)) | (is_super & (mass <= 5.0)),
+             (is_super & (5.0 < mass) & (mass <= 10.0)) | (is_neptunian & (mass <= 20.0))],
+            [0, 100, 90, 70], default=30)
+        scores["Mass"] = mass_score
+
+        atm_water = np.select(
+            [np.isnan(temp_eq),
+             (273.15 < temp_eq) & (temp_eq <= 373.15),
+             ((200 <= temp_eq) & (temp_eq <= 273.15)) | ((373.15 < temp_eq) & (temp_eq <= 450))],
+            [0, 90, 50], default=20)
+        scores["Atmosphere Potential"] = atm_water
+        scores["Liquid Water Potential"] = atm_water.copy()
+
+        has_orbit = ~np.isnan(orbit_dist_au)
+        if hz_limits is not None:
+            ohz_in, chz_in, chz_out, ohz_out = (np.asarray(limit, dtype=np.float64) for limit in hz_limits)
+            has_hz = ~(np.isnan(ohz_in) | np.isnan(chz_in) | np.isnan(chz_out) | np.isnan(ohz_out))
+            hz = np.select(
+                [~has_orbit, ~has_hz,
+                 (chz_in <= orbit_dist_au) & (orbit_dist_au <= chz_out),
+                 ((ohz_in <= orbit_dist_au) & (orbit_dist_au < chz_in)) | ((chz_out < orbit_dist_au) & (orbit_dist_au <= ohz_out))],
+                [10, 15, 95, 65], default=20)
+        else:
+            lum_linear = 10 ** st_lum_log
+            in_hz = (np.sqrt(lum_linear / 1.1) <= orbit_dist_au) & (orbit_dist_au <= np.sqrt(lum_linear / 0.53))
+            hz = np.select([~has_orbit | np.isnan(st_lum_log), in_hz], [10, 80], default=25)
+        scores["Habitable Zone Position"] = hz
+
+        if "st_spectype" in catalog_df.columns:
+            spectype = catalog_df["st_spectype"]
+            is_named = spectype.map(lambda value: isinstance(value, str) and value != "").to_numpy(dtype=bool)
+            letter_score = spectype.where(is_named, "").astype(str).str[:1].map(_SPECTYPE_SCORES).fillna(30).to_numpy(dtype=np.int64)
+            scores["Host Star Type"] = np.where(is_named, letter_score, 0)
+        else:
+            scores["Host Star Type"] = np.zeros(len(catalog_df), dtype=np.int64)
+
+        age_idx = np.searchsorted(np.asarray(_AGE_EDGES), st_age_gyr, side="right")
+        scores["System Age"] = np.where(np.isnan(st_age_gyr), 0, np.asarray(_AGE_SCORES)[age_idx])
+        met_idx = np.searchsorted(np.asarray(_MET_EDGES), st_met_dex, side="right")
+        scores["Star Metallicity"] = np.where(np.isnan(st_met_dex), 0, np.asarray(_MET_SCORES)[met_idx])
+
+        ecc_idx = np.searchsorted(np.asarray(_ECC_EDGES), pl_orbeccen_val, side="left")
+        scores["Orbital Eccentricity"] = np.where(np.isnan(pl_orbeccen_val), 0, np.asarray(_ECC_SCORES)[ecc_idx])
+
+    return {
+        name: (values, get_colors_for_percentages(values, high_is_good=(name != "Orbital Eccentricity")).tolist())
+        for name, values in scores.items()
+    }
+
 # --- Main Data Processing Function ---
 def process_planet_data(planet_name, combined_data, weights_config):
     """Processes raw planet data to calculate various metrics and prepare for reporting.
@@ -605,142 +1135,174 @@ def process_planet_data(planet_name, combined_data, weights_config):
               - "star_info": Formatted stellar parameters.
               - "orbit_info": Formatted orbital parameters.
     """
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
     logger.info(f"Processing data for planet: {planet_name}")
-    logger.debug(f"Initial combined_data for {planet_name}:\n{combined_data}")
+    if debug_enabled: logger.debug(f"Initial combined_data for {planet_name}:\n{combined_data}")
 
     # Conditional conversion to dict
-    if hasattr(combined_data, 'to_dict'):
+    if isinstance(combined_data, pd.Series) and isinstance(combined_data.dtype, np.dtype) and combined_data.dtype != object:
+        # Plain numeric Series: tolist() already yields native Python scalars, so skip to_dict()'s per-item boxing
+        planet_data_dict = dict(zip(combined_data.index, combined_data.tolist()))
+        if debug_enabled: logger.debug(f"Converted combined_data (Series) to dict for {planet_name}.")
+    elif hasattr(combined_data, 'to_dict'):
         planet_data_dict = combined_data.to_dict()
-        logger.debug(f"Converted combined_data (Series) to dict for {planet_name}.")
+        if debug_enabled: logger.debug(f"Converted combined_data (Series) to dict for {planet_name}.")
     elif isinstance(combined_data, dict):
-        planet_data_dict = combined_data.copy()
-        logger.debug(f"Copied combined_data (already dict) for {planet_name}.")
+        # Unbox NumPy scalars (e.g. values read off a DataFrame by the caller) so the result is JSON-friendly
+        planet_data_dict = {key: value.item() if isinstance(value, np.generic) else value for key, value in combined_data.items()}
+        if debug_enabled: logger.debug(f"Copied combined_data (already dict) for {planet_name}.")
     else:
         logger.warning(f"Unexpected type for combined_data: {type(combined_data)} for {planet_name}. Proceeding with an empty dict.")
         planet_data_dict = {}
 
-    logger.debug(f"Type of planet_data_dict for {planet_name}: {type(planet_data_dict)}")
-    logger.debug(f"Keys in planet_data_dict for {planet_name}: {list(planet_data_dict.keys()) if isinstance(planet_data_dict, dict) else 'Not a dict'}")
+    if debug_enabled: logger.debug(f"Type of planet_data_dict for {planet_name}: {type(planet_data_dict)}")
+    if debug_enabled: logger.debug(f"Keys in planet_data_dict for {planet_name}: {list(planet_data_dict.keys()) if isinstance(planet_data_dict, dict) else 'Not a dict'}")
+    result = _process_planet_dict(planet_name, planet_data_dict, weights_config)
+    logger.info(f"Finished processing data for {planet_name}. Final planet_data_dict keys: {list(result['planet_data_dict'].keys())}")
+    return result
 
-    # Log specific values being accessed
-    keys_to_log = [
-        "pl_name", "pl_rade", "pl_masse", "pl_dens", "pl_eqt", "st_teff", "st_rad", 
-        "st_lum", "sy_dist", "pl_orbper", "pl_orbsmax", "st_spectype", "st_age", "pl_orbeccen"
-    ]
-    for key in keys_to_log:
-        value = planet_data_dict.get(key)
-        logger.debug(f"Value for key 	'{key}'	 in planet_data_dict for {planet_name}: 	'{value}'	 (Type: {type(value)})")
+# Input fields dumped at DEBUG level when a planet is processed
+_KEYS_TO_LOG = (
+    "pl_name", "pl_rade", "pl_masse", "pl_dens", "pl_eqt", "st_teff", "st_rad",
+    "st_lum", "sy_dist", "pl_orbper", "pl_orbsmax", "st_spectype", "st_age", "pl_orbeccen"
+)
+
+# Fields of planet_data_dict replaced by display strings, and their decimal places
+# when not the default 2 (pl_orbeccen and st_met are kept numeric instead)
+_FIELDS_TO_FORMAT_DIRECTLY = (
+    "pl_rade", "pl_masse", "pl_dens", "pl_eqt", "pl_orbper", "pl_orbsmax",
+    "sy_dist", "st_teff", "st_rad", "st_mass", "st_lum",
+    "discoverymethod", "disc_year", "disc_facility"
+)
+_FIELD_PRECISION = {"pl_orbeccen": 3, "st_lum": 3, "st_met": 3, "st_teff": 0, "disc_year": 0}
+_NUMERICAL_FIELDS_TO_PRESERVE = ("pl_orbeccen", "st_age", "st_met")
 
-    if "pl_name" not in planet_data_dict or pd.isna(planet_data_dict.get("pl_name")):
+# (display key, source field, decimal places) for the star and orbit summaries;
+# format_value already falls back to "N/A" for text or missing values
+_STAR_INFO_SPEC = (
+    ("name", "hostname", 2), ("type", "st_spectype", 2), ("temperature_k", "st_teff", 0),
+    ("radius_solar", "st_rad", 2), ("mass_solar", "st_mass", 2),
+    ("luminosity_log_solar", "st_lum", 3), ("age_gyr", "st_age", 2), ("metallicity_dex", "st_met", 2)
+)
+_ORBIT_INFO_SPEC = (
+    ("semi_major_axis_au", "pl_orbsmax", 2), ("eccentricity", "pl_orbeccen", 3),
+    ("period_days", "pl_orbper", 2), ("inclination_deg", "pl_orbincl", 2),
+    ("distance_from_star_au", "pl_orbsmax", 2)
+)
+# Source fields of hz_data_tuple: (ohz_in, chz_in, chz_out, ohz_out, teqa)
+_HZ_KEYS = ("hz_ohzin", "hz_chzin", "hz_chzout", "hz_ohzout", "hz_teqa")
+
+def _process_planet_dict(planet_name, planet_data_dict, weights_config, precomputed=None):
+    """Body of process_planet_data once the input is a dict it may mutate.
+    
+    Args:
+        planet_name (str): The name of the planet.
+        planet_data_dict (dict): Planet data; it is enriched in place.
+        weights_config (dict): Configuration for weights used in ESI, SPH, PHI calculations.
+        precomputed (dict or None): Values already computed for the whole catalog by
+                                    process_catalog. Recognised keys: "classification",
+                                    "esi", "sph", "phi", "detailed_scores", "sy_dist_ly",
+                                    "travel_curiosities" and "sephi_scores" (the finished
+                                    sephi_scores_for_report dict).
+                                    Anything missing is computed here.
+    
+    Returns:
+        dict: Same structure as process_planet_data.
+    """
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+
+    if debug_enabled:
+        # Log specific values being accessed, as {key: (value, type name)}
+        logger.debug("Input values for %s: %s", planet_name,
+                     {key: (planet_data_dict.get(key), type(planet_data_dict.get(key)).__name__) for key in _KEYS_TO_LOG})
+
+    if "pl_name" not in planet_data_dict or _isna(planet_data_dict.get("pl_name")):
         planet_data_dict["pl_name"] = planet_name
-    logger.debug(f"Final planet_data_dict['pl_name'] for {planet_name}: {planet_data_dict.get('pl_name')}")
+    if debug_enabled: logger.debug(f"Final planet_data_dict['pl_name'] for {planet_name}: {planet_data_dict.get('pl_name')}")
 
-    classification_display = classify_planet(
-        planet_data_dict.get("pl_masse"), 
-        planet_data_dict.get("pl_rade"), 
-        planet_data_dict.get("pl_eqt")
-    )
+    precomputed = precomputed or {}
+    classification_display = precomputed.get("classification")
+    if classification_display is None:
+        classification_display = classify_planet(
+            planet_data_dict.get("pl_masse"), 
+            planet_data_dict.get("pl_rade"), 
+            planet_data_dict.get("pl_eqt")
+        )
     planet_data_dict["classification"] = classification_display
-    logger.debug(f"Classification for {planet_name}: {classification_display}")
+    if debug_enabled: logger.debug(f"Classification for {planet_name}: {classification_display}")
 
     sy_dist_pc = planet_data_dict.get("sy_dist") # Distance in parsecs
-    sy_dist_ly = None
-    if pd.notna(sy_dist_pc):
-        try: sy_dist_ly = float(sy_dist_pc) * 3.26156
-        except (ValueError, TypeError): sy_dist_ly = None
-    logger.debug(f"Distance for {planet_name}: {sy_dist_ly} ly (from {sy_dist_pc} pc)")
-    travel_curiosities_dict = calculate_travel_times(sy_dist_ly)
+    if "sy_dist_ly" in precomputed:
+        sy_dist_ly = precomputed["sy_dist_ly"]
+    else:
+        sy_dist_ly = None
+        if not _isna(sy_dist_pc):
+            try: sy_dist_ly = float(sy_dist_pc) * 3.26156
+            except (ValueError, TypeError): sy_dist_ly = None
+    if debug_enabled: logger.debug(f"Distance for {planet_name}: {sy_dist_ly} ly (from {sy_dist_pc} pc)")
+    travel_curiosities_dict = precomputed.get("travel_curiosities") or calculate_travel_times(sy_dist_ly)
     planet_data_dict["travel_curiosities"] = travel_curiosities_dict
-    logger.debug(f"Travel curiosities for {planet_name}: {travel_curiosities_dict}")
-
-    star_info_dict = {
-        "name": format_value(planet_data_dict.get("hostname"), default_na="N/A"),
-        "type": format_value(planet_data_dict.get("st_spectype"), default_na="N/A"),
-        "temperature_k": format_value(planet_data_dict.get("st_teff"), precision=0),
-        "radius_solar": format_value(planet_data_dict.get("st_rad")),
-        "mass_solar": format_value(planet_data_dict.get("st_mass")),
-        "luminosity_log_solar": format_value(planet_data_dict.get("st_lum"), precision=3),
-        "age_gyr": format_value(planet_data_dict.get("st_age")),
-        "metallicity_dex": format_value(planet_data_dict.get("st_met")),
-        "distance_ly": format_value(sy_dist_ly) 
-    }
+    if debug_enabled: logger.debug(f"Travel curiosities for {planet_name}: {travel_curiosities_dict}")
+
+    get = planet_data_dict.get
+    star_info_dict = {key: format_value(get(field), precision=precision) for key, field, precision in _STAR_INFO_SPEC}
+    star_info_dict["distance_ly"] = format_value(sy_dist_ly)
     planet_data_dict["star_info"] = star_info_dict
-    logger.debug(f"Star info for {planet_name}: {star_info_dict}")
-
-    orbit_info_dict = {
-        "semi_major_axis_au": format_value(planet_data_dict.get("pl_orbsmax")),
-        "eccentricity": format_value(planet_data_dict.get("pl_orbeccen"), precision=3),
-        "period_days": format_value(planet_data_dict.get("pl_orbper")),
-        "inclination_deg": format_value(planet_data_dict.get("pl_orbincl")),
-        "distance_from_star_au": format_value(planet_data_dict.get("pl_orbsmax"))
-    }
+    if debug_enabled: logger.debug(f"Star info for {planet_name}: {star_info_dict}")
+
+    orbit_info_dict = {key: format_value(get(field), precision=precision) for key, field, precision in _ORBIT_INFO_SPEC}
     planet_data_dict["orbit_info"] = orbit_info_dict
-    logger.debug(f"Orbit info for {planet_name}: {orbit_info_dict}")
+    if debug_enabled: logger.debug(f"Orbit info for {planet_name}: {orbit_info_dict}")
 
-    hz_data_tuple = (
-        planet_data_dict.get("hz_ohzin"), planet_data_dict.get("hz_chzin"), 
-        planet_data_dict.get("hz_chzout"), planet_data_dict.get("hz_ohzout"),
-        planet_data_dict.get("hz_teqa")
-    )
-    logger.debug(f"HZ data tuple for {planet_name}: {hz_data_tuple}")
+    hz_data_tuple = tuple(map(get, _HZ_KEYS))
+    if debug_enabled: logger.debug(f"HZ data tuple for {planet_name}: {hz_data_tuple}")
 
     star_data_for_plot = {"st_lum": planet_data_dict.get("st_lum")}
-    logger.debug(f"Star data for plot for {planet_name}: {star_data_for_plot}")
-    esi_val, esi_color = calculate_esi_score(planet_data_dict, weights_config.get("habitability", {}))
-    sph_val, sph_color = calculate_sph_score(planet_data_dict, weights_config.get("habitability", {}))
-    phi_val, phi_color = calculate_phi_score(planet_data_dict, weights_config.get("phi", {}))
+    if debug_enabled: logger.debug(f"Star data for plot for {planet_name}: {star_data_for_plot}")
+    esi_val, esi_color = precomputed.get("esi") or calculate_esi_score(planet_data_dict, weights_config.get("habitability", {}))
+    sph_val, sph_color = precomputed.get("sph") or calculate_sph_score(planet_data_dict, weights_config.get("habitability", {}))
+    phi_val, phi_color = precomputed.get("phi") or calculate_phi_score(planet_data_dict, weights_config.get("phi", {}))
     scores_for_report = {"ESI": (esi_val, esi_color), "SPH": (sph_val, sph_color), "PHI": (phi_val, phi_color)}
-    logger.debug(f"Basic scores for {planet_name}: {scores_for_report}")
+    if debug_enabled: logger.debug(f"Basic scores for {planet_name}: {scores_for_report}")
 
-    detailed_scores = calculate_detailed_habitability_scores(planet_data_dict, hz_data_tuple, weights_config)
+    detailed_scores = precomputed.get("detailed_scores")
+    if detailed_scores is None:
+        detailed_scores = calculate_detailed_habitability_scores(planet_data_dict, hz_data_tuple, weights_config)
     scores_for_report.update(detailed_scores)
-    logger.debug(f"All scores (basic + detailed) for {planet_name}: {scores_for_report}")
-
-    sephi_main, l1, l2, l3, l4 = calculate_sephi(
-        planet_data_dict.get("pl_masse"), planet_data_dict.get("pl_rade"), 
-        planet_data_dict.get("pl_orbper"), planet_data_dict.get("st_mass"), 
-        planet_data_dict.get("st_rad"), planet_data_dict.get("st_teff"), 
-        planet_data_dict.get("st_age"), planet_data_dict.get("pl_dens"),
-        planet_data_dict.get("pl_name", planet_name)
-    )
-    sephi_scores_for_report = {}
-    if sephi_main is not None:
-        sephi_scores_for_report["SEPHI"] = (round(sephi_main,2), get_color_for_percentage(sephi_main))
-        sephi_scores_for_report["L1 (Surface)"] = (round(l1,1), get_color_for_percentage(l1))
-        sephi_scores_for_report["L2 (Escape Velocity)"] = (round(l2,1), get_color_for_percentage(l2))
-        sephi_scores_for_report["L3 (Habitable Zone)"] = (round(l3,1), get_color_for_percentage(l3))
-        sephi_scores_for_report["L4 (Magnetic Field)"] = (round(l4,1), get_color_for_percentage(l4))
-    else:
-        sephi_scores_for_report["SEPHI"] = ("N/A", get_color_for_percentage(None))
-        for i in range(1,5): sephi_scores_for_report[f"L{i}"] = ("N/A", get_color_for_percentage(None))
-    logger.debug(f"SEPHI scores for {planet_name}: {sephi_scores_for_report}")
+    if debug_enabled: logger.debug(f"All scores (basic + detailed) for {planet_name}: {scores_for_report}")
+
+    sephi_scores_for_report = precomputed.get("sephi_scores")
+    if sephi_scores_for_report is None:
+        sephi_main, l1, l2, l3, l4 = calculate_sephi(
+            planet_data_dict.get("pl_masse"), planet_data_dict.get("pl_rade"), 
+            planet_data_dict.get("pl_orbper"), planet_data_dict.get("st_mass"), 
+            planet_data_dict.get("st_rad"), planet_data_dict.get("st_teff"), 
+            planet_data_dict.get("st_age"), planet_data_dict.get("pl_dens"),
+            planet_data_dict.get("pl_name", planet_name)
+        )
+        sephi_scores_for_report = {}
+        if sephi_main is not None:
+            sephi_scores_for_report["SEPHI"] = (round(sephi_main,2), get_color_for_percentage(sephi_main))
+            for label, value in zip(_SEPHI_LABELS, (l1, l2, l3, l4)):
+                sephi_scores_for_report[label] = (round(value,1), get_color_for_percentage(value))
+        else:
+            sephi_scores_for_report.update(_SEPHI_NA_DICT)
+    if debug_enabled: logger.debug(f"SEPHI scores for {planet_name}: {sephi_scores_for_report}")
     
     # Add formatted direct values to planet_data_dict for easier template access if needed
     # This ensures that if a template directly accesses e.g. {{ planet_info.pl_rade }},
     # it gets a formatted value or N/A, but keeps numerical fields as floats for calculations.
-    fields_to_format_directly = [
-        "pl_rade", "pl_masse", "pl_dens", "pl_eqt", "pl_orbper", "pl_orbsmax", 
-        "sy_dist", "st_teff", "st_rad", "st_mass", "st_lum",
-        "discoverymethod", "disc_year", "disc_facility"
-    ]
     # Keep these fields as floats for calculations
-    numerical_fields_to_preserve = ["pl_orbeccen", "st_age", "st_met"]
-    for field in fields_to_format_directly:
-        precision = 3 if field in ["st_lum", "st_met"] else 2
-        if field == "st_teff" or field == "disc_year": precision = 0
-        planet_data_dict[field] = format_value(planet_data_dict.get(field), precision=precision)
-    for field in numerical_fields_to_preserve:
+    for field in _NUMERICAL_FIELDS_TO_PRESERVE:
         try:
             value = planet_data_dict.get(field)
-            planet_data_dict[field] = float(value) if pd.notna(value) else None
+            planet_data_dict[field] = None if _isna(value) else float(value)
         except (ValueError, TypeError):
             planet_data_dict[field] = None
-    for field in fields_to_format_directly:
-        precision = 3 if field in ["pl_orbeccen", "st_lum", "st_met"] else 2
-        if field == "st_teff" or field == "disc_year": precision = 0
-        planet_data_dict[field] = format_value(planet_data_dict.get(field), precision=precision)
+    get = planet_data_dict.get
+    for field in _FIELDS_TO_FORMAT_DIRECTLY:
+        planet_data_dict[field] = format_value(get(field), precision=_FIELD_PRECISION.get(field, 2))
 
-    logger.info(f"Finished processing data for {planet_name}. Final planet_data_dict keys: {list(planet_data_dict.keys())}")
     return {
         "planet_data_dict": planet_data_dict,
         "scores_for_report": scores_for_report,
@@ -753,3 +1315,99 @@ def process_planet_data(planet_name, combined_data, weights_config):
         "orbit_info": planet_data_dict.get("orbit_info") # Make it directly accessible
     }
 
+# Columns that hold numbers in the NASA Exoplanet Archive / PHL catalogs.
+_NUMERIC_CATALOG_COLUMNS = [
+    "pl_rade", "pl_masse", "pl_dens", "pl_eqt", "pl_orbper", "pl_orbsmax", "pl_orbeccen", "pl_orbincl",
+    "sy_dist", "st_teff", "st_rad", "st_mass", "st_lum", "st_age", "st_met",
+    "hz_ohzin", "hz_chzin", "hz_chzout", "hz_ohzout", "hz_teqa"
+]
+
+def process_catalog(catalog_df, weights_config):
+    """Processes every planet of a catalog DataFrame in one call.
+    
+    Column-wise work (numeric coercion, classification, ESI, SPH, PHI, SEPHI, the
+    detailed scores and travel times) is done once for the whole frame; each row
+    is then assembled like process_planet_data does.
+    
+    Args:
+        catalog_df (pd.DataFrame): One row per planet. The planet name is taken
+                                   from 'pl_name' when present, else from the index.
+        weights_config (dict): Configuration for weights used in ESI, SPH, PHI calculations.
+    
+    Returns:
+        list: One process_planet_data result dict per row, in row order.
+    """
+    if catalog_df is None or catalog_df.empty:
+        logger.warning("process_catalog called with an empty catalog.")
+        return []
+
+    start_time = time.perf_counter()
+    catalog_df = catalog_df.copy()
+    # One coercion pass for every numeric column; bad values become NaN instead of raising per row
+    numeric_columns = catalog_df.columns.intersection(_NUMERIC_CATALOG_COLUMNS)
+    catalog_df[numeric_columns] = catalog_df[numeric_columns].apply(pd.to_numeric, errors="coerce")
+
+    if "pl_name" in catalog_df.columns:
+        planet_names = [str(label) if _isna(name) else name for name, label in zip(catalog_df["pl_name"], catalog_df.index)]
+    else:
+        planet_names = [str(label) for label in catalog_df.index]
+
+    catalog_df["classification"] = classify_planet_array(
+        *(_catalog_column(catalog_df, column) for column in ("pl_masse", "pl_rade", "pl_eqt"))
+    )
+
+    sephi_rows = calculate_sephi_scores_for_report_batch(calculate_sephi_catalog(catalog_df))
+
+    hz_limits = [_catalog_column(catalog_df, column) for column in _HZ_KEYS[:4]]
+    detailed_columns = calculate_detailed_habitability_scores_batch(catalog_df, hz_limits)
+    detailed_rows = [
+        dict(zip(detailed_columns.keys(), row_scores))
+        for row_scores in zip(*(zip(scores.tolist(), colors) for scores, colors in detailed_columns.values()))
+    ]
+
+    esi_phi = calculate_esi_phi_batch(catalog_df, weights_config.get("habitability", {}), weights_config.get("phi", {}))
+    esi_rows = list(zip(*esi_phi["ESI"]))
+    phi_rows = list(zip(*esi_phi["PHI"]))
+    sph_rows = list(zip(*calculate_sph_score_batch(catalog_df)))
+
+    dist_ly = _catalog_column(catalog_df, "sy_dist") * 3.26156
+    dist_ly_rows = [None if distance != distance else distance for distance in dist_ly.tolist()]
+    travel_rows = calculate_travel_times_batch(dist_ly)
+
+    records = catalog_df.to_dict(orient="records")
+    results = [
+        _process_planet_dict(name, record, weights_config, {
+            "classification": classification, "sephi_scores": sephi_scores, "detailed_scores": detailed_scores,
+            "esi": esi, "sph": sph, "phi": phi, "sy_dist_ly": distance, "travel_curiosities": travel
+        })
+        for name, record, classification, sephi_scores, detailed_scores, esi, sph, phi, distance, travel
+        in zip(planet_names, records, catalog_df["classification"], sephi_rows, detailed_rows,
+               esi_rows, sph_rows, phi_rows, dist_ly_rows, travel_rows)
+    ]
+    logger.info(f"Processed catalog of {len(results)} planets in {time.perf_counter() - start_time:.3f}s.")
+    return results
+
+def process_catalog_parallel(catalog_df, weights_config, max_workers=None, chunk_size=512):
+    """Runs process_catalog on row chunks of a catalog across worker processes.
+    
+    Planets are independent, so the catalog is split into contiguous chunks that
+    are processed in parallel and re-joined in their original order. Small
+    catalogs (a single chunk) are processed in-process.
+    
+    Args:
+        catalog_df (pd.DataFrame): One row per planet, as for process_catalog.
+        weights_config (dict): Configuration for weights used in ESI, SPH, PHI calculations.
+        max_workers (int or None): Number of worker processes; None uses the CPU count.
+        chunk_size (int): Number of planets sent to a worker at a time.
+    
+    Returns:
+        list: One process_planet_data result dict per row, in row order.
+    """
+    if catalog_df is None or len(catalog_df) <= chunk_size:
+        return process_catalog(catalog_df, weights_config)
+
+    chunks = [catalog_df.iloc[start:start + chunk_size] for start in range(0, len(catalog_df), chunk_size)]
+    logger.info(f"Processing catalog of {len(catalog_df)} planets in {len(chunks)} chunks.")
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        chunk_results = executor.map(process_catalog, chunks, [weights_config] * len(chunks))
+        return [result for chunk_result in chunk_results for result in chunk_result]
@@ -7,25 +7,82 @@ import matplotlib.pyplot as plt
 import numpy as np
 from datetime import datetime
 import logging
-from jinja2 import Environment, FileSystemLoader, select_autoescape # Import select_autoescape
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, select_autoescape # Import select_autoescape
 import json  # For logging context and SAVING DATA
-import traceback  # For explicit error printing
 import time 
+import weakref
+import io
+import multiprocessing
+import threading
+from functools import lru_cache, partial
+from concurrent.futures import ProcessPoolExecutor
 
 logger = logging.getLogger(__name__)
 
+# Compiled templates per Jinja2 environment, so repeated reports skip the loader lookup
+_TEMPLATE_CACHE = weakref.WeakKeyDictionary()
+
+def _get_template(template_env, template_name):
+    """Returns a template from template_env, loading it only once per environment.
+    
+    When the environment has auto_reload on, a cached template whose source
+    changed on disk is loaded again.
+    
+    Args:
+        template_env (jinja2.Environment): The Jinja2 template environment.
+        template_name (str): Name of the template to load.
+    
+    Returns:
+        jinja2.Template: The compiled template.
+    """
+    templates = _TEMPLATE_CACHE.setdefault(template_env, {})
+    template = templates.get(template_name)
+    if template is None or (template_env.auto_reload and not template.is_up_to_date):
+        template = templates[template_name] = template_env.get_template(template_name)
+    return template
+
+# Directories already ensured by this process; every plot and report asks for the same few
+_ENSURED_DIRS = set()
+
 # Helper function to create output directories if they don"t exist
 def ensure_dir(directory):
     """Ensures that a directory exists, creating it if necessary.
     
-    Logs the creation of the directory if it did not already exist.
+    Logs the creation of the directory if it did not already exist. Directories
+    already ensured by this process are not checked on disk again.
     
     Args:
         directory (str): The path to the directory to check/create.
     """
-    if not os.path.exists(directory):
+    if directory in _ENSURED_DIRS:
+        return
+    try:
         os.makedirs(directory)
         logger.info(f"Created directory: {directory}")
+    except FileExistsError:
+        pass
+    _ENSURED_DIRS.add(directory)
+
+def _isna(value):
+    """pd.isna for a single value, answering the common None/float/str/int cases directly.
+    
+    pd.isna goes through its array/scalar dispatch on every call, which adds up in the
+    per-planet loops; anything other than those plain types still goes to pd.isna.
+    
+    Args:
+        value (any): The value to check.
+    
+    Returns:
+        bool: True if value is None or NaN (or another pandas missing value).
+    """
+    if value is None: return True
+    if isinstance(value, float): return value != value
+    if isinstance(value, (str, int)): return False
+    return pd.isna(value)
+
+# Lower bounds of the orange, amber, light green and green bands, and the band colors from red up
+_COLOR_THRESHOLDS = np.array([20, 40, 60, 80])
+_COLOR_SCALE = np.array(["#dc3545", "#fd7e14", "#ffc107", "#90ee90", "#28a745"])
 
 def get_color_for_percentage(percentage):
     """Determines a hex color code based on a percentage value for reports.
@@ -40,12 +97,16 @@ def get_color_for_percentage(percentage):
     Returns:
         str: Hex color code string (e.g., "#28a745" for green, "#808080" for grey/N/A).
     """
-    if percentage is None or pd.isna(percentage):
-        return "#808080"  # Grey for N/A
-    try:
-        percentage = float(percentage)
-    except (ValueError, TypeError):
-        return "#808080"  # Grey for invalid
+    if isinstance(percentage, float):  # caso mais comum, sem chamadas extras
+        if percentage != percentage:
+            return "#808080"  # Grey for NaN
+    else:
+        if percentage is None or _isna(percentage):
+            return "#808080"  # Grey for N/A
+        try:
+            percentage = float(percentage)
+        except (ValueError, TypeError):
+            return "#808080"  # Grey for invalid
 
     if percentage >= 80:
         return "#28a745"  # Green (Bootstrap success)
@@ -58,6 +119,55 @@ def get_color_for_percentage(percentage):
     else:
         return "#dc3545"  # Red (Bootstrap danger)
 
+def get_colors_for_percentages(percentages):
+    """Vectorized get_color_for_percentage for a sequence of numeric percentages.
+    
+    Args:
+        percentages (array-like): Percentage values; NaN marks N/A.
+    
+    Returns:
+        np.ndarray: Hex color code strings, grey ("#808080") where the value is NaN.
+    """
+    values = np.asarray(percentages, dtype=np.float64)
+    colors = _COLOR_SCALE[np.searchsorted(_COLOR_THRESHOLDS, values, side="right")]
+    colors[np.isnan(values)] = "#808080"
+    return colors
+
+def _as_float(value):
+    """Returns float(str(value)), skipping the string round trip for Python/NumPy doubles.
+    
+    str() of a double is its shortest repr, which parses back to the same double, so the
+    result is unchanged; other types (strings, float32, bools) still go through str().
+    """
+    if isinstance(value, float): return float(value)
+    return float(str(value))
+
+_LY_PER_PC = 3.26156
+# Thousands of years per light year at ~170 km/s (current probe speeds)
+_CURRENT_TECH_KYR_PER_LY = (299792.458 / 170) / 1000
+
+def _travel_time_strings(sy_dist_pc):
+    """Formats the distance and travel times to a planet for the report templates.
+    
+    Shared by the individual and the aggregated reports.
+    
+    Args:
+        sy_dist_pc (any): Distance to the system in parsecs (number or numeric string).
+    
+    Returns:
+        tuple: (distance in ly, current tech ~170 km/s, 20% of c, 99% of c) as strings.
+    
+    Raises:
+        ValueError, TypeError: If sy_dist_pc is not numeric.
+    """
+    dist_ly_f = _as_float(sy_dist_pc) * _LY_PER_PC
+    return (
+        f"{dist_ly_f:.2f}",
+        f"{dist_ly_f * _CURRENT_TECH_KYR_PER_LY:.1f} thousand years",
+        f"{dist_ly_f / 0.2:.1f} years",
+        f"{dist_ly_f / 0.99:.1f} years",
+    )
+
 # Corrected formatting for potentially string numeric values
 def format_float_field(value, precision=".2f"):
     """Formats a value as a float string with specified precision, or returns "N/A".
@@ -74,10 +184,14 @@ def format_float_field(value, precision=".2f"):
         str: The formatted float string, "N/A", or the original string value if
              conversion to float fails.
     """
-    if pd.isna(value) or value == "N/A" or str(value).strip() == "":
+    if isinstance(value, float):  # valor numérico mais comum: evita pd.isna e str()
+        return "N/A" if value != value else format(value, precision)
+    if type(value) is int:  # inteiros (não bool) formatam como o float equivalente
+        return format(value, precision)
+    if _isna(value) or value == "N/A" or str(value).strip() == "":
         return "N/A"
     try:
-        return f"{float(str(value)):{precision}}"
+        return format(_as_float(value), precision)
     except (ValueError, TypeError):
         return str(value)  # Return as string if conversion fails
 
@@ -141,17 +255,192 @@ def get_score_description_moons(scores_dict, field_name, classification, planet_
     }
 
 def to_float_or_none(val):
-    if pd.isna(val) or val is None: return None
+    if _isna(val) or val is None: return None
     try: return float(val)
     except (ValueError, TypeError): return None
 
+# One matplotlib figure per plot kind, cleared and redrawn for every planet instead of
+# being created and torn down each time; the lock serializes drawing across threads
+_PLOT_FIGURES = {}
+_PLOT_FIGURES_LOCK = threading.Lock()
+
+def _reusable_axes(plot_kind, figsize):
+    """Returns the (figure, axes) kept for plot_kind, cleared and resized to figsize.
+    
+    Must be called with _PLOT_FIGURES_LOCK held.
+    
+    Args:
+        plot_kind (str): Key of the figure, e.g. "scores".
+        figsize (tuple): Figure size in inches.
+    
+    Returns:
+        tuple: (matplotlib.figure.Figure, matplotlib.axes.Axes) ready to draw on.
+    """
+    figure_axes = _PLOT_FIGURES.get(plot_kind)
+    if figure_axes is None:
+        figure_axes = _PLOT_FIGURES[plot_kind] = plt.subplots(figsize=figsize)
+    else:
+        fig, ax = figure_axes
+        ax.clear()
+        fig.set_size_inches(*figsize)
+    return figure_axes
+
+# Plots use a handful of flat colors plus anti-aliasing, so a 64-color palette PNG keeps them
+# visually identical at well under half the size (and encodes faster than full RGB)
+_PNG_PALETTE_COLORS = 64
+
+def _save_palette_png(image, full_plot_path):
+    """Saves a Pillow image as a palette PNG with _PNG_PALETTE_COLORS colors.
+    
+    Args:
+        image (PIL.Image.Image): The RGB or RGBA image to save.
+        full_plot_path (str): Destination PNG path.
+    """
+    from PIL import Image
+
+    if image.mode != "RGB": image = image.convert("RGB")
+    image.quantize(colors=_PNG_PALETTE_COLORS, method=Image.Quantize.FASTOCTREE).save(full_plot_path, format="PNG")
+
+def _save_figure_png(fig, full_plot_path):
+    """Renders a matplotlib figure and saves it with _save_palette_png.
+    
+    The figure is written as raw RGBA pixels so matplotlib does not encode a PNG
+    that would only be decoded again.
+    
+    Args:
+        fig (matplotlib.figure.Figure): The figure to save.
+        full_plot_path (str): Destination PNG path.
+    """
+    from PIL import Image
+
+    pixels = io.BytesIO()
+    fig.savefig(pixels, format="rgba")
+    width, height = fig.canvas.get_width_height(physical=True)
+    _save_palette_png(Image.frombuffer("RGBA", (width, height), pixels.getbuffer(), "raw", "RGBA", 0, 1), full_plot_path)
+
+# Figure layout of the Pillow habitable zone plot, matching the 10x2 in matplotlib figure at 100 dpi
+_HZ_IMAGE_SIZE = (1000, 200)
+_HZ_AXES_BOX = (20, 32, 980, 150)  # left, top, right, bottom of the plotting area in pixels
+_HZ_OPTIMISTIC_FILL = (152, 251, 152, 77)  # palegreen, alpha 0.3
+_HZ_CONSERVATIVE_FILL = (0, 128, 0, 128)  # green, alpha 0.5
+_HZ_PLANET_FILL = (0, 0, 255)
+
+@lru_cache(maxsize=512)
+def _hz_text_mask(text, font_size, anchor):
+    """Rasterizes a label once and returns it as an "L" mask for pasting.
+    
+    Tick values, the axis label and the legend entries repeat on every planet's plot,
+    so caching their glyph masks spares re-rasterizing them for each PNG of a batch.
+    
+    Args:
+        text (str): Label text.
+        font_size (int): Size of Pillow's default font.
+        anchor (str): Pillow text anchor, e.g. "mt".
+    
+    Returns:
+        tuple: (PIL.Image.Image mask, (x offset, y offset) of the mask from the anchor point).
+    """
+    from PIL import Image, ImageDraw, ImageFont
+
+    font = ImageFont.load_default(size=font_size)
+    left, top, right, bottom = font.getbbox(text, anchor=anchor)
+    mask = Image.new("L", (max(right - left, 1), max(bottom - top, 1)), 0)
+    ImageDraw.Draw(mask).text((-left, -top), text, fill=255, font=font, anchor=anchor)
+    return mask, (left, top)
+
+def _paste_hz_text(image, xy, text, font_size, anchor):
+    """Draws a black label on image at xy using the cached mask from _hz_text_mask."""
+    mask, (offset_x, offset_y) = _hz_text_mask(text, font_size, anchor)
+    image.paste((0, 0, 0), (round(xy[0]) + offset_x, round(xy[1]) + offset_y), mask)
+
+def _hz_tick_values(min_x, max_x, max_ticks=10):
+    """Returns evenly spaced 'round' tick positions (steps of 1, 2, 2.5 or 5 x 10^n) within [min_x, max_x]."""
+    raw_step = (max_x - min_x) / max_ticks
+    magnitude = 10 ** np.floor(np.log10(raw_step))
+    step = next(m * magnitude for m in (1, 2, 2.5, 5, 10) if m * magnitude >= raw_step)
+    first = np.ceil(min_x / step) * step
+    return [round(value, 10) for value in np.arange(first, max_x + step * 1e-9, step)]
+
+def _draw_habitable_zone_png(full_plot_path, optimistic_hz, conservative_hz, planet_marker, title_text, x_range):
+    """Draws the habitable zone strip plot straight to a PNG with Pillow.
+    
+    Args:
+        full_plot_path (str): Destination PNG path.
+        optimistic_hz (tuple or None): (inner, outer) optimistic HZ limits in AU.
+        conservative_hz (tuple or None): (inner, outer) conservative HZ limits in AU.
+        planet_marker (tuple or None): (orbit in AU, legend label) of the planet.
+        title_text (str): Plot title.
+        x_range (tuple): (min_x, max_x) of the distance axis in AU.
+    """
+    from PIL import Image, ImageDraw, ImageFont
+
+    image = Image.new("RGB", _HZ_IMAGE_SIZE, "white")
+    draw = ImageDraw.Draw(image, "RGBA")
+    font = ImageFont.load_default(size=13)
+    title_font = ImageFont.load_default(size=15)
+    left, top, right, bottom = _HZ_AXES_BOX
+    min_x, max_x = sorted(x_range)  # limits from negative distances come out reversed
+    scale = (right - left) / (max_x - min_x)
+
+    def to_pixel(au):
+        return left + (au - min_x) * scale
+
+    def span(limits, fill):
+        x0, x1 = sorted((to_pixel(limits[0]), to_pixel(limits[1])))
+        x0, x1 = max(x0, left), min(x1, right)
+        if x1 > x0: draw.rectangle([x0, top, x1, bottom], fill=fill)
+
+    legend_entries = []
+    if optimistic_hz is not None:
+        span(optimistic_hz, _HZ_OPTIMISTIC_FILL)
+        legend_entries.append(("Optimistic HZ", _HZ_OPTIMISTIC_FILL, draw.rectangle))
+    if conservative_hz is not None:
+        span(conservative_hz, _HZ_CONSERVATIVE_FILL)
+        legend_entries.append(("Conservative HZ", _HZ_CONSERVATIVE_FILL, draw.rectangle))
+    if planet_marker is not None:
+        planet_x, label_text = planet_marker
+        center_x, center_y = to_pixel(planet_x), (top + bottom) / 2
+        if left <= center_x <= right:
+            draw.ellipse([center_x - 5, center_y - 5, center_x + 5, center_y + 5], fill=_HZ_PLANET_FILL)
+        legend_entries.append((label_text, _HZ_PLANET_FILL, draw.ellipse))
+
+    draw.rectangle([left, top, right, bottom], outline="black")
+    ticks = _hz_tick_values(min_x, max_x)
+    decimals = max((len(f"{tick:g}".partition(".")[2]) for tick in ticks), default=0)  # same decimals on every label
+    for tick in ticks:
+        tick_x = to_pixel(tick)
+        draw.line([tick_x, bottom, tick_x, bottom + 4], fill="black")
+        _paste_hz_text(image, (tick_x, bottom + 6), f"{tick:.{decimals}f}", 13, "mt")
+    _paste_hz_text(image, ((left + right) / 2, _HZ_IMAGE_SIZE[1] - 6), "Distance from Star (AU)", 13, "mb")
+    draw.text(((left + right) / 2, top - 6), title_text, fill="black", font=title_font, anchor="mb")
+
+    if legend_entries:
+        line_height = 18
+        legend_width = max(draw.textlength(label, font=font) for label, _, _ in legend_entries) + 36
+        legend_left, legend_top = right - 6 - legend_width, top + 6
+        draw.rectangle([legend_left, legend_top, right - 6, legend_top + 6 + line_height * len(legend_entries)],
+                       fill=(255, 255, 255, 204), outline=(204, 204, 204))
+        for row, (label, fill, draw_key) in enumerate(legend_entries):
+            row_y = legend_top + 6 + row * line_height
+            key_box = [legend_left + 8, row_y + 3, legend_left + 24, row_y + 13]
+            if draw_key == draw.ellipse: key_box = [legend_left + 11, row_y + 3, legend_left + 21, row_y + 13]
+            draw_key(key_box, fill=fill)
+            if draw_key == draw.ellipse:  # the planet label is different on every plot
+                draw.text((legend_left + 30, row_y + 8), label, fill="black", font=font, anchor="lm")
+            else:
+                _paste_hz_text(image, (legend_left + 30, row_y + 8), label, 13, "lm")
+
+    _save_palette_png(image, full_plot_path)
+
 # --- Plotting Functions ---
-def plot_habitable_zone(planet_data, star_data, hz_limits, output_path, planet_name_slug):
+def plot_habitable_zone(planet_data, star_data, hz_limits, output_path, planet_name_slug, use_matplotlib=False):
     """Generates and saves a plot of the habitable zone for a given planet.
     
     Visualizes the optimistic and conservative habitable zones relative to the
     planet's orbital semi-major axis. The plot is saved as a PNG file.
     It can calculate HZ limits based on stellar luminosity if not provided.
+    The strip is drawn directly with Pillow, which is much faster than a
+    matplotlib figure; use_matplotlib selects the original matplotlib rendering.
     
     Args:
         planet_data (dict): Dictionary containing planet parameters like 'pl_orbsmax', 'pl_name'.
@@ -160,6 +449,7 @@ def plot_habitable_zone(planet_data, star_data, hz_limits, output_path, planet_n
                                    or None if limits need to be calculated.
         output_path (str): The directory where the plot will be saved.
         planet_name_slug (str): A slugified version of the planet name, used for the filename.
+        use_matplotlib (bool): Draw the plot with matplotlib instead of Pillow.
     
     Returns:
         str or None: The filename of the saved plot (e.g., "planet_slug_hz.png") if successful,
@@ -171,12 +461,11 @@ def plot_habitable_zone(planet_data, star_data, hz_limits, output_path, planet_n
     logger.debug(f"Attempting to plot habitable zone for {planet_name_slug} to {full_plot_path}")
 
     try:
-        fig, ax = plt.subplots(figsize=(10, 2))
         ohz_in, chz_in, chz_out, ohz_out, _ = (None, None, None, None, None) if hz_limits is None else hz_limits
         
         st_lum_val = star_data.get("st_lum")  # Expecting log(L/Lsun)
         L_star_L_sun = None
-        if pd.notna(st_lum_val):
+        if not _isna(st_lum_val):
             try:
                 L_star_L_sun = 10**float(st_lum_val)
             except (ValueError, TypeError):
@@ -190,60 +479,96 @@ def plot_habitable_zone(planet_data, star_data, hz_limits, output_path, planet_n
             optimistic_inner_limit = (0.75 * np.sqrt(L_star_L_sun))
             optimistic_outer_limit = (2.0 * np.sqrt(L_star_L_sun))
 
-            chz_in_plot = chz_in if pd.notna(chz_in) else conservative_inner_limit
-            chz_out_plot = chz_out if pd.notna(chz_out) else conservative_outer_limit
-            ohz_in_plot = ohz_in if pd.notna(ohz_in) else optimistic_inner_limit
-            ohz_out_plot = ohz_out if pd.notna(ohz_out) else optimistic_outer_limit
+            chz_in_plot = chz_in if not _isna(chz_in) else conservative_inner_limit
+            chz_out_plot = chz_out if not _isna(chz_out) else conservative_outer_limit
+            ohz_in_plot = ohz_in if not _isna(ohz_in) else optimistic_inner_limit
+            ohz_out_plot = ohz_out if not _isna(ohz_out) else optimistic_outer_limit
         
-        if pd.notna(ohz_in_plot) and pd.notna(ohz_out_plot):
-            ax.axvspan(ohz_in_plot, ohz_out_plot, alpha=0.3, color="palegreen", label="Optimistic HZ")
-        if pd.notna(chz_in_plot) and pd.notna(chz_out_plot):
-            ax.axvspan(chz_in_plot, chz_out_plot, alpha=0.5, color="green", label="Conservative HZ")
+        optimistic_hz = (ohz_in_plot, ohz_out_plot) if not _isna(ohz_in_plot) and not _isna(ohz_out_plot) else None
+        conservative_hz = (chz_in_plot, chz_out_plot) if not _isna(chz_in_plot) and not _isna(chz_out_plot) else None
         
         pl_orbsmax = planet_data.get("pl_orbsmax")
         pl_orbsmax_fl = None
-        if pd.notna(pl_orbsmax):
+        if not _isna(pl_orbsmax):
             try:
                 pl_orbsmax_fl = float(pl_orbsmax)
             except (ValueError, TypeError):
                 pass
         
+        planet_name_value = planet_data.get("pl_name", planet_name_slug)
+        planet_marker = None
         if pl_orbsmax_fl is not None:
-            planet_name_value = planet_data.get("pl_name", planet_name_slug)
             orbit_details = f"({pl_orbsmax_fl:.2f} AU)"
-            label_text = f"{planet_name_value} {orbit_details}"
-            ax.plot(pl_orbsmax_fl, 0, "o", markersize=10, color="blue", label=label_text)
+            planet_marker = (pl_orbsmax_fl, f"{planet_name_value} {orbit_details}")
         else:
             logger.warning(f"Orbital semi-major axis (pl_orbsmax) not available or not float for {planet_name_slug}.")
 
-        ax.set_yticks([])
-        ax.set_xlabel("Distance from Star (AU)")
-        planet_name_value = planet_data.get("pl_name", planet_name_slug)
         title_text = f"Habitable Zone for {planet_name_value}"
-        ax.set_title(title_text)
         
-        x_values = [val for val in [ohz_in_plot, ohz_out_plot, chz_in_plot, chz_out_plot, pl_orbsmax_fl] if pd.notna(val)]
+        x_values = [val for val in [ohz_in_plot, ohz_out_plot, chz_in_plot, chz_out_plot, pl_orbsmax_fl] if not _isna(val)]
         if x_values:
             min_x = min(x_values) * 0.8
             max_x = max(x_values) * 1.2
             if min_x == max_x:
                 min_x -= 0.5
                 max_x += 0.5
-            ax.set_xlim(min_x, max_x)
         else:
-            ax.set_xlim(0, 2)
-
-        ax.legend(loc="upper right")
-        plt.tight_layout()
-        plt.savefig(full_plot_path)
-        plt.close(fig)
+            min_x, max_x = 0, 2
+
+        if use_matplotlib:
+            with _PLOT_FIGURES_LOCK:
+                fig, ax = _reusable_axes("hz", (10, 2))
+                if optimistic_hz is not None:
+                    ax.axvspan(*optimistic_hz, alpha=0.3, color="palegreen", label="Optimistic HZ")
+                if conservative_hz is not None:
+                    ax.axvspan(*conservative_hz, alpha=0.5, color="green", label="Conservative HZ")
+                if planet_marker is not None:
+                    ax.plot(planet_marker[0], 0, "o", markersize=10, color="blue", label=planet_marker[1])
+                ax.set_yticks([])
+                ax.set_xlabel("Distance from Star (AU)")
+                ax.set_title(title_text)
+                ax.set_xlim(min_x, max_x)
+                ax.legend(loc="upper right")
+                fig.tight_layout()
+                _save_figure_png(fig, full_plot_path)
+        else:
+            _draw_habitable_zone_png(full_plot_path, optimistic_hz, conservative_hz, planet_marker, title_text, (min_x, max_x))
         logger.info(f"Habitable zone plot saved to {full_plot_path}")
         return plot_filename
     except Exception as e:
-        logger.error(f"Error generating habitable zone plot for {planet_name_slug}: {e}", exc_info=True)
-        traceback.print_exc()
+        logger.exception(f"Error generating habitable zone plot for {planet_name_slug}: {e}")
         return None
 
+# Subplot parameters computed by tight_layout for the scores plot. The margins
+# only depend on the figure size, the bar labels and the value texts that can
+# reach past the right edge of the axes (scores near 100%), so planets sharing
+# those reuse the layout instead of measuring every text artist again.
+_SCORES_LAYOUT_CACHE = {}
+_SCORES_LAYOUT_CACHE_MAX = 512
+_SCORES_LAYOUT_OVERFLOW_MIN = 90
+
+def _apply_scores_layout(fig, figsize, labels, values):
+    """Lays out the scores figure, reusing cached tight_layout margins when possible.
+    
+    Must be called with _PLOT_FIGURES_LOCK held.
+    
+    Args:
+        fig (matplotlib.figure.Figure): The scores figure, fully drawn.
+        figsize (tuple): The figure size in inches.
+        labels (list): The bar labels.
+        values (list): The bar values.
+    """
+    layout_key = (figsize, tuple(labels),
+                  tuple(f"{v:.1f}" for v in values if v >= _SCORES_LAYOUT_OVERFLOW_MIN))
+    subplot_params = _SCORES_LAYOUT_CACHE.get(layout_key)
+    if subplot_params is not None:
+        fig.subplots_adjust(**subplot_params)
+        return
+    fig.tight_layout()
+    if len(_SCORES_LAYOUT_CACHE) >= _SCORES_LAYOUT_CACHE_MAX: _SCORES_LAYOUT_CACHE.clear()
+    pars = fig.subplotpars
+    _SCORES_LAYOUT_CACHE[layout_key] = dict(left=pars.left, bottom=pars.bottom, right=pars.right, top=pars.top)
+
 def plot_scores_comparison(scores_data, output_path, planet_name_slug):
     """Generates and saves a horizontal bar chart comparing various habitability scores.
     
@@ -273,7 +598,7 @@ def plot_scores_comparison(scores_data, output_path, planet_name_slug):
     try:
         valid_scores_data = {}
         for k, v_tuple in scores_data.items():
-            if isinstance(v_tuple, tuple) and len(v_tuple) > 0 and pd.notna(v_tuple[0]):
+            if isinstance(v_tuple, tuple) and len(v_tuple) > 0 and not _isna(v_tuple[0]):
                 try:
                     float_val = float(v_tuple[0])
                     valid_scores_data[k] = (float_val, v_tuple[1] if len(v_tuple) > 1 else get_color_for_percentage(float_val))
@@ -288,27 +613,87 @@ def plot_scores_comparison(scores_data, output_path, planet_name_slug):
         values = [valid_scores_data[k][0] for k in labels]
         colors = [valid_scores_data[k][1] for k in labels]
 
-        fig, ax = plt.subplots(figsize=(10, max(6, len(labels) * 0.5)))
-        bars = ax.barh(labels, values, color=colors)
-        ax.set_xlabel("Score (%)")
-        ax.set_title(f"Habitability Scores for {planet_name_slug}")
-        ax.set_xlim(0, 100)
+        figsize = (10, max(6, len(labels) * 0.5))
+        with _PLOT_FIGURES_LOCK:
+            fig, ax = _reusable_axes("scores", figsize)
+            bars = ax.barh(labels, values, color=colors)
+            ax.set_xlabel("Score (%)")
+            ax.set_title(f"Habitability Scores for {planet_name_slug}")
+            ax.set_xlim(0, 100)
 
-        for bar in bars:
-            width = bar.get_width()
-            ax.text(width + 1, bar.get_y() + bar.get_height()/2., f"{width:.1f}%")
+            for bar in bars:
+                width = bar.get_width()
+                ax.text(width + 1, bar.get_y() + bar.get_height()/2., f"{width:.1f}%")
 
-        plt.tight_layout()
-        plt.savefig(full_plot_path)
-        plt.close(fig)
+            _apply_scores_layout(fig, figsize, labels, values)
+            _save_figure_png(fig, full_plot_path)
         logger.info(f"Scores comparison plot saved to {full_plot_path}")
         return plot_filename
     except Exception as e:
-        logger.error(f"Error generating scores comparison plot for {planet_name_slug}: {e}", exc_info=True)
-        traceback.print_exc()
+        logger.exception(f"Error generating scores comparison plot for {planet_name_slug}: {e}")
         return None
 
+def _render_planet_plots(plot_task):
+    """Draws the habitable zone and scores plots for one planet.
+    
+    Args:
+        plot_task (tuple): (planet_data, star_data, hz_limits, scores_data, output_path, planet_name_slug).
+    
+    Returns:
+        tuple: (hz plot filename or None, scores plot filename or None).
+    """
+    planet_data, star_data, hz_limits, scores_data, output_path, planet_name_slug = plot_task
+    return (plot_habitable_zone(planet_data, star_data, hz_limits, output_path, planet_name_slug),
+            plot_scores_comparison(scores_data, output_path, planet_name_slug))
+
+def render_planet_plots(plot_tasks, max_workers=None, min_parallel_tasks=16):
+    """Draws the plots of several planets, in worker processes when there are many.
+    
+    Each planet's plots are independent and CPU-bound in matplotlib, so large
+    batches are spread over a process pool. Workers are spawned rather than forked,
+    which is safe for matplotlib on every platform; as spawning costs roughly a
+    second per worker, batches below min_parallel_tasks are drawn in-process.
+    If the pool itself fails (pickling error, a worker killed, ...), the batch is
+    drawn in-process instead.
+    
+    Args:
+        plot_tasks (list): One tuple per planet, as taken by _render_planet_plots.
+        max_workers (int or None): Number of worker processes; None uses the CPU count.
+        min_parallel_tasks (int): Smallest batch that is sent to the process pool.
+    
+    Returns:
+        list: One (hz plot filename, scores plot filename) tuple per task, in task order.
+    """
+    if len(plot_tasks) < min_parallel_tasks:
+        return [_render_planet_plots(plot_task) for plot_task in plot_tasks]
+
+    logger.info(f"Rendering plots for {len(plot_tasks)} planets in a process pool.")
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            return list(executor.map(_render_planet_plots, plot_tasks))
+    except Exception as e:
+        logger.exception(f"Process pool failed while rendering plots ({e}); rendering them in-process instead.")
+        return [_render_planet_plots(plot_task) for plot_task in plot_tasks]
+
 # --- HTML Report Generation ---
+def _template_score_rows(scores):
+    """Turns a {field: (value, color, ...)} scores dict into the rows the report template iterates.
+    
+    Entries that are not (value, color) tuples or whose value is missing are skipped.
+    
+    Args:
+        scores (dict): Scores and their display colors; anything else yields no rows.
+    
+    Returns:
+        list: Dicts with "field", "value" and "color" keys, in the dict's order.
+    """
+    if not isinstance(scores, dict): return []
+    return [
+        {"field": field, "value": data_tuple[0], "color": data_tuple[1]}
+        for field, data_tuple in scores.items()
+        if isinstance(data_tuple, tuple) and len(data_tuple) >= 2 and not _isna(data_tuple[0])
+    ]
+
 def generate_planet_report_html(planet_data_dict, scores, sephi_scores, plots, template_env, output_dir, planet_name_slug):
     """Generates an individual HTML report for a planet.
     
@@ -333,19 +718,10 @@ def generate_planet_report_html(planet_data_dict, scores, sephi_scores, plots, t
     full_report_path = os.path.join(output_dir, report_filename)
     logger.debug(f"Generating individual report for {planet_name_slug} to {full_report_path}")
     try:
-        template = template_env.get_template("report_template.html")
-        
-        transformed_scores_list = []
-        if isinstance(scores, dict):
-            for field, data_tuple in scores.items():
-                if isinstance(data_tuple, tuple) and len(data_tuple) >= 2 and pd.notna(data_tuple[0]):
-                    transformed_scores_list.append({"field": field, "value": data_tuple[0], "color": data_tuple[1]})
+        template = _get_template(template_env, "report_template.html")
         
-        transformed_sephi_scores_list = []
-        if isinstance(sephi_scores, dict):
-            for field, data_tuple in sephi_scores.items():
-                if isinstance(data_tuple, tuple) and len(data_tuple) >= 2 and pd.notna(data_tuple[0]):
-                    transformed_sephi_scores_list.append({"field": field, "value": data_tuple[0], "color": data_tuple[1]})
+        transformed_scores_list = _template_score_rows(scores)
+        transformed_sephi_scores_list = _template_score_rows(sephi_scores)
 
         star_info_for_template = {
             "name": planet_data_dict.get("hostname", "N/A"),
@@ -358,13 +734,13 @@ def generate_planet_report_html(planet_data_dict, scores, sephi_scores, plots, t
             "metallicity_dex": format_float_field(planet_data_dict.get("st_metfe"))
         }
         sy_dist_pc = planet_data_dict.get("sy_dist")
-        if pd.notna(sy_dist_pc):
+        travel_times = None
+        if not _isna(sy_dist_pc):
             try:
-                star_info_for_template["distance_ly"] = f"{float(str(sy_dist_pc)) * 3.26156:.2f}"
+                travel_times = _travel_time_strings(sy_dist_pc)
             except (ValueError, TypeError):
-                star_info_for_template["distance_ly"] = "N/A"
-        else:
-            star_info_for_template["distance_ly"] = "N/A"
+                logger.warning(f"Could not calculate travel times for {planet_name_slug} due to distance conversion error.")
+        star_info_for_template["distance_ly"] = travel_times[0] if travel_times else "N/A"
 
         orbit_info_for_template = {
             "semi_major_axis_au": format_float_field(planet_data_dict.get("pl_orbsmax")),
@@ -373,29 +749,24 @@ def generate_planet_report_html(planet_data_dict, scores, sephi_scores, plots, t
             "inclination_deg": format_float_field(planet_data_dict.get("pl_orbincl"))
         }
         
-        travel_curiosities_for_template = {}
-        dist_pc_for_travel = planet_data_dict.get("sy_dist")
-        if pd.notna(dist_pc_for_travel):
-            try:
-                dist_ly_f = float(str(dist_pc_for_travel)) * 3.26156
-                travel_curiosities_for_template["distance_ly"] = f"{dist_ly_f:.2f}" # Added for individual report
-                travel_curiosities_for_template["scenario_1_label"] = "Current Tech (e.g., Parker Solar Probe ~170 km/s)"
-                travel_curiosities_for_template["scenario_1_time"] = f"{dist_ly_f * (299792.458 / 170) / 1000:.1f} thousand years" # Corrected speed of light
-                travel_curiosities_for_template["scenario_2_label"] = "Future Tech (20% speed of light)"
-                travel_curiosities_for_template["scenario_2_time"] = f"{dist_ly_f / 0.2:.1f} years"
-                travel_curiosities_for_template["scenario_3_label"] = "Relativistic (99% speed of light)"
-                travel_curiosities_for_template["scenario_3_time"] = f"{dist_ly_f / 0.99:.1f} years"
-            except (ValueError, TypeError):
-                logger.warning(f"Could not calculate travel times for {planet_name_slug} due to distance conversion error.")
-                travel_curiosities_for_template["distance_ly"] = "N/A"
-                travel_curiosities_for_template["scenario_1_time"] = "N/A"
-                travel_curiosities_for_template["scenario_2_time"] = "N/A"
-                travel_curiosities_for_template["scenario_3_time"] = "N/A"
+        if travel_times:
+            distance_ly_str, time_1, time_2, time_3 = travel_times
+            travel_curiosities_for_template = {
+                "distance_ly": distance_ly_str, # Added for individual report
+                "scenario_1_label": "Current Tech (e.g., Parker Solar Probe ~170 km/s)",
+                "scenario_1_time": time_1,
+                "scenario_2_label": "Future Tech (20% speed of light)",
+                "scenario_2_time": time_2,
+                "scenario_3_label": "Relativistic (99% speed of light)",
+                "scenario_3_time": time_3
+            }
         else:
-            travel_curiosities_for_template["distance_ly"] = "N/A"
-            travel_curiosities_for_template["scenario_1_time"] = "N/A"
-            travel_curiosities_for_template["scenario_2_time"] = "N/A"
-            travel_curiosities_for_template["scenario_3_time"] = "N/A"
+            travel_curiosities_for_template = {
+                "distance_ly": "N/A",
+                "scenario_1_time": "N/A",
+                "scenario_2_time": "N/A",
+                "scenario_3_time": "N/A"
+            }
 
         context = {
             "planet_data": planet_data_dict, 
@@ -410,16 +781,20 @@ def generate_planet_report_html(planet_data_dict, scores, sephi_scores, plots, t
             "datetime": datetime
         }
 
-        html_content = template.render(context)
+        # Escrever o HTML à medida que é renderizado, sem montar a página inteira em memória
         with open(full_report_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+            template.stream(context).dump(f)
         logger.info(f"HTML report for {planet_name_slug} saved to {full_report_path}")
         return full_report_path
     except Exception as e:
-        logger.error(f"Error generating HTML report for {planet_name_slug}: {e}", exc_info=True)
-        traceback.print_exc()
+        logger.exception(f"Error generating HTML report for {planet_name_slug}: {e}")
         return None
     
+# Equilibrium temperature factor (1 - albedo) ** 0.25 for the assumed Bond albedo of 0.3
+_ALBEDO_FACTOR = (1 - 0.3) ** 0.25
+# Magnetic activity score by spectral class when the planet mass is unknown
+_MAGNETIC_SCORE_BY_SPEC_LETTER = {"M": 40, "G": 80, "K": 80}
+
 def enrich_atmosphere_water_magnetic_moons(data, classification):
     """Estimates potential scores and descriptions for atmosphere, water, magnetic activity, and moons.
     
@@ -454,7 +829,6 @@ def enrich_atmosphere_water_magnetic_moons(data, classification):
         st_teff_str = data.get("st_teff")
         st_rad_str = data.get("st_rad")
         pl_orbsmax_str = data.get("pl_orbsmax")
-        albedo = 0.3
         
         st_teff_num, st_rad_num, pl_orbsmax_num = None, None, None
         try:
@@ -466,7 +840,7 @@ def enrich_atmosphere_water_magnetic_moons(data, classification):
             # Deixar como None, o bloco seguinte tratará isso
 
         if st_teff_num is not None and st_rad_num is not None and pl_orbsmax_num is not None and pl_orbsmax_num > 0:
-            temp = st_teff_num * ((st_rad_num / (2 * pl_orbsmax_num)) ** 0.5) * ((1 - albedo) ** 0.25)
+            temp = st_teff_num * ((st_rad_num / (2 * pl_orbsmax_num)) ** 0.5) * _ALBEDO_FACTOR
             logger.info(f"Temperatura calculada para {data.get('pl_name', 'Desconhecido')}: {temp:.2f} K")
         else:
             logger.warning(f"Unable to calculate temperature for {data.get('pl_name', 'Unknown')}, using default value of 278 K.")
@@ -479,18 +853,17 @@ def enrich_atmosphere_water_magnetic_moons(data, classification):
 
     # Scores numéricos
     # Agora 'temp' é um float e a comparação funcionará
+    # e descrições, decididos pela mesma faixa de temperatura
     if 273 < temp <= 373:
         atmosphere_score = 90
-        water_score = 90
+        atmosphere_desc = "Likely"
     elif 200 <= temp <= 273 or 373 < temp <= 450:
         atmosphere_score = 50
-        water_score = 50
+        atmosphere_desc = "Possible"
     else:
         atmosphere_score = 20
-        water_score = 20
-
-    # Descrições
-    atmosphere_desc = "Likely" if 273 < temp <= 373 else "Possible" if 200 <= temp <= 273 or 373 < temp <= 450 else "Unlikely"
+        atmosphere_desc = "Unlikely"
+    water_score = atmosphere_score
     water_desc = atmosphere_desc
 
     # Magnetic Activity (Score)
@@ -503,39 +876,29 @@ def enrich_atmosphere_water_magnetic_moons(data, classification):
             logger.warning(f"Could not convert mass '{mass_str}' to float for planet {data.get('pl_name', 'Unknown')}")
             
     st_spectype = data.get("st_spectype")
-    magnetic_desc = "Low" # Default
+    spec_letter = st_spectype[:1] if isinstance(st_spectype, str) else ""  # classe espectral (G, K, M...)
+    is_terran = "Terran" in classification or "Superterran" in classification
     magnetic_score = 10.0 # Default
-    star_type_condition_met = False
-
-    if isinstance(st_spectype, str) and st_spectype.strip(): # Verifica se é uma string não vazia
-        if st_spectype.startswith("G") or st_spectype.startswith("K"):
-         star_type_condition_met = True
 
     if mass is not None:
-        if mass > 1 and ("Terran" in classification or "Superterran" in classification):
-            magnetic_score = 80
-            if st_spectype and st_spectype.startswith("K"): # Checar se st_spectype não é None
-                magnetic_score = 90
+        if mass > 1 and is_terran:
+            magnetic_score = 90 if spec_letter == "K" else 80
         elif mass < 0.5:
             magnetic_score = 40
         # else: magnetic_score remains 60 or is set by st_spectype below
-    elif st_spectype: # Checar se st_spectype não é None
-        if st_spectype.startswith("M"):
-            magnetic_score = 40
-        elif st_spectype.startswith("G") or st_spectype.startswith("K"):
-            magnetic_score = 80
+    elif spec_letter:
+        magnetic_score = _MAGNETIC_SCORE_BY_SPEC_LETTER.get(spec_letter, magnetic_score)
     # else: magnetic_score remains 60 (default)
 
     # Magnetic Activity (Description)
     magnetic_desc = "Low" # Default
-    if (mass is not None and mass > 1 and ("Terran" in classification or "Superterran" in classification)) or \
-       (st_spectype and (st_spectype.startswith("G") or st_spectype.startswith("K"))):
+    if (mass is not None and mass > 1 and is_terran) or spec_letter in ("G", "K"):
         magnetic_desc = "High"
     elif mass is not None and mass >= 0.5:
         magnetic_desc = "Moderate"
 
     # Presence of Moons (Score & Description)
-    if "Terran" in classification or "Superterran" in classification:
+    if is_terran:
         moons_score = 80
         moons_desc = "Possible"
     else:
@@ -583,8 +946,8 @@ def get_score_info(scores_dict, field_name):
     # Verificar se o campo existe como tupla
     score_tuple = scores_dict.get(field_name)
     
-    if not isinstance(score_tuple, tuple) or len(score_tuple) < 1 or pd.isna(score_tuple[0]):
-        if not (isinstance(score_tuple, tuple) and len(score_tuple) >= 1 and pd.isna(score_tuple[0])):
+    if not isinstance(score_tuple, tuple) or len(score_tuple) < 1 or _isna(score_tuple[0]):
+        if not (isinstance(score_tuple, tuple) and len(score_tuple) >= 1 and _isna(score_tuple[0])):
             logger.debug(f"Invalid or missing score_tuple for field '{field_name}'. score_tuple: {score_tuple}. Using default score info.")
         return {"score": default_numeric_score, "color": default_color, "text": default_text}
 
@@ -612,34 +975,35 @@ def get_score_info(scores_dict, field_name):
         "text": text_val
     }
 
+# Template scores computed by _prepare_data_for_aggregated_reports itself rather than read from the input
+_COMPUTED_SCORE_KEYS = ("Stellar_Activity", "Atmosphere_Potential", "Liquid_Water_Potential", "Presence_of_Moons", "Habitability")
+# Computed scores taken from enrich_atmosphere_water_magnetic_moons, which can fall outside 0-100
+_CLIPPED_SCORE_KEYS = ("Atmosphere_Potential", "Liquid_Water_Potential", "Presence_of_Moons")
+
 def _prepare_data_for_aggregated_reports(all_planets_report_data, output_dir):
     logger.info(f"Starting _prepare_data_for_aggregated_reports with {len(all_planets_report_data)} planets")
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    # Mensagens INFO por planeta: só formatar quando forem de fato emitidas
+    info_enabled = logger.isEnabledFor(logging.INFO)
     
-    # Salvar os dados de entrada para depuração
-    debug_input_path = os.path.join(output_dir, "debug_input_all_planets_report_data_AGGREGATED_INPUT.json")
-    try:
-        with open(debug_input_path, "w", encoding="utf-8") as f_debug:
-            json.dump(all_planets_report_data, f_debug, indent=2, default=str)
-        logger.info(f"Saved input for _prepare_data_for_aggregated_reports to {debug_input_path}")
-    except Exception as e_debug:
-        logger.error(f"Could not save input for debugging: {e_debug}")
+    # Salvar os dados de entrada para depuração (só com logging DEBUG ativo)
+    if debug_enabled:
+        debug_input_path = os.path.join(output_dir, "debug_input_all_planets_report_data_AGGREGATED_INPUT.json")
+        try:
+            with open(debug_input_path, "w", encoding="utf-8") as f_debug:
+                json.dump(all_planets_report_data, f_debug, indent=2, default=str)
+            logger.debug(f"Saved input for _prepare_data_for_aggregated_reports to {debug_input_path}")
+        except Exception as e_debug:
+            logger.error(f"Could not save input for debugging: {e_debug}")
 
     def safe_get(dictionary, key, default="N/A"):
         if dictionary is None:
             return default
         value = dictionary.get(key)
-        if pd.isna(value) or value is None or str(value).strip().lower() == "n/a":
+        if _isna(value) or value is None or str(value).strip().lower() == "n/a":
             return default
         return value
     
-    def find_key_insensitive(dictionary, target_key):
-        if dictionary is None:
-            return None
-        for key in dictionary.keys():
-            if key.lower() == target_key.lower():
-                return dictionary[key]
-        return None
-
     def get_score_info(scores_dict, field_name):
         default_numeric_score = 0.0
         default_color = "#808080"
@@ -651,8 +1015,8 @@ def _prepare_data_for_aggregated_reports(all_planets_report_data, output_dir):
         
         score_tuple = scores_dict.get(field_name)
         
-        if not isinstance(score_tuple, tuple) or len(score_tuple) < 1 or pd.isna(score_tuple[0]):
-            if not (isinstance(score_tuple, tuple) and len(score_tuple) >= 1 and pd.isna(score_tuple[0])):
+        if not isinstance(score_tuple, tuple) or len(score_tuple) < 1 or _isna(score_tuple[0]):
+            if not (isinstance(score_tuple, tuple) and len(score_tuple) >= 1 and _isna(score_tuple[0])):
                 logger.debug(f"Invalid or missing score_tuple for field '{field_name}'. score_tuple: {score_tuple}. Using default score info.")
             return {"score": default_numeric_score, "color": default_color, "text": default_text}
 
@@ -681,6 +1045,8 @@ def _prepare_data_for_aggregated_reports(all_planets_report_data, output_dir):
         }
 
     processed_data_list = []
+    habitability_components = []
+    warm_terran_flags = []
     
     for p_data in all_planets_report_data:
         planet_raw_TAP_data = p_data.get("planet_data_dict", {})
@@ -691,10 +1057,17 @@ def _prepare_data_for_aggregated_reports(all_planets_report_data, output_dir):
         planet_name = safe_get(planet_raw_TAP_data, "pl_name", "Unknown Planet")
         planet_name_for_log = planet_name
         
-        logger.info(f"Processing {planet_name_for_log} for aggregated reports")
+        if info_enabled: logger.info(f"Processing {planet_name_for_log} for aggregated reports")
+
+        # Case-insensitive view of the planet's fields, built once instead of rescanning every key per lookup
+        fields_by_lower_key = {}
+        for key, value in planet_raw_TAP_data.items():
+            if isinstance(key, str): fields_by_lower_key.setdefault(key.lower(), value)
+        find_field = fields_by_lower_key.get
+        planet_field = planet_raw_TAP_data.get
         
         # Logar todas as chaves disponíveis em planet_raw_TAP_data para depuração
-        logger.debug(f"Available keys in planet_raw_TAP_data for {planet_name_for_log}: {list(planet_raw_TAP_data.keys())}")
+        if debug_enabled: logger.debug(f"Available keys in planet_raw_TAP_data for {planet_name_for_log}: {list(planet_raw_TAP_data.keys())}")
         
         # Obter scores e dados
         scores_processed = p_data.get("scores_for_report", {})
@@ -709,7 +1082,7 @@ def _prepare_data_for_aggregated_reports(all_planets_report_data, output_dir):
         enriched_details = enrich_atmosphere_water_magnetic_moons(planet_raw_TAP_data, classification_text)
 
         # --- NOVO CÁLCULO PARA STELLAR ACTIVITY SCORE ---
-        st_age_str = planet_raw_TAP_data.get("st_age")
+        st_age_str = planet_field("st_age")
         # Default para "Low" (atividade real alta, score de favorabilidade baixo = 30%)
         # se st_age não for fornecido, for inválido, ou <= 2 Gyr.
         stellar_activity_score_val = 30.0 
@@ -730,7 +1103,7 @@ def _prepare_data_for_aggregated_reports(all_planets_report_data, output_dir):
                 logger.warning(f"Planet {planet_name_for_log}: Could not convert st_age '{st_age_str}' to float. Stellar Activity Score set to 30% (default for Low activity / unknown).")
                 # stellar_activity_score_val já é 30.0 por default
         
-        logger.debug(f"Planet {planet_name_for_log}: st_age='{st_age_str}', Stellar Activity Description (from logic): '{stellar_activity_desc_for_log}', Score: {stellar_activity_score_val}%")
+        if debug_enabled: logger.debug(f"Planet {planet_name_for_log}: st_age='{st_age_str}', Stellar Activity Description (from logic): '{stellar_activity_desc_for_log}', Score: {stellar_activity_score_val}%")
         # --- FIM DO NOVO CÁLCULO ---
 
         # Preparar scores para o template
@@ -745,35 +1118,30 @@ def _prepare_data_for_aggregated_reports(all_planets_report_data, output_dir):
                 # Supondo que 'stellar_activity_score' deve vir de planet_raw_TAP_data
                 # Se precisar de uma descrição mais elaborada, você precisará de uma fonte para ela.
                 "score": stellar_activity_score_val,
-                "color": get_color_for_percentage(stellar_activity_score_val),
+                "color": None,  # filled in for all planets at once below
                 "text": stellar_activity_desc_for_log, # Tenta pegar uma descrição se houver
             },   
             "Orbital_Eccentricity": get_score_info(scores_processed, "Orbital Eccentricity"),
             # >>>>> USAR enriched_details AQUI <<<<<
             "Atmosphere_Potential": {
-                "score": np.clip(float(enriched_details.get("atmosphere_potential_score", 0.0)), 0, 100),
-                "color": get_color_for_percentage(float(enriched_details.get("atmosphere_potential_score", 0.0))),
+                "score": float(enriched_details.get("atmosphere_potential_score", 0.0)),  # clipped to 0-100 below
+                "color": None,
                 "text": enriched_details.get("atmosphere_potential_desc", "N/A")
             },
             "Liquid_Water_Potential": {
-                "score": np.clip(float(enriched_details.get("liquid_water_potential_score", 0.0)), 0, 100),
-                "color": get_color_for_percentage(float(enriched_details.get("liquid_water_potential_score", 0.0))),
+                "score": float(enriched_details.get("liquid_water_potential_score", 0.0)),  # clipped to 0-100 below
+                "color": None,
                 "text": enriched_details.get("liquid_water_potential_desc", "N/A")
             },
-            "Magnetic_Activity": {
-                "score": np.clip(float(enriched_details.get("magnetic_activity_score", 0.0)), 0, 100),
-                "color": get_color_for_percentage(float(enriched_details.get("magnetic_activity_score", 0.0))),
-                "text": enriched_details.get("magnetic_activity_desc", "N/A") 
-            },
+            "Magnetic_Activity": get_score_info(scores_processed, "Magnetic Activity"),
             "Presence_of_Moons": {
-                "score": np.clip(float(enriched_details.get("presence_of_moons_score", 0.0)), 0, 100),
-                "color": get_color_for_percentage(float(enriched_details.get("presence_of_moons_score", 0.0))),
+                "score": float(enriched_details.get("presence_of_moons_score", 0.0)),  # clipped to 0-100 below
+                "color": None,
                 "text": enriched_details.get("presence_of_moons_desc", "N/A")
             },
-            "Magnetic_Activity": get_score_info(scores_processed, "Magnetic Activity"),
             "Habitable_Zone_Position": get_score_info(scores_processed, "Habitable Zone Position"),
             "Temperature": get_score_description(scores_processed, "Temperature", classification_text),
-            "Bio Potential": get_score_description_bio(scores_processed, "Bio Potential", planet_raw_TAP_data.get("pl_eqt")),
+            "Bio Potential": get_score_description_bio(scores_processed, "Bio Potential", planet_field("pl_eqt")),
             "Presence of Moons": get_score_description_moons(scores_processed, "Presence of Moons", classification_text, planet_raw_TAP_data),
             "Size": get_score_info(scores_processed, "Size"),
             "Density": get_score_info(scores_processed, "Density"),
@@ -811,8 +1179,8 @@ def _prepare_data_for_aggregated_reports(all_planets_report_data, output_dir):
                     except (ValueError, TypeError) as e:
                         logger.warning(f"Error processing SEPHI score for {key} in planet {planet_name_for_log}: {e}")
 
-        # Calcular Habitability Score
-        components = [
+        # Componentes do Habitability Score; a média geométrica é calculada para todos os planetas abaixo
+        habitability_components.append([
             scores_for_template["Temperature"]["score"],
             scores_for_template["Bio Potential"]["score"],
             scores_for_template["Magnetic_Activity"]["score"],
@@ -820,33 +1188,17 @@ def _prepare_data_for_aggregated_reports(all_planets_report_data, output_dir):
             scores_for_template["Presence of Moons"]["score"],
             scores_for_template["Size"]["score"],
             scores_for_template["Density"]["score"]
-        ]
-        habitability_score_value = 0.0
-        if components:
-            habitability_score_value = np.power(np.prod([max(1e-10, c) for c in components]), 1/7)
-            habitability_score_value = np.clip(habitability_score_value, 0, 100)
-        else:
-            logger.warning(f"No components available to calculate Habitability Score for {planet_name_for_log}. Set to 0.")
-
-        scores_for_template["Habitability"] = {
-            "score": habitability_score_value,
-            "color": get_color_for_percentage(habitability_score_value),
-            "text": "Overall Habitability Score"
-        }
-
+        ])
         is_warm_classified = "Warm" in classification_text
-        if is_warm_classified and ("Terran" in classification_text or "Superterran" in classification_text):
-            habitability_score_value = min(habitability_score_value + 10, 100)
-        
-        habitability_score_value = np.clip(habitability_score_value, 0, 100)
+        warm_terran_flags.append(is_warm_classified and ("Terran" in classification_text or "Superterran" in classification_text))
         scores_for_template["Habitability"] = {
-            "score": habitability_score_value,
-            "color": get_color_for_percentage(habitability_score_value),
+            "score": None,
+            "color": None,
             "text": "Overall Habitability Score"
         }
 
         # Calcular informações de viagem
-        sy_dist_pc = planet_raw_TAP_data.get("sy_dist")
+        sy_dist_pc = planet_field("sy_dist")
         distance_ly_str = "N/A"
         travel_details = {
             "distance_ly": "N/A",
@@ -854,53 +1206,52 @@ def _prepare_data_for_aggregated_reports(all_planets_report_data, output_dir):
             "twenty_ls_years": "N/A",
             "near_ls_years": "N/A"
         }
-        if pd.notna(sy_dist_pc):
+        if not _isna(sy_dist_pc):
             try:
-                dist_ly_f = float(str(sy_dist_pc)) * 3.26156
-                distance_ly_str = f"{dist_ly_f:.2f}"
+                distance_ly_str, current_tech_str, twenty_ls_str, near_ls_str = _travel_time_strings(sy_dist_pc)
                 travel_details["distance_ly"] = distance_ly_str
-                travel_details["current_tech_years"] = f"{dist_ly_f * (299792.458 / 170) / 1000:.1f} thousand years"
-                travel_details["twenty_ls_years"] = f"{dist_ly_f / 0.2:.1f} years"
-                travel_details["near_ls_years"] = f"{dist_ly_f / 0.99:.1f} years"
+                travel_details["current_tech_years"] = current_tech_str
+                travel_details["twenty_ls_years"] = twenty_ls_str
+                travel_details["near_ls_years"] = near_ls_str
             except (ValueError, TypeError):
                 logger.warning(f"Could not calculate travel times for {planet_name_for_log} due to distance conversion error for sy_dist: {sy_dist_pc}")
 
         # Obter descrição da zona habitável
         hz_description = "N/A"
-        if hz_data_tuple_raw and len(hz_data_tuple_raw) > 4 and pd.notna(hz_data_tuple_raw[4]):
+        if hz_data_tuple_raw and len(hz_data_tuple_raw) > 4 and not _isna(hz_data_tuple_raw[4]):
             hz_description = str(hz_data_tuple_raw[4])
 
         # Calcular gravidade superficial
         surface_gravity_value_str = "N/A"
-        raw_pl_grav = planet_raw_TAP_data.get("pl_grav")
-        if pd.notna(raw_pl_grav):
+        raw_pl_grav = planet_field("pl_grav")
+        if not _isna(raw_pl_grav):
             surface_gravity_value_str = format_float_field(raw_pl_grav, ".2f")
         else:
-            raw_pl_masse = planet_raw_TAP_data.get("pl_masse")
-            if not pd.notna(raw_pl_masse):
-                raw_pl_masse = planet_raw_TAP_data.get("pl_bmassj")
-            raw_pl_rade = planet_raw_TAP_data.get("pl_rade")
-            if pd.notna(raw_pl_masse) and pd.notna(raw_pl_rade):
+            raw_pl_masse = planet_field("pl_masse")
+            if _isna(raw_pl_masse):
+                raw_pl_masse = planet_field("pl_bmassj")
+            raw_pl_rade = planet_field("pl_rade")
+            if not _isna(raw_pl_masse) and not _isna(raw_pl_rade):
                 try:
                     mass_earth_str = str(raw_pl_masse)
                     if mass_earth_str.startswith("<"):
                         mass_earth_str = mass_earth_str.lstrip("<")
                     mass_earth = float(mass_earth_str)
-                    radius_earth = float(str(raw_pl_rade))
+                    radius_earth = _as_float(raw_pl_rade)
                     if radius_earth > 0:
                         calculated_gravity = mass_earth / (radius_earth ** 2)
                         surface_gravity_value_str = format_float_field(calculated_gravity, ".2f")
-                        logger.info(f"Calculated surface gravity for {planet_name_for_log}: {surface_gravity_value_str} g (M={mass_earth} M⊕, R={radius_earth} R⊕)")
+                        if info_enabled: logger.info(f"Calculated surface gravity for {planet_name_for_log}: {surface_gravity_value_str} g (M={mass_earth} M⊕, R={radius_earth} R⊕)")
                     else:
                         logger.warning(f"Cannot calculate surface gravity for {planet_name_for_log}: radius is zero or invalid ({radius_earth}).")
                 except (ValueError, TypeError) as e_calc:
                     logger.warning(f"Could not convert mass ('{raw_pl_masse}') or radius ('{raw_pl_rade}') to float for surface gravity calculation for {planet_name_for_log}. Error: {e_calc}")
 
         # Adicionar dados de descoberta
-        discovery_method = find_key_insensitive(planet_raw_TAP_data, "discoverymethod")
-        if discovery_method is None or pd.isna(discovery_method) or str(discovery_method).strip().lower() == "n/a":
-            discovery_method = find_key_insensitive(planet_raw_TAP_data, "disc_method")
-        discovery_method = discovery_method if discovery_method is not None and not pd.isna(discovery_method) and str(discovery_method).strip().lower() != "n/a" else "N/A"
+        discovery_method = find_field("discoverymethod")
+        if discovery_method is None or _isna(discovery_method) or str(discovery_method).strip().lower() == "n/a":
+            discovery_method = find_field("disc_method")
+        discovery_method = discovery_method if discovery_method is not None and not _isna(discovery_method) and str(discovery_method).strip().lower() != "n/a" else "N/A"
         method_map = {
             "tran": "Transit",
             "rv": "Radial Velocity",
@@ -912,76 +1263,69 @@ def _prepare_data_for_aggregated_reports(all_planets_report_data, output_dir):
             "etv": "Eclipse Timing Variations"
         }
         discovery_method = method_map.get(discovery_method.lower(), discovery_method)
-        logger.debug(f"Planet {planet_name_for_log}: Discovery Method - NASA (discoverymethod): {planet_raw_TAP_data.get('discoverymethod')}, NASA (disc_method): {planet_raw_TAP_data.get('disc_method')}, Selected: {discovery_method}")
+        if debug_enabled: logger.debug(f"Planet {planet_name_for_log}: Discovery Method - NASA (discoverymethod): {planet_field('discoverymethod')}, NASA (disc_method): {planet_field('disc_method')}, Selected: {discovery_method}")
 
-        discovery_year = find_key_insensitive(planet_raw_TAP_data, "disc_year")
-        discovery_year = discovery_year if discovery_year is not None and not pd.isna(discovery_year) and str(discovery_year).strip().lower() != "n/a" else "N/A"
-        logger.debug(f"Planet {planet_name_for_log}: Discovery Year - NASA (disc_year): {planet_raw_TAP_data.get('disc_year')}, Selected: {discovery_year}")
+        discovery_year = find_field("disc_year")
+        discovery_year = discovery_year if discovery_year is not None and not _isna(discovery_year) and str(discovery_year).strip().lower() != "n/a" else "N/A"
+        if debug_enabled: logger.debug(f"Planet {planet_name_for_log}: Discovery Year - NASA (disc_year): {planet_field('disc_year')}, Selected: {discovery_year}")
 
-        discovery_facility = find_key_insensitive(planet_raw_TAP_data, "disc_facility")
-        if discovery_facility is None or pd.isna(discovery_facility) or str(discovery_facility).strip().lower() == "n/a":
-            discovery_facility = find_key_insensitive(planet_raw_TAP_data, "disc_instrument")
-        discovery_facility = discovery_facility if discovery_facility is not None and not pd.isna(discovery_facility) and str(discovery_facility).strip().lower() != "n/a" else "N/A"
-        logger.debug(f"Planet {planet_name_for_log}: Discovery Instrument - NASA (disc_instrument): {planet_raw_TAP_data.get('disc_instrument')}, Selected: {discovery_facility}")
+        discovery_facility = find_field("disc_facility")
+        if discovery_facility is None or _isna(discovery_facility) or str(discovery_facility).strip().lower() == "n/a":
+            discovery_facility = find_field("disc_instrument")
+        discovery_facility = discovery_facility if discovery_facility is not None and not _isna(discovery_facility) and str(discovery_facility).strip().lower() != "n/a" else "N/A"
+        if debug_enabled: logger.debug(f"Planet {planet_name_for_log}: Discovery Instrument - NASA (disc_instrument): {planet_field('disc_instrument')}, Selected: {discovery_facility}")
 
-        discovery_telescope = find_key_insensitive(planet_raw_TAP_data, "disc_telescope")
-        discovery_telescope = discovery_telescope if discovery_telescope is not None and not pd.isna(discovery_telescope) and str(discovery_telescope).strip().lower() != "n/a" else "N/A"
-        logger.debug(f"Planet {planet_name_for_log}: Discovery Telescope - NASA (disc_telescope): {planet_raw_TAP_data.get('disc_telescope')}, Selected: {discovery_telescope}")
+        discovery_telescope = find_field("disc_telescope")
+        discovery_telescope = discovery_telescope if discovery_telescope is not None and not _isna(discovery_telescope) and str(discovery_telescope).strip().lower() != "n/a" else "N/A"
+        if debug_enabled: logger.debug(f"Planet {planet_name_for_log}: Discovery Telescope - NASA (disc_telescope): {planet_field('disc_telescope')}, Selected: {discovery_telescope}")
 
         # Adicionar dados de localização
-        x_pixel_ra = find_key_insensitive(planet_raw_TAP_data, "S_RA")
-        if x_pixel_ra is None or pd.isna(x_pixel_ra) or str(x_pixel_ra).strip().lower() == "n/a":
-            x_pixel_ra = find_key_insensitive(planet_raw_TAP_data, "ra")
-        x_pixel_ra = x_pixel_ra if x_pixel_ra is not None and not pd.isna(x_pixel_ra) and str(x_pixel_ra).strip().lower() != "n/a" else "N/A"
-
-        y_pixel_dec = find_key_insensitive(planet_raw_TAP_data, "S_DEC")
-        if y_pixel_dec is None or pd.isna(y_pixel_dec) or str(y_pixel_dec).strip().lower() == "n/a":
-            y_pixel_dec = find_key_insensitive(planet_raw_TAP_data, "dec")
-        y_pixel_dec = y_pixel_dec if y_pixel_dec is not None and not pd.isna(y_pixel_dec) and str(y_pixel_dec).strip().lower() != "n/a" else "N/A"
-
-        right_ascension = find_key_insensitive(planet_raw_TAP_data, "S_RA_STR")
-        if right_ascension is None or pd.isna(right_ascension) or str(right_ascension).strip().lower() == "n/a":
-            right_ascension = find_key_insensitive(planet_raw_TAP_data, "rastr")
-        right_ascension = right_ascension if right_ascension is not None and not pd.isna(right_ascension) and str(right_ascension).strip().lower() != "n/a" else "N/A"
-
-        declination = find_key_insensitive(planet_raw_TAP_data, "S_DEC_STR")
-        if declination is None or pd.isna(declination) or str(declination).strip().lower() == "n/a":
-            declination = find_key_insensitive(planet_raw_TAP_data, "decstr")
-        declination = declination if declination is not None and not pd.isna(declination) and str(declination).strip().lower() != "n/a" else "N/A"
+        x_pixel_ra = find_field("s_ra")
+        if x_pixel_ra is None or _isna(x_pixel_ra) or str(x_pixel_ra).strip().lower() == "n/a":
+            x_pixel_ra = find_field("ra")
+        x_pixel_ra = x_pixel_ra if x_pixel_ra is not None and not _isna(x_pixel_ra) and str(x_pixel_ra).strip().lower() != "n/a" else "N/A"
+
+        y_pixel_dec = find_field("s_dec")
+        if y_pixel_dec is None or _isna(y_pixel_dec) or str(y_pixel_dec).strip().lower() == "n/a":
+            y_pixel_dec = find_field("dec")
+        y_pixel_dec = y_pixel_dec if y_pixel_dec is not None and not _isna(y_pixel_dec) and str(y_pixel_dec).strip().lower() != "n/a" else "N/A"
+
+        right_ascension = find_field("s_ra_str")
+        if right_ascension is None or _isna(right_ascension) or str(right_ascension).strip().lower() == "n/a":
+            right_ascension = find_field("rastr")
+        right_ascension = right_ascension if right_ascension is not None and not _isna(right_ascension) and str(right_ascension).strip().lower() != "n/a" else "N/A"
+
+        declination = find_field("s_dec_str")
+        if declination is None or _isna(declination) or str(declination).strip().lower() == "n/a":
+            declination = find_field("decstr")
+        declination = declination if declination is not None and not _isna(declination) and str(declination).strip().lower() != "n/a" else "N/A"
 
         # Preparar star_info com constelação
         star_info = {
-            "temperature_k": format_float_field(planet_raw_TAP_data.get("st_teff"), ".0f"),
-            "radius_solar": format_float_field(planet_raw_TAP_data.get("st_rad")),
-            "mass_solar": format_float_field(planet_raw_TAP_data.get("st_mass")),
-            "luminosity_log_solar": format_float_field(planet_raw_TAP_data.get("st_lum")),
-            "age_gyr": format_float_field(planet_raw_TAP_data.get("st_age")),
-            "metallicity_dex": format_float_field(planet_raw_TAP_data.get("st_metfe")),
-            "constellation": find_key_insensitive(planet_raw_TAP_data, "S_CONSTELLATION") or "N/A"
+            "temperature_k": format_float_field(planet_field("st_teff"), ".0f"),
+            "radius_solar": format_float_field(planet_field("st_rad")),
+            "mass_solar": format_float_field(planet_field("st_mass")),
+            "luminosity_log_solar": format_float_field(planet_field("st_lum")),
+            "age_gyr": format_float_field(planet_field("st_age")),
+            "metallicity_dex": format_float_field(planet_field("st_metfe")),
+            "constellation": find_field("s_constellation") or "N/A",
+            "distance_ly": distance_ly_str  # sy_dist was already converted for the travel details
         }
-        sy_dist_pc = planet_raw_TAP_data.get("sy_dist")
-        if pd.notna(sy_dist_pc):
-            try:
-                star_info["distance_ly"] = f"{float(str(sy_dist_pc)) * 3.26156:.2f}"
-            except (ValueError, TypeError):
-                star_info["distance_ly"] = "N/A"
-        else:
-            star_info["distance_ly"] = "N/A"
 
         # Preparar dados para o template
         data_for_template = {
-            "planet_name": planet_raw_TAP_data.get("pl_name", "N/A"),
+            "planet_name": planet_field("pl_name", "N/A"),
             "classification": classification_text,
-            "star_type": planet_raw_TAP_data.get("st_spectype", "N/A"),
+            "star_type": planet_field("st_spectype", "N/A"),
             "distance_light_years": distance_ly_str,
-            "equilibrium_temp_k": format_float_field(planet_raw_TAP_data.get("pl_eqt"), ".0f"),
-            "planet_radius_earth": format_float_field(planet_raw_TAP_data.get("pl_rade")),
-            "planet_mass_earth": format_float_field(planet_raw_TAP_data.get("pl_bmassj") if pd.notna(planet_raw_TAP_data.get("pl_bmassj")) else planet_raw_TAP_data.get("pl_masse"), ".2f"),
-            "planet_density_gcm3": format_float_field(planet_raw_TAP_data.get("pl_dens")),
+            "equilibrium_temp_k": format_float_field(planet_field("pl_eqt"), ".0f"),
+            "planet_radius_earth": format_float_field(planet_field("pl_rade")),
+            "planet_mass_earth": format_float_field(planet_field("pl_bmassj") if not _isna(planet_field("pl_bmassj")) else planet_field("pl_masse"), ".2f"),
+            "planet_density_gcm3": format_float_field(planet_field("pl_dens")),
             "surface_gravity_g": surface_gravity_value_str,
-            "orbital_period_days": format_float_field(planet_raw_TAP_data.get("pl_orbper")),
-            "semi_major_axis_au": format_float_field(planet_raw_TAP_data.get("pl_orbsmax")),
-            "eccentricity": format_float_field(planet_raw_TAP_data.get("pl_orbeccen")),
+            "orbital_period_days": format_float_field(planet_field("pl_orbper")),
+            "semi_major_axis_au": format_float_field(planet_field("pl_orbsmax")),
+            "eccentricity": format_float_field(planet_field("pl_orbeccen")),
             "travel_curiosities": travel_details,
             "habitable_zone_description": hz_description,
             "scores": scores_for_template,
@@ -1008,72 +1352,89 @@ def _prepare_data_for_aggregated_reports(all_planets_report_data, output_dir):
     if not processed_data_list:
         logger.warning("No data processed for summary/combined report (processed_data_list is empty).")
         return []
+
+    # Habitability: geometric mean of the 7 components (floored at 1e-10), +10 for warm
+    # (super)terrans, kept within 0-100 - one array operation for all planets
+    habitability_scores = np.clip(np.power(np.prod(np.fmax(np.array(habitability_components, dtype=np.float64), 1e-10), axis=1), 1/7), 0, 100)
+    habitability_scores = np.where(warm_terran_flags, np.minimum(habitability_scores + 10, 100), habitability_scores)
+    for planet_entry, habitability_score in zip(processed_data_list, habitability_scores.tolist()):
+        planet_entry["scores"]["Habitability"]["score"] = habitability_score
+
+    # Enriched potential scores are clipped to 0-100 in one pass as well
+    for score_key in _CLIPPED_SCORE_KEYS:
+        score_entries = [planet_entry["scores"][score_key] for planet_entry in processed_data_list]
+        clipped = np.clip(np.array([score_entry["score"] for score_entry in score_entries], dtype=np.float64), 0, 100)
+        for score_entry, score in zip(score_entries, clipped.tolist()):
+            score_entry["score"] = score
+
+    # Colors of the scores computed above: a single vectorized lookup over the whole
+    # planets x scores matrix, flattened row by row
+    score_entries = [planet_entry["scores"][score_key] for planet_entry in processed_data_list for score_key in _COMPUTED_SCORE_KEYS]
+    colors = get_colors_for_percentages([score_entry["score"] for score_entry in score_entries])
+    for score_entry, color in zip(score_entries, colors.tolist()):
+        score_entry["color"] = color
         
-    debug_output_path = os.path.join(output_dir, "debug_output_processed_planets_data.json")
-    try:
-        with open(debug_output_path, "w", encoding="utf-8") as f_debug:
-            json.dump(processed_data_list, f_debug, indent=2, default=str)
-        logger.info(f"Saved processed_planets_data for debugging to {debug_output_path}")
-    except Exception as e_debug:
-        logger.error(f"Could not save processed_planets_data for debugging: {e_debug}")
+    if debug_enabled:
+        debug_output_path = os.path.join(output_dir, "debug_output_processed_planets_data.json")
+        try:
+            with open(debug_output_path, "w", encoding="utf-8") as f_debug:
+                json.dump(processed_data_list, f_debug, indent=2, default=str)
+            logger.debug(f"Saved processed_planets_data for debugging to {debug_output_path}")
+        except Exception as e_debug:
+            logger.error(f"Could not save processed_planets_data for debugging: {e_debug}")
 
     return processed_data_list
 
-def generate_summary_report_html(all_planets_report_data, template_env, output_dir):
-    """Generates a summary HTML report for multiple planets.
+# (report file name, template name, title used in logs and error pages) per aggregated report kind
+_AGGREGATED_REPORTS = {
+    "summary": ("summary_report.html", "summary_template.html", "Summary"),
+    "combined": ("combined_report.html", "combined_template.html", "Combined"),
+}
+
+def _render_aggregated_report(report_kind, prepare_data, template_env, output_dir):
+    """Renders one aggregated (summary or combined) HTML report.
     
-    Uses the `_prepare_data_for_aggregated_reports` function to process the input data
-    and then renders it using the "summary_template.html" Jinja2 template.
-    If an error occurs during generation, it attempts to create an error report.
+    The planet data is obtained by calling `prepare_data` inside the error handling
+    block, so a failure while preparing the data also produces an error report.
     
     Args:
-        all_planets_report_data (list): A list of dictionaries, each containing
-                                        processed data for a single planet.
+        report_kind (str): "summary" or "combined".
+        prepare_data (callable): Returns the list produced by
+                                 `_prepare_data_for_aggregated_reports`.
         template_env (jinja2.Environment): The Jinja2 template environment.
         output_dir (str): The directory where the HTML report will be saved.
     
     Returns:
-        str or None: The full path to the generated summary HTML report file.
+        str or None: The full path to the generated HTML report file.
                      Returns path to an error report if main generation fails,
                      or None if error report also fails.
     """
-    logger = logging.getLogger(__name__)
-    
-    # Função auxiliar para garantir que o diretório exista
-    def ensure_dir(directory):
-        if not os.path.exists(directory):
-            os.makedirs(directory)
-            logger.info(f"Created directory: {directory}")
+    report_filename, template_name, report_title = _AGGREGATED_REPORTS[report_kind]
     
     ensure_dir(output_dir)
-    report_filename = "summary_report.html"
     full_report_path = os.path.join(output_dir, report_filename)
-    logger.info(f"Generating summary report to {full_report_path}")
+    logger.info(f"Generating {report_kind} report to {full_report_path}")
     
     try:
-        template = template_env.get_template("summary_template.html")
+        template = _get_template(template_env, template_name)
         
-        # Usar a versão corrigida da função de preparação de dados
-        processed_planets_data = _prepare_data_for_aggregated_reports(all_planets_report_data, output_dir)
+        processed_planets_data = prepare_data()
         
         if not processed_planets_data:
-            logger.warning("No processed data available for summary report. Creating empty report.")
+            logger.warning(f"No processed data available for {report_kind} report. Creating empty report.")
             # Criar um relatório vazio em vez de retornar None
             processed_planets_data = []
         
         context = {"all_planets_data": processed_planets_data, "datetime": datetime}
-        html_content = template.render(context)
-        
+        # Escrever o HTML à medida que é renderizado, sem montar a página inteira em memória
         with open(full_report_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+            template.stream(context).dump(f)
         
-        logger.info(f"Summary report saved to {full_report_path}")
+        logger.info(f"{report_title} report saved to {full_report_path}")
         return full_report_path
     
     except Exception as e:
-        logger.error(f"Error generating summary report: {e}", exc_info=True)
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Error generating {report_kind} report: {e}")
         
         # Criar um relatório de erro em vez de retornar None
         try:
@@ -1081,16 +1442,16 @@ def generate_summary_report_html(all_planets_report_data, template_env, output_d
             <!DOCTYPE html>
             <html>
             <head>
-                <title>Summary Report Error</title>
+                <title>{report_title} Report Error</title>
                 <style>
                     body {{ font-family: Arial, sans-serif; margin: 20px; }}
                     .error {{ color: red; background-color: #ffeeee; padding: 10px; border-radius: 5px; }}
                 </style>
             </head>
             <body>
-                <h1>Summary Report Error</h1>
+                <h1>{report_title} Report Error</h1>
                 <div class="error">
-                    <p>An error occurred while generating the summary report:</p>
+                    <p>An error occurred while generating the {report_kind} report:</p>
                     <pre>{str(e)}</pre>
                 </div>
                 <p>Please try again or contact support if the problem persists.</p>
@@ -1100,12 +1461,63 @@ def generate_summary_report_html(all_planets_report_data, template_env, output_d
             """
             with open(full_report_path, "w", encoding="utf-8") as f:
                 f.write(error_html)
-            logger.info(f"Error summary report saved to {full_report_path}")
+            logger.info(f"Error {report_kind} report saved to {full_report_path}")
             return full_report_path
         except Exception as e2:
             logger.error(f"Failed to create error report: {e2}")
             return None
 
+def generate_aggregated_reports(all_planets_report_data, template_env, output_dir):
+    """Generates both the summary and the combined HTML reports.
+    
+    The input data goes through `_prepare_data_for_aggregated_reports` only once and
+    the result is rendered with both templates.
+    
+    Args:
+        all_planets_report_data (list): A list of dictionaries, each containing
+                                        processed data for a single planet.
+        template_env (jinja2.Environment): The Jinja2 template environment.
+        output_dir (str): The directory where the HTML reports will be saved.
+    
+    Returns:
+        tuple: (summary report path, combined report path), each as returned by
+               `generate_summary_report_html` / `generate_combined_report_html`.
+    """
+    # Prepared on the first call and reused for the second report. A failure is not
+    # stored, so each report retries the preparation and reports the error itself.
+    prepared = []
+    def prepare_data():
+        if not prepared:
+            prepared.append(_prepare_data_for_aggregated_reports(all_planets_report_data, output_dir))
+        return prepared[0]
+
+    summary_report_path = _render_aggregated_report("summary", prepare_data, template_env, output_dir)
+    combined_report_path = _render_aggregated_report("combined", prepare_data, template_env, output_dir)
+    return summary_report_path, combined_report_path
+
+def generate_summary_report_html(all_planets_report_data, template_env, output_dir):
+    """Generates a summary HTML report for multiple planets.
+    
+    Uses the `_prepare_data_for_aggregated_reports` function to process the input data
+    and then renders it using the "summary_template.html" Jinja2 template.
+    If an error occurs during generation, it attempts to create an error report.
+    Use `generate_aggregated_reports` when the combined report is needed too.
+    
+    Args:
+        all_planets_report_data (list): A list of dictionaries, each containing
+                                        processed data for a single planet.
+        template_env (jinja2.Environment): The Jinja2 template environment.
+        output_dir (str): The directory where the HTML report will be saved.
+    
+    Returns:
+        str or None: The full path to the generated summary HTML report file.
+                     Returns path to an error report if main generation fails,
+                     or None if error report also fails.
+    """
+    return _render_aggregated_report(
+        "summary", partial(_prepare_data_for_aggregated_reports, all_planets_report_data, output_dir), template_env, output_dir
+    )
+
 def generate_combined_report_html(all_planets_report_data, template_env, output_dir):
     """Generates a combined HTML report providing detailed comparisons for multiple planets.
     
@@ -1113,6 +1525,7 @@ def generate_combined_report_html(all_planets_report_data, template_env, output_
     to process input data and then renders it using the "combined_template.html"
     Jinja2 template.
     If an error occurs, it attempts to create an error report.
+    Use `generate_aggregated_reports` when the summary report is needed too.
     
     Args:
         all_planets_report_data (list): A list of dictionaries, each containing
@@ -1125,74 +1538,9 @@ def generate_combined_report_html(all_planets_report_data, template_env, output_
                      Returns path to an error report if main generation fails,
                      or None if error report also fails.
     """
-    logger = logging.getLogger(__name__)
-    
-    # Função auxiliar para garantir que o diretório exista
-    def ensure_dir(directory):
-        if not os.path.exists(directory):
-            os.makedirs(directory)
-            logger.info(f"Created directory: {directory}")
-    
-    ensure_dir(output_dir)
-    report_filename = "combined_report.html"
-    full_report_path = os.path.join(output_dir, report_filename)
-    logger.info(f"Generating combined report to {full_report_path}")
-    
-    try:
-        template = template_env.get_template("combined_template.html")
-        
-        # Usar a versão corrigida da função de preparação de dados
-        processed_planets_data = _prepare_data_for_aggregated_reports(all_planets_report_data, output_dir)
-        
-        if not processed_planets_data:
-            logger.warning("No processed data available for combined report. Creating empty report.")
-            # Criar um relatório vazio em vez de retornar None
-            processed_planets_data = []
-        
-        context = {"all_planets_data": processed_planets_data, "datetime": datetime}
-        html_content = template.render(context)
-        
-        with open(full_report_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
-        
-        logger.info(f"Combined report saved to {full_report_path}")
-        return full_report_path
-    
-    except Exception as e:
-        logger.error(f"Error generating combined report: {e}", exc_info=True)
-        import traceback
-        traceback.print_exc()
-        
-        # Criar um relatório de erro em vez de retornar None
-        try:
-            error_html = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <title>Combined Report Error</title>
-                <style>
-                    body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                    .error {{ color: red; background-color: #ffeeee; padding: 10px; border-radius: 5px; }}
-                </style>
-            </head>
-            <body>
-                <h1>Combined Report Error</h1>
-                <div class="error">
-                    <p>An error occurred while generating the combined report:</p>
-                    <pre>{str(e)}</pre>
-                </div>
-                <p>Please try again or contact support if the problem persists.</p>
-                <p>Generated at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-            </body>
-            </html>
-            """
-            with open(full_report_path, "w", encoding="utf-8") as f:
-                f.write(error_html)
-            logger.info(f"Error combined report saved to {full_report_path}")
-            return full_report_path
-        except Exception as e2:
-            logger.error(f"Failed to create error report: {e2}")
-            return None
+    return _render_aggregated_report(
+        "combined", partial(_prepare_data_for_aggregated_reports, all_planets_report_data, output_dir), template_env, output_dir
+    )
 
 if __name__ == "__main__":
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -1212,7 +1560,7 @@ if __name__ == "__main__":
             exit(1)
 
     logger.info(f"Using templates directory: {templates_dir}")
-    template_env = Environment(loader=FileSystemLoader(templates_dir), autoescape=select_autoescape(["html", "xml"])) # Added autoescape
+    template_env = Environment(loader=FileSystemLoader(templates_dir), autoescape=select_autoescape(["html", "xml"]), auto_reload=False, bytecode_cache=FileSystemBytecodeCache()) # Added autoescape
     test_output_dir = os.path.join(script_dir, "test_reports_output")
     ensure_dir(test_output_dir)
 
@@ -1300,11 +1648,10 @@ if __name__ == "__main__":
             planet_name_s
         )
 
-    summary_report_path = generate_summary_report_html(dummy_all_planets_data_from_routes, template_env, test_output_dir)
+    summary_report_path, combined_report_path = generate_aggregated_reports(dummy_all_planets_data_from_routes, template_env, test_output_dir)
     if summary_report_path:
         logger.info(f"Test Summary report generated at: {summary_report_path}")
 
-    combined_report_path = generate_combined_report_html(dummy_all_planets_data_from_routes, template_env, test_output_dir)
     if combined_report_path:
         logger.info(f"Test Combined report generated at: {combined_report_path}")
 
@@ -25,6 +25,7 @@ class DummyAx:
     def set_yticks(self, *a, **kw): return None
     def legend(self, *a, **kw): return None
     def text(self, *a, **kw): return None
+    def clear(self): return None
 
 dummy_ax = DummyAx()
 
@@ -34,9 +35,24 @@ def fake_savefig(path, *a, **kw):
         f.write(b"")
     return None
 
+# Figura fake, reaproveitada entre gráficos como a real
+class DummyFig:
+    canvas = types.SimpleNamespace(get_width_height=lambda *a, **kw: (1, 1))
+    def savefig(self, path, *a, **kw):
+        if hasattr(path, "write"):  # format="rgba": um pixel branco
+            path.write(b"\xff" * 4)
+            return None
+        return fake_savefig(path)
+    def tight_layout(self, *a, **kw): return None
+    def subplots_adjust(self, *a, **kw): return None
+    subplotpars = types.SimpleNamespace(left=0.1, bottom=0.1, right=0.9, top=0.9)
+    def set_size_inches(self, *a, **kw): return None
+
+dummy_fig = DummyFig()
+
 # Submódulos necessários
 mock_pyplot = types.SimpleNamespace(
-    subplots=lambda *a, **kw: (None, dummy_ax),
+    subplots=lambda *a, **kw: (dummy_fig, dummy_ax),
     savefig=fake_savefig,
     close=lambda *a, **kw: None,
     tight_layout=lambda *a, **kw: None,
@@ -18,6 +18,19 @@ class TestHelpers:
         """Should return the correct color (Material Design palette) for different percentage values"""
         assert lm.get_color_for_percentage(value) == expected
 
+    def test_get_color_for_percentage_nan_is_grey(self):
+        import numpy as np
+        for value in ("nan", np.float32("nan")):
+            assert lm.get_color_for_percentage(value) == "#757575"
+            assert lm.get_color_for_percentage(value, high_is_good=False) == "#757575"
+
+    def test_isna_matches_pandas_for_scalars(self):
+        import numpy as np
+        import pandas as pd
+        for value in (None, float("nan"), np.float32("nan"), np.float64("nan"), pd.NA, pd.NaT,
+                      0, 1.5, np.float32(2.5), np.int64(3), "nan", "", True):
+            assert lm._isna(value) == bool(pd.isna(value))
+
     def test_get_color_for_percentage_low_is_good(self):
         from lifesearch.lifesearch_main import get_color_for_percentage
         assert get_color_for_percentage(5, high_is_good=False) == "#4CAF50"   # green
@@ -26,6 +39,13 @@ class TestHelpers:
         assert get_color_for_percentage(70, high_is_good=False) == "#FF9800"  # orange
         assert get_color_for_percentage(90, high_is_good=False) == "#F44336"  # red
 
+    def test_get_colors_for_percentages_matches_scalar(self):
+        from lifesearch.lifesearch_main import get_color_for_percentage, get_colors_for_percentages
+        values = [None, float("nan"), 0, 10, 19.9, 20, 25, 40, 50, 60, 75, 79.9, 80, 100]
+        for high_is_good in (True, False):
+            colors = get_colors_for_percentages(values, high_is_good=high_is_good)
+            assert list(colors) == [get_color_for_percentage(v, high_is_good=high_is_good) for v in values]
+
     def test_format_value_none_or_nan(self):
         from lifesearch.lifesearch_main import format_value
         assert format_value(None) == "N/A"
@@ -52,6 +72,11 @@ class TestHelpers:
             assert isinstance(v, str)
             assert v != ""
 
+    def test_calculate_travel_times_batch_matches_scalar(self):
+        distances = [10.0, 4.2465, float("nan"), 0.0, -3.0]
+        expected = [lm.calculate_travel_times(None if d != d else d) for d in distances]
+        assert lm.calculate_travel_times_batch(distances) == expected
+
     def test_calculate_travel_times_invalid(self):
         """Should return descriptive strings even for invalid input (e.g., None)"""
         times = lm.calculate_travel_times(None)
@@ -102,6 +127,22 @@ class TestHelpers:
         result = classify_planet(1.0, 1.0, 150)
         assert "Hypopsychroplanet" in result
 
+    def test_classify_planet_array_matches_scalar(self):
+        from lifesearch.lifesearch_main import classify_planet, classify_planet_array
+        nan = float("nan")
+        masses = [1.0, 317.0, nan, nan, 0.05, 0.00001, -1.0, nan, 6000.0]
+        radii = [1.0, 11.0, 1.0, 2.0, nan, 0.1, 1.0, nan, 12.0]
+        temps = [288, 120, 300, 300, 220, 373, nan, -5.0, 1000]
+        labels = classify_planet_array(masses, radii, temps)
+        assert list(labels) == [classify_planet(m, r, t) for m, r, t in zip(masses, radii, temps)]
+
+    def test_classify_planet_cache_normalizes_nan(self):
+        from lifesearch.lifesearch_main import classify_planet, _classify_planet_cached
+        first = classify_planet(float("nan"), 1.3, float("nan"))
+        hits_before = _classify_planet_cached.cache_info().hits
+        assert classify_planet(float("nan"), 1.3, None) == first
+        assert _classify_planet_cached.cache_info().hits == hits_before + 1
+
 
 class TestCalculationsESI:
     # ---------------------------
@@ -219,6 +260,33 @@ class TestCalculationsPHI:
         assert score > 0
         assert color.startswith("#")
 
+    def test_esi_phi_batch_matches_scalar(self):
+        import pandas as pd
+        from lifesearch.lifesearch_main import calculate_esi_phi_batch, calculate_esi_score, calculate_phi_score
+        rows = [
+            {"pl_rade": 1.0, "pl_dens": 5.51, "pl_eqt": 255.0, "classification": "Terran", "st_spectype": "G2V", "st_age": 4.5, "pl_orbeccen": 0.01},
+            {"pl_rade": 2.5, "pl_eqt": 400.0, "classification": "Superterran-Hot", "st_spectype": "M1", "st_age": 9.0, "pl_orbeccen": 0.4},
+            {"classification": "Neptunian", "st_spectype": None},
+        ]
+        esi_weights = {"Size": 0.5, "Density": 1.0, "Habitable Zone": 2.0}
+        phi_weights = {"Solid Surface": 0.25, "Stable Energy": 0.1, "Life Compounds": 0.0, "Stable Orbit": 0.2}
+        result = calculate_esi_phi_batch(pd.DataFrame(rows), esi_weights, phi_weights)
+        for i, row in enumerate(rows):
+            assert (result["ESI"][0][i], result["ESI"][1][i]) == calculate_esi_score(row, esi_weights)
+            assert (result["PHI"][0][i], result["PHI"][1][i]) == calculate_phi_score(row, phi_weights)
+
+    def test_phi_factors_batch(self):
+        import pandas as pd
+        from lifesearch.lifesearch_main import calculate_phi_factors_batch
+        df = pd.DataFrame([
+            {"classification": "Superterran | Mesoplanet", "st_spectype": "K5V", "st_age": 2.0, "pl_orbeccen": 0.1},
+            {"classification": "Jovian | Thermoplanet", "st_spectype": "G2", "st_age": 8.0, "pl_orbeccen": 0.3},
+            {"classification": None, "st_spectype": None, "st_age": None, "pl_orbeccen": None},
+        ])
+        factors = calculate_phi_factors_batch(df)
+        assert list(factors.columns) == ["Solid Surface", "Stable Energy", "Life Compounds", "Stable Orbit"]
+        assert factors.values.tolist() == [[0.8, 0.7, 0.0, 0.9], [0.0, 0.0, 0.0, 0.0], [0.0, 0.0, 0.0, 0.0]]
+
 class TestCalculationsSPH:
     # ---------------------------
     # SPH
@@ -284,6 +352,16 @@ class TestCalculationsSPH:
         assert score == 0.0
         assert color == "#F44336"  # 0% should return red
 
+    def test_sph_batch_matches_scalar(self):
+        import pandas as pd
+        from lifesearch.lifesearch_main import calculate_sph_score, calculate_sph_score_batch
+        temps = [288.0, 273.15, 323.15, 260.0, 350.0, 100.0, 500.0, None]
+        values, colors = calculate_sph_score_batch(pd.DataFrame({"pl_eqt": temps}))
+        for temp, value, color in zip(temps, values, colors):
+            expected = calculate_sph_score({"pl_eqt": temp}, {})
+            assert (value, color) == expected
+            assert type(value) is type(expected[0])
+
 class TestCalculationsSEPHI:
     # ---------------------------
     # SEPHI
@@ -352,6 +430,61 @@ class TestCalculationsSEPHI:
         result = calculate_sephi(1, 1, 365, 1, 1, 5778, 5, 5.5, "TestPlanet")
         assert isinstance(result[0], float)  # Deve calcular sem explodir
 
+    @pytest.mark.parametrize("pm,pr", [(1.0, 1.0), (317.0, 11.0), (0.1, 0.53), (5.0, 1.7), (1e-4, 0.05)])
+    def test_relative_escape_velocity_simplification(self, pm, pr):
+        """sqrt(M/R) must match the original sqrt((M/R^2) * R) / sqrt(1) chain"""
+        import math
+        original = math.sqrt((pm / (pr ** 2)) * pr) / math.sqrt(1.0 / (1.0 ** 2) * 1.0)
+        assert math.sqrt(pm / pr) == pytest.approx(original, rel=1e-12, abs=1e-12)
+
+    def test_calculate_sephi_batch_matches_scalar(self):
+        import math
+        from lifesearch.lifesearch_main import calculate_sephi, calculate_sephi_batch
+        planets = [
+            (1.0, 1.0, 365.25, 1.0, 1.0, 5778, 4.5, 5.51),       # Earth
+            (317.0, 11.0, 4332.0, 1.0, 1.0, 5778, 4.5, 1.33),    # Jupiter
+            (2.5, 1.4, 37.4, 0.5, 0.48, 3800, 2.0, float("nan")), # super-Earth around an M dwarf
+            (0.1, 0.53, 687.0, 1.0, 1.0, 5778, 4.5, 3.93),       # Mars
+            (-1, 1, 365, 1, 1, 5778, 5, 5.5),                    # invalid
+        ]
+        batch = calculate_sephi_batch(*zip(*planets))
+        for i, planet in enumerate(planets):
+            expected = calculate_sephi(*planet, "TestPlanet")
+            if expected[0] is None:
+                assert all(math.isnan(component[i]) for component in batch)
+            else:
+                assert [component[i] for component in batch] == pytest.approx(expected, abs=1e-9)
+
+    def test_calculate_sephi_catalog_columns(self):
+        import math
+        import pandas as pd
+        from lifesearch.lifesearch_main import calculate_sephi, calculate_sephi_catalog
+        df = pd.DataFrame([
+            {"pl_masse": 1.0, "pl_rade": 1.0, "pl_orbper": 365.25, "st_mass": 1.0, "st_rad": 1.0,
+             "st_teff": 5778, "st_age": 4.5, "pl_dens": 5.51},
+            {"pl_masse": "bad", "pl_rade": 1.0},
+        ], index=["Earth", "Broken"])
+        result = calculate_sephi_catalog(df)
+        assert list(result.columns) == ["SEPHI", "L1", "L2", "L3", "L4"]
+        assert list(result.index) == ["Earth", "Broken"]
+        expected = calculate_sephi(1.0, 1.0, 365.25, 1.0, 1.0, 5778, 4.5, 5.51, "Earth")
+        assert list(result.loc["Earth"]) == pytest.approx(expected)
+        assert all(math.isnan(v) for v in result.loc["Broken"])
+
+    def test_sephi_scores_for_report_batch(self):
+        import pandas as pd
+        from lifesearch.lifesearch_main import (calculate_sephi_catalog, calculate_sephi_scores_for_report_batch,
+                                                process_planet_data)
+        rows = [
+            {"pl_name": "Earth", "pl_masse": 1.0, "pl_rade": 1.0, "pl_orbper": 365.25, "st_mass": 1.0,
+             "st_rad": 1.0, "st_teff": 5778, "st_age": 4.5, "pl_dens": 5.51},
+            {"pl_name": "Broken", "pl_masse": None, "pl_rade": 1.0},
+        ]
+        reports = calculate_sephi_scores_for_report_batch(calculate_sephi_catalog(pd.DataFrame(rows)))
+        for row, report in zip(rows, reports):
+            assert report == process_planet_data(row["pl_name"], row, {})["sephi_scores_for_report"]
+        assert reports[1]["SEPHI"][0] == "N/A"
+
 class TestDetailedScores:
     def test_size_score_terran_optimal(self):
         from lifesearch.lifesearch_main import calculate_detailed_habitability_scores
@@ -486,6 +619,31 @@ class TestDetailedScores:
         scores = calculate_detailed_habitability_scores(planet_data, None, {})
         assert scores["Habitable Zone Position"][0] == 25
 
+    def test_detailed_scores_batch_matches_scalar(self):
+        import pandas as pd
+        from lifesearch.lifesearch_main import (calculate_detailed_habitability_scores,
+                                                calculate_detailed_habitability_scores_batch)
+        rows = [
+            {"pl_rade": 1.0, "pl_masse": 1.0, "pl_dens": 5.5, "pl_eqt": 288, "classification": "Terran | Mesoplanet",
+             "pl_orbsmax": 1.0, "st_spectype": "G2V", "st_age": 4.6, "st_met": 0.0, "pl_orbeccen": 0.02,
+             "hz_ohzin": 0.75, "hz_chzin": 0.95, "hz_chzout": 1.67, "hz_ohzout": 1.77},
+            {"pl_rade": 2.2, "pl_masse": 6.0, "pl_dens": 9.0, "pl_eqt": 400, "classification": "Superterran | Hot",
+             "pl_orbsmax": 0.8, "st_spectype": "K5", "st_age": 9.0, "st_met": -0.7, "pl_orbeccen": 0.4,
+             "hz_ohzin": 0.75, "hz_chzin": 0.95, "hz_chzout": 1.67, "hz_ohzout": 1.77},
+            {"pl_rade": 4.0, "pl_masse": 15.0, "pl_eqt": 100, "classification": "Neptunian | Cold",
+             "pl_orbsmax": 3.0, "st_spectype": "X", "st_age": 12.0, "st_met": 1.5, "pl_orbeccen": 0.8},
+            {"classification": "Unknown Mass Class | Unknown Temperature Class", "st_spectype": ""},
+        ]
+        df = pd.DataFrame(rows)
+        hz_cols = ["hz_ohzin", "hz_chzin", "hz_chzout", "hz_ohzout"]
+        batch = calculate_detailed_habitability_scores_batch(df, [df[c].to_numpy(dtype=float) for c in hz_cols])
+        for i, row in enumerate(rows):
+            hz_tuple = tuple(row.get(c) for c in hz_cols) + (None,)
+            expected = calculate_detailed_habitability_scores(row, hz_tuple, {})
+            assert list(batch.keys()) == list(expected.keys())
+            for name, (values, colors) in batch.items():
+                assert (values[i], colors[i]) == expected[name], name
+
 class TestProcessPlanetData:
     def test_process_planet_data_with_dict(self):
         from lifesearch.lifesearch_main import process_planet_data
@@ -509,6 +667,17 @@ class TestProcessPlanetData:
         result = process_planet_data("Kepler-22b", s, weights_config)
         assert isinstance(result["planet_data_dict"], dict)
 
+    def test_process_planet_data_unboxes_numpy_scalars(self):
+        import numpy as np
+        from lifesearch.lifesearch_main import process_planet_data
+        data = {"pl_rade": np.float64(1.0), "st_lum": np.float64(0.0), "hz_ohzin": np.float64(0.75),
+                "disc_year": np.int64(2011)}
+        result = process_planet_data("Earth", data, {"habitability": {}, "phi": {}})
+        assert type(result["planet_data_dict"]["hz_ohzin"]) is float
+        assert type(result["hz_data_tuple"][0]) is float
+        assert type(result["star_data_for_plot"]["st_lum"]) is float
+        assert type(data["hz_ohzin"]) is np.float64  # caller's dict is left untouched
+
     def test_process_planet_data_with_unexpected_type(self):
         from lifesearch.lifesearch_main import process_planet_data
         weights_config = {"habitability": {}, "phi": {}}
@@ -544,3 +713,47 @@ class TestProcessPlanetData:
         result = process_planet_data("InvalidDist", data, weights_config)
         # Deve cair no except e continuar funcionando
         assert "travel_curiosities" in result["planet_data_dict"]
+
+    def test_process_catalog_matches_per_planet(self):
+        import pandas as pd
+        from lifesearch.lifesearch_main import process_catalog, process_planet_data
+        weights_config = {"habitability": {}, "phi": {}}
+        rows = [
+            {"pl_name": "Earth", "pl_rade": 1.0, "pl_masse": 1.0, "pl_eqt": 288, "st_teff": 5700,
+             "st_rad": 1.0, "st_mass": 1.0, "st_age": 5.0, "pl_orbper": 365, "sy_dist": 10},
+            {"pl_name": "Odd", "pl_rade": "bad", "st_spectype": "K"},
+        ]
+        results = process_catalog(pd.DataFrame(rows), weights_config)
+        assert len(results) == 2
+        single = process_planet_data("Earth", rows[0], weights_config)
+        assert results[0]["scores_for_report"] == single["scores_for_report"]
+        assert results[0]["sephi_scores_for_report"] == single["sephi_scores_for_report"]
+        assert results[1]["planet_data_dict"]["pl_name"] == "Odd"
+
+    def test_process_catalog_empty(self):
+        import pandas as pd
+        from lifesearch.lifesearch_main import process_catalog
+        assert process_catalog(pd.DataFrame(), {"habitability": {}, "phi": {}}) == []
+
+    def test_process_catalog_logs_single_summary(self, caplog):
+        import logging
+        import pandas as pd
+        from lifesearch.lifesearch_main import process_catalog
+        df = pd.DataFrame([{"pl_name": "A", "pl_rade": 1.0}, {"pl_name": "B", "pl_rade": 2.0}])
+        with caplog.at_level(logging.INFO, logger="lifesearch.lifesearch_main"):
+            process_catalog(df, {"habitability": {}, "phi": {}})
+        messages = [record.getMessage() for record in caplog.records]
+        assert sum("Processed catalog of 2 planets" in message for message in messages) == 1
+        assert not any("Finished processing data for" in message for message in messages)
+
+    def test_process_catalog_parallel_matches_serial(self):
+        import pandas as pd
+        from lifesearch.lifesearch_main import process_catalog, process_catalog_parallel
+        df = pd.DataFrame({
+            "pl_name": [f"P{i}" for i in range(7)],
+            "pl_rade": [0.5, 1.0, 1.4, 2.2, 4.0, 11.0, None],
+            "pl_eqt": [200, 255, 288, 320, 400, 900, 250],
+            "sy_dist": [1.3, 10.0, 20.0, None, 50.0, 100.0, 5.0],
+        })
+        weights = {"habitability": {}, "phi": {}}
+        assert process_catalog_parallel(df, weights, max_workers=2, chunk_size=3) == process_catalog(df, weights)
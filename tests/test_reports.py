@@ -39,6 +39,13 @@ def test_ensure_dir_creates_and_skips(tmp_path, caplog):
     reports.ensure_dir(str(new_dir))
     assert "Created directory" not in caplog.text
 
+def test_ensure_dir_remembers_directories(tmp_path, monkeypatch):
+    new_dir = str(tmp_path / "cached")
+    reports.ensure_dir(new_dir)
+    assert new_dir in reports._ENSURED_DIRS
+    monkeypatch.setattr(reports.os, "makedirs", lambda *a, **kw: pytest.fail("directory checked again"))
+    reports.ensure_dir(new_dir)
+
 
 # ---------------------------
 # get_color_for_percentage
@@ -52,10 +59,18 @@ def test_ensure_dir_creates_and_skips(tmp_path, caplog):
     (50, "#ffc107"),            # >= 40 -> âmbar
     (30, "#fd7e14"),            # >= 20 -> laranja
     (10, "#dc3545"),            # < 20 -> vermelho
+    (float("nan"), "#808080"),  # NaN -> cinza
+    (79.99, "#90ee90"),         # float logo abaixo do limite
+    ("85", "#28a745"),          # string numérica
 ])
 def test_get_color_for_percentage_cases(value, expected):
     assert reports.get_color_for_percentage(value) == expected
 
+def test_get_colors_for_percentages_matches_scalar():
+    values = [0, 19.9, 20, 39.99, 40, 60, 79.9, 80, 100, 150, -5]
+    assert reports.get_colors_for_percentages(values).tolist() == [reports.get_color_for_percentage(v) for v in values]
+    assert reports.get_colors_for_percentages([float("nan")]).tolist() == ["#808080"]
+
 
 # ---------------------------
 # format_float_field
@@ -72,6 +87,15 @@ def test_format_float_field_valid_and_invalid():
     assert reports.format_float_field("42") == "42.00"
     assert reports.format_float_field("abc") == "abc"
 
+def test_format_float_field_numeric_types():
+    import numpy as np
+    assert reports.format_float_field(float("nan")) == "N/A"
+    assert reports.format_float_field(np.float64(2.5), ".5f") == "2.50000"
+    assert reports.format_float_field(np.float32(0.1), ".10f") == "0.1000000000"  # via str(), as before
+    assert reports.format_float_field(True) == "True"
+    assert reports.format_float_field(7, ".1f") == "7.0"
+    assert reports.format_float_field("nan") == "nan"
+
 
 # ---------------------------
 # get_score_description
@@ -126,6 +150,12 @@ def test_to_float_or_none_cases():
     assert reports.to_float_or_none(3.14) == 3.14
     assert reports.to_float_or_none("42") == 42.0
 
+def test_isna_matches_pandas_for_scalars():
+    import numpy as np
+    import pandas as pd
+    for value in (None, float("nan"), np.float64("nan"), np.float32("nan"), pd.NA, pd.NaT, 0.0, 3, True, "", "nan", np.int64(5)):
+        assert reports._isna(value) == bool(pd.isna(value))
+
 # ---------------------------
 # Enrich
 # ---------------------------
@@ -184,6 +214,15 @@ def test_enrich_atmosphere_star_type_M():
     r = reports.enrich_atmosphere_water_magnetic_moons(data, "Unknown")
     assert r["magnetic_activity_score"] == 40
 
+def test_enrich_atmosphere_star_type_K_and_missing():
+    r = reports.enrich_atmosphere_water_magnetic_moons({"pl_masse": 2.0, "st_spectype": "K1 V"}, "Warm Terran")
+    assert r["magnetic_activity_score"] == 90
+    assert r["magnetic_activity_desc"] == "High"
+    # st_spectype vindo do pandas como NaN não deve quebrar
+    r = reports.enrich_atmosphere_water_magnetic_moons({"pl_masse": None, "st_spectype": float("nan")}, "Jovian")
+    assert r["magnetic_activity_score"] == 10.0
+    assert r["magnetic_activity_desc"] == "Low"
+
 def test_enrich_atmosphere_star_params_invalid_all_none(caplog):
     caplog.set_level("WARNING")
     # Force all stellar parameters to invalid values
@@ -288,12 +327,41 @@ def test_plot_habitable_zone_invalid_orbsmax_triggers_warning(tmp_output_dir, ca
     assert result.endswith("_hz.png")
     assert "Orbital semi-major axis" in caplog.text
 
+def test_plot_habitable_zone_draws_png_with_pillow(tmp_output_dir):
+    from PIL import Image
+    planet_data = {"pl_name": "Kepler-22 b", "pl_orbsmax": 0.85}
+    result = reports.plot_habitable_zone(planet_data, {"st_lum": -0.1}, None, tmp_output_dir, "kepler22b")
+    with Image.open(os.path.join(tmp_output_dir, result)) as image:
+        assert image.format == "PNG"
+        assert image.size == (1000, 200)
+        assert image.mode == "P"  # saved with a reduced palette
+        assert image.convert("RGB").getpixel((500, 90)) != (255, 255, 255)  # inside the conservative HZ band
+
+def test_plot_habitable_zone_matplotlib_option(tmp_output_dir):
+    planet_data = {"pl_name": "Kepler-22 b", "pl_orbsmax": 1.0}
+    result = reports.plot_habitable_zone(planet_data, {"st_lum": 0.0}, None, tmp_output_dir, "kepler22b", use_matplotlib=True)
+    assert result.endswith("_hz.png")
+
+def test_hz_tick_values_are_round_steps():
+    assert reports._hz_tick_values(0.0, 2.0) == [0.0, 0.2, 0.4, 0.6, 0.8, 1.0, 1.2, 1.4, 1.6, 1.8, 2.0]
+    assert reports._hz_tick_values(0.016, 0.06) == [0.02, 0.025, 0.03, 0.035, 0.04, 0.045, 0.05, 0.055, 0.06]
+
+def test_hz_text_mask_is_reused_across_plots(tmp_output_dir):
+    mask, offset = reports._hz_text_mask("Distance from Star (AU)", 13, "mb")
+    assert mask.mode == "L" and mask.getbbox() is not None
+    assert reports._hz_text_mask("Distance from Star (AU)", 13, "mb")[0] is mask
+
 
 
 # ---------------------------
 # plot_scores_comparison
 # ---------------------------
 
+def test_template_score_rows_skips_invalid_entries():
+    scores = {"ESI": (85.0, "#00FF00"), "SPH": (float("nan"), "#FF0000"), "Size": 3, "PHI": (None, "#FF0000"), "Mass": (10,)}
+    assert reports._template_score_rows(scores) == [{"field": "ESI", "value": 85.0, "color": "#00FF00"}]
+    assert reports._template_score_rows(None) == []
+
 def test_plot_scores_comparison_valid(tmp_output_dir):
     scores = {"ESI": (85.0, "#00FF00")}
     result = reports.plot_scores_comparison(scores, tmp_output_dir, "kepler22b")
@@ -358,6 +426,20 @@ def test_plot_scores_comparison_labels_called(tmp_output_dir, monkeypatch):
     assert result.endswith("_scores.png")
     assert "text" in called  # confirma que a label foi escrita
 
+def test_plot_scores_comparison_reuses_layout(tmp_output_dir, monkeypatch):
+    fig = reports.plt.subplots()[0]
+    calls = {"tight": 0, "adjust": 0}
+    monkeypatch.setattr(fig, "tight_layout", lambda *a, **kw: calls.__setitem__("tight", calls["tight"] + 1))
+    monkeypatch.setattr(fig, "subplots_adjust", lambda *a, **kw: calls.__setitem__("adjust", calls["adjust"] + 1))
+    monkeypatch.setattr(reports, "_SCORES_LAYOUT_CACHE", {})
+
+    reports.plot_scores_comparison({"ESI": (50.0, "#00FF00")}, tmp_output_dir, "a")
+    reports.plot_scores_comparison({"ESI": (60.0, "#00FF00")}, tmp_output_dir, "b")
+    assert calls == {"tight": 1, "adjust": 1}
+    # Um valor perto de 100% pode passar da borda do eixo: nova medição
+    reports.plot_scores_comparison({"ESI": (99.0, "#00FF00")}, tmp_output_dir, "c")
+    assert calls == {"tight": 2, "adjust": 1}
+
 def test_plot_habitable_zone_orbsmax_invalid(tmp_output_dir, caplog):
     caplog.set_level("WARNING")
     planet_data = {"pl_name": "Kepler-22 b", "pl_orbsmax": "not-a-number"}
@@ -373,6 +455,38 @@ def test_plot_scores_comparison_with_label_loop(tmp_output_dir):
     # garante que o arquivo foi criado
     assert os.path.exists(os.path.join(tmp_output_dir, result))
 
+def test_render_planet_plots_small_batch_in_order(tmp_output_dir):
+    tasks = [
+        ({"pl_orbsmax": 1.0}, {"st_lum": 0.0}, None, {"ESI": (80.0, "#28a745")}, tmp_output_dir, "planet_a"),
+        ({}, {}, None, {}, tmp_output_dir, "planet_b"),
+    ]
+    results = reports.render_planet_plots(tasks)
+    assert results == [("planet_a_hz.png", "planet_a_scores.png"), ("planet_b_hz.png", None)]
+
+def test_render_planet_plots_process_pool_in_order(tmp_output_dir):
+    tasks = [
+        ({"pl_orbsmax": 1.0}, {"st_lum": 0.0}, None, {"ESI": (80.0, "#28a745")}, tmp_output_dir, "planet_a"),
+        ({}, {}, None, {}, tmp_output_dir, "planet_b"),
+    ]
+    results = reports.render_planet_plots(tasks, max_workers=1, min_parallel_tasks=1)
+    assert results == [("planet_a_hz.png", "planet_a_scores.png"), ("planet_b_hz.png", None)]
+    assert os.path.exists(os.path.join(tmp_output_dir, "planet_a_scores.png"))
+
+def test_render_planet_plots_pool_failure_falls_back_in_process(tmp_output_dir, monkeypatch, caplog):
+    from concurrent.futures.process import BrokenProcessPool
+
+    class BrokenExecutor:
+        def __init__(self, *a, **kw): pass
+        def __enter__(self): return self
+        def __exit__(self, *exc): return False
+        def map(self, *a, **kw): raise BrokenProcessPool("worker died")
+
+    monkeypatch.setattr(reports, "ProcessPoolExecutor", BrokenExecutor)
+    tasks = [({}, {}, None, {"ESI": (80.0, "#28a745")}, tmp_output_dir, "planet_a")]
+    results = reports.render_planet_plots(tasks, min_parallel_tasks=1)
+    assert results == [("planet_a_hz.png", "planet_a_scores.png")]
+    assert "rendering them in-process instead" in caplog.text
+
 # ---------------------------
 # _prepare_data_for_aggregated_reports
 # ---------------------------
@@ -384,6 +498,32 @@ def test_prepare_data_skips_empty_planet_data(tmp_output_dir, caplog):
     assert "Skipping planet with no raw data dictionary" in caplog.text
 
 
+def test_prepare_data_debug_dumps_only_at_debug_level(tmp_output_dir, caplog):
+    data = {"planet_data_dict": {"pl_name": "D1"}}
+    caplog.set_level("INFO", logger=reports.logger.name)
+    reports._prepare_data_for_aggregated_reports([data], tmp_output_dir)
+    assert not any(name.startswith("debug_") for name in os.listdir(tmp_output_dir))
+    assert "Available keys in planet_raw_TAP_data" not in caplog.text
+
+    caplog.set_level("DEBUG", logger=reports.logger.name)
+    reports._prepare_data_for_aggregated_reports([data], tmp_output_dir)
+    assert os.path.exists(os.path.join(tmp_output_dir, "debug_input_all_planets_report_data_AGGREGATED_INPUT.json"))
+    assert os.path.exists(os.path.join(tmp_output_dir, "debug_output_processed_planets_data.json"))
+    assert "Available keys in planet_raw_TAP_data for D1" in caplog.text
+
+
+def test_prepare_data_surface_gravity_info_only_when_enabled(tmp_output_dir, caplog):
+    data = {"planet_data_dict": {"pl_name": "G1", "pl_masse": "<4", "pl_rade": 2}}
+    caplog.set_level("WARNING", logger=reports.logger.name)
+    result = reports._prepare_data_for_aggregated_reports([data], tmp_output_dir)
+    assert result[0]["surface_gravity_g"] == "1.00"
+    assert "Calculated surface gravity" not in caplog.text
+
+    caplog.set_level("INFO", logger=reports.logger.name)
+    reports._prepare_data_for_aggregated_reports([data], tmp_output_dir)
+    assert "Calculated surface gravity for G1: 1.00 g" in caplog.text
+
+
 def test_prepare_data_classification_final_display(tmp_output_dir):
     data = {
         "planet_data_dict": {
@@ -432,6 +572,20 @@ def test_prepare_data_no_components_for_habitability(tmp_output_dir):
     # Should be effectively zero (very close to 0)
     assert score < 1e-5
 
+def test_prepare_data_habitability_batch_matches_formula(tmp_output_dir):
+    import numpy as np
+    warm = {"planet_data_dict": {"pl_name": "W1", "classification": "Warm Terran"}}
+    cold = {"planet_data_dict": {"pl_name": "C1", "classification": "Cold Terran"}}
+    result = reports._prepare_data_for_aggregated_reports([warm, cold], tmp_output_dir)
+    for entry in result:
+        components = [entry["scores"][key]["score"] for key in
+                      ("Temperature", "Bio Potential", "Magnetic_Activity", "System_Age", "Presence of Moons", "Size", "Density")]
+        expected = np.clip(np.power(np.prod([max(1e-10, c) for c in components]), 1/7), 0, 100)
+        if entry["classification"] == "Warm Terran": expected = min(expected + 10, 100)
+        assert entry["scores"]["Habitability"]["score"] == pytest.approx(expected)
+        for key in reports._CLIPPED_SCORE_KEYS:
+            assert 0 <= entry["scores"][key]["score"] <= 100
+
 def test_prepare_data_invalid_sy_dist(tmp_output_dir, caplog):
     caplog.set_level("WARNING")
     data = {"planet_data_dict": {"pl_name": "X4", "sy_dist": "bad"}}
@@ -553,6 +707,16 @@ def test_generate_planet_report_html_with_sephi_scores(tmp_output_dir, template_
         content = f.read()
     assert "70.0" in content or "SEPHI" in content
 
+def test_get_template_is_cached_per_environment():
+    templates = {"report_template.html": "v1"}
+    env = Environment(loader=DictLoader(templates))
+    first = reports._get_template(env, "report_template.html")
+    assert reports._get_template(env, "report_template.html") is first
+    templates["report_template.html"] = "v2"  # auto_reload picks up changed sources
+    assert reports._get_template(env, "report_template.html").render() == "v2"
+    other_env = Environment(loader=DictLoader({"report_template.html": "other"}))
+    assert reports._get_template(other_env, "report_template.html").render() == "other"
+
 
 # ---------------------------
 # generate_summary_report_html
@@ -622,4 +786,24 @@ def test_generate_combined_report_html_template_error(tmp_output_dir):
     assert result.endswith("combined_report.html")
     with open(result, "r", encoding="utf-8") as f:
         content = f.read()
-    assert "Combined Report Error" in content
\ No newline at end of file
+    assert "Combined Report Error" in content
+
+
+# ---------------------------
+# generate_aggregated_reports
+# ---------------------------
+
+def test_generate_aggregated_reports_prepares_data_once(tmp_output_dir, template_env, monkeypatch):
+    calls = []
+    original_prepare = reports._prepare_data_for_aggregated_reports
+    def counting_prepare(*args):
+        calls.append(args)
+        return original_prepare(*args)
+    monkeypatch.setattr(reports, "_prepare_data_for_aggregated_reports", counting_prepare)
+    data = [{"planet_data_dict": {"pl_name": "PlanetZ"}}]
+    summary_path, combined_path = reports.generate_aggregated_reports(data, template_env, tmp_output_dir)
+    assert len(calls) == 1
+    assert summary_path.endswith("summary_report.html")
+    assert combined_path.endswith("combined_report.html")
+    with open(combined_path, "r", encoding="utf-8") as f:
+        assert "Combined:" in f.read()
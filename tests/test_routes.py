@@ -79,3 +79,36 @@ class TestRoutes:
         assert base == after
         with client.session_transaction() as sess:
             assert sess.get('planet_weights') in (None, {})
+
+    def test_template_env_auto_reload_follows_flask(self, client):
+        from app import routes
+        app = client.application
+        with app.app_context():
+            app.config["TEMPLATES_AUTO_RELOAD"] = None
+            app.debug = False
+            assert routes.get_template_env().auto_reload is False
+            app.config["TEMPLATES_AUTO_RELOAD"] = True
+            assert routes.get_template_env().auto_reload is True
+
+    def test_results_survive_plot_batch_failure(self, client, monkeypatch, tmp_path):
+        import pandas as pd
+
+        def failing_render_planet_plots(plot_tasks):
+            raise RuntimeError("pool broken")
+
+        monkeypatch.setattr('app.routes.process_planet_data', lambda name, combined, weights: {
+            'planet_data_dict': {'pl_name': name, 'classification': 'Class'},
+            'scores_for_report': {'ESI': (86.76, '')}
+        })
+        monkeypatch.setattr('app.routes.fetch_exoplanet_data_api', lambda name: {'pl_name': name})
+        monkeypatch.setattr('app.routes.merge_data_sources', lambda api, hwc, hz, norm: api)
+        monkeypatch.setattr('app.routes.load_hwc_catalog', lambda path: pd.DataFrame())
+        monkeypatch.setattr('app.routes.load_hzgallery_catalog', lambda path: pd.DataFrame())
+        monkeypatch.setattr('app.routes.render_planet_plots', failing_render_planet_plots)
+        client.application.config["RESULTS_DIR"] = str(tmp_path)
+        with client.session_transaction() as sess:
+            sess['planet_names_list'] = ['Kepler-452 b']
+
+        response = client.get('/results')
+        assert response.status_code == 200
+        assert list(tmp_path.glob("*/*_report.html"))